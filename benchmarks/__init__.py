@@ -0,0 +1,17 @@
+"""
+Benchmark suite of the ``loremipsum`` hot paths: text generation, sample
+cooking and sample serialization.
+
+Benchmarks follow the `asv`_ conventions: classes whose ``time_`` prefixed
+methods are timed, optionally parametrized through ``params`` and
+``param_names``, after running ``setup`` with the same parameters. So the
+suite can be run by ``asv run``, or without any dependency by::
+
+    $ python -m benchmarks.run --output results.json
+    $ python -m benchmarks.run --compare results.json
+
+All the benchmarks use fixed seeds and synthetic corpora, so that results are
+comparable across versions.
+
+.. _`asv`: https://asv.readthedocs.io
+"""
@@ -0,0 +1,25 @@
+"""Shared fixtures of the benchmark suite."""
+
+import random
+
+from loremipsum import generator
+from loremipsum import samples
+
+SEED = 20141
+
+# Synthetic corpora sizes, in paragraphs.
+CORPUS_SIZES = [10, 100, 1000]
+
+
+def corpus(paragraphs, seed=SEED):
+    """Returns the row components of a synthetic sample.
+
+    The sample text is made of the given amount of paragraphs, generated
+    using the default sample.
+    """
+    random.seed(seed)
+    default = generator.Generator(samples.DEFAULT)
+    text = '\n\n'.join(paragraph for __, __, paragraph
+                       in default.generate_paragraphs(paragraphs))
+    row = samples.DEFAULT.row()
+    return (text,) + row[1:]
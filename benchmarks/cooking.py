@@ -0,0 +1,106 @@
+"""Sample cooking, freezing and reheating benchmarks."""
+
+import collections
+import random
+import re
+import sys
+
+from loremipsum import generator
+from loremipsum import tokenizers
+
+from benchmarks import common
+
+
+class TimeSample(object):
+    """Time the Sample internal state building against the corpus size."""
+
+    params = common.CORPUS_SIZES
+    param_names = ['paragraphs']
+
+    def setup(self, paragraphs):
+        self.row = common.corpus(paragraphs)
+        self.sample = generator.Sample.cooked(*self.row)
+        self.frozen = self.sample.frozen()
+
+    def time_cook(self, paragraphs):
+        generator.Sample.cooked(*self.row)
+
+    def time_frozen(self, paragraphs):
+        self.sample.frozen()
+
+    def time_reheat(self, paragraphs):
+        generator.Sample.thawed(self.frozen)
+
+
+def _legacy_tokenize(text, word_delimiters, sentence_delimiters):
+    """The sentence by sentence, then word by word, tokenization used to cook
+    samples before tokenizers, compiling its patterns on each call."""
+    delimiters = '\\'.join(sentence_delimiters)
+    for paragraph in text.split('\n\n'):
+        sentences = re.compile(r'([^\\{d}])*[\\{d}]'.format(d=delimiters))
+        for sentence in sentences.finditer(paragraph.strip()):
+            words = re.compile(r'\s*([\S]+)')
+            for word in words.finditer(sentence.group(0).strip()):
+                word, delimiter = word.group(0).strip(), ''
+                while word and word[-1] in word_delimiters:
+                    word, delimiter = word[:-1], word[-1]
+                yield len(word), delimiter
+
+
+class TimeTokenizer(object):
+    """Time the sample text tokenization against the corpus size."""
+
+    params = common.CORPUS_SIZES
+    param_names = ['paragraphs']
+
+    def setup(self, paragraphs):
+        text, __, word_delimiters, sentence_delimiters = \
+            common.corpus(paragraphs)
+        self.args = (text, word_delimiters, sentence_delimiters)
+
+    def time_legacy(self, paragraphs):
+        collections.deque(_legacy_tokenize(*self.args), 0)
+
+    def time_simple(self, paragraphs):
+        collections.deque(tokenizers.simple.tokenize(*self.args), 0)
+
+
+def _legacy_dictionary(words):
+    """The dictionary of lists of words by length used before lexicons."""
+    dictionary = dict()
+    for word in words:
+        dictionary.setdefault(len(word), list()).append(word)
+    return dictionary
+
+
+class TimeLexicon(object):
+    """Time the lexicon packing, and track its memory footprint per word,
+    against the amount of words."""
+
+    params = [10 ** 4, 10 ** 5, 10 ** 6]
+    param_names = ['words']
+
+    def setup(self, words):
+        rng = random.Random(common.SEED)
+        letters = 'abcdefghijklmnopqrstuvwxyz'
+        self.words = [''.join(rng.choice(letters)
+                              for __ in range(rng.randint(2, 14)))
+                      for __ in range(words)]
+        self.lexicon = generator.Lexicon(self.words)
+
+    def time_legacy(self, words):
+        _legacy_dictionary(self.words)
+
+    def time_pack(self, words):
+        generator.Lexicon(self.words)
+
+    def track_legacy_bytes(self, words):
+        dictionary = _legacy_dictionary(self.words)
+        size = sum(sys.getsizeof(values) + sum(map(sys.getsizeof, values))
+                   for values in dictionary.values())
+        return float(size) / len(self.words)
+
+    def track_packed_bytes(self, words):
+        offsets = self.lexicon.offsets
+        size = len(self.lexicon.buffer) + offsets.itemsize * len(offsets)
+        return float(size) / self.lexicon.size
@@ -0,0 +1,399 @@
+"""Text generation benchmarks."""
+
+import io
+import random
+import sys
+import time
+import timeit
+
+from loremipsum import generator
+from loremipsum import pool
+from loremipsum import records
+from loremipsum import samples
+from loremipsum import streaming
+
+from benchmarks import common
+
+
+class TimeGenerator(object):
+    """Time the Generator methods using the default sample."""
+
+    def setup(self):
+        random.seed(common.SEED)
+        self.generator = generator.Generator(samples.DEFAULT)
+
+    def time_generate_word(self):
+        self.generator.generate_word()
+
+    def time_generate_sentence(self):
+        self.generator.generate_sentence()
+
+    def time_generate_paragraph(self):
+        self.generator.generate_paragraph()
+
+    def time_generate_text(self):
+        self.generator.generate_text(chars=1000)
+
+
+class TimeGeneratorCorpus(object):
+    """Time sentence generation against the sample corpus size."""
+
+    params = common.CORPUS_SIZES
+    param_names = ['paragraphs']
+
+    def setup(self, paragraphs):
+        sample = generator.Sample.cooked(*common.corpus(paragraphs))
+        random.seed(common.SEED)
+        self.generator = generator.Generator(sample)
+
+    def time_generate_sentence(self, paragraphs):
+        self.generator.generate_sentence()
+
+
+class TimeEngines(object):
+    """Time paragraph generation against the engine."""
+
+    params = ['mersenne', 'portable']
+    param_names = ['engine']
+
+    def setup(self, engine):
+        self.generator = generator.Generator(samples.DEFAULT, engine=engine)
+
+    def time_generate_paragraph(self, engine):
+        self.generator.generate_paragraph()
+
+    def time_generate_paragraph_counter(self, engine):
+        self.generator.generate_paragraph(seed=common.SEED, index=1)
+
+
+class TimeLengths(object):
+    """Time and track the fidelity of sentence lengths draws.
+
+    Fidelity is the total variation distance between the drawn lengths and
+    the sample ones: the lower, the better.
+    """
+
+    params = ['empirical', 'normal']
+    param_names = ['distribution']
+
+    def setup(self, distribution):
+        random.seed(common.SEED)
+        self.generator = generator.Generator(samples.DEFAULT)
+        self.args = dict()
+        if distribution == 'normal':
+            self.args['sentence_mean'] = samples.DEFAULT['sentence_mean']
+
+    def time_length(self, distribution):
+        self.generator._length('sentence', self.args, random)
+
+    def track_fidelity(self, distribution):
+        draws = 100000
+        histogram = dict(samples.DEFAULT['sentence_lengths'])
+        total = float(sum(histogram.values()))
+        drawn = dict()
+        for __ in range(draws):
+            length = self.generator._length('sentence', self.args, random)
+            drawn[length] = drawn.get(length, 0) + 1
+        return sum(abs(histogram.get(length, 0) / total -
+                       drawn.get(length, 0) / float(draws))
+                   for length in set(histogram) | set(drawn)) / 2
+
+
+class TimeOrders(object):
+    """Time sentence generation against the Markov chains order."""
+
+    params = [1, 2, 3, 4]
+    param_names = ['order']
+
+    def setup(self, order):
+        row = dict(zip(
+            ('text', 'lexicon', 'word_delimiters', 'sentence_delimiters'),
+            common.corpus(100)))
+        random.seed(common.SEED)
+        self.generator = generator.Generator(generator.Sample(order=order,
+                                                              **row))
+
+    def time_generate_sentence(self, order):
+        self.generator.generate_sentence()
+
+
+class TimeModels(object):
+    """Time and track the realism of the generation models.
+
+    Realism is the share of the generated pairs of adjacent words that appear
+    in the sample text.
+    """
+
+    params = ['lengths', 'words']
+    param_names = ['model']
+
+    def setup(self, model):
+        random.seed(common.SEED)
+        self.generator = generator.Generator(samples.DEFAULT, model=model)
+
+    def time_generate_paragraph(self, model):
+        self.generator.generate_paragraph()
+
+    def track_realism(self, model):
+        def pairs(text):
+            words = [word.strip(',.;:!?').lower() for word in text.split()]
+            return set(zip(words, words[1:]))
+        known = pairs(samples.DEFAULT['text'])
+        generated = list()
+        for __, sentence in self.generator.generate_sentences(1000):
+            generated.extend(pairs(sentence))
+        return sum(pair in known for pair in generated) / float(len(generated))
+
+
+class TimeWeights(object):
+    """Time and track word generation from a uniform or a Zipfian lexicon.
+
+    The Zipfian lexicon counts the default sample words inversely to their
+    rank. Fidelity is the share of the words generated at their length that
+    are the most frequent word of that length, over its expected share.
+    """
+
+    params = ['uniform', 'zipf']
+    param_names = ['lexicon']
+
+    def setup(self, lexicon):
+        text, words, word_delimiters, sentence_delimiters = \
+            samples.DEFAULT.row()
+        self.words = words.split()
+        if lexicon == 'zipf':
+            words = '\n'.join('{0}\t{1}'.format(word, 1000 // rank)
+                              for rank, word in enumerate(self.words, 1))
+        random.seed(common.SEED)
+        self.generator = generator.Generator(generator.Sample(
+            text=text, lexicon=words, word_delimiters=word_delimiters,
+            sentence_delimiters=sentence_delimiters))
+
+    def time_generate_word(self, lexicon):
+        self.generator.generate_word(5)
+
+    def time_generate_sentence(self, lexicon):
+        self.generator.generate_sentence()
+
+    def track_fidelity(self, lexicon):
+        dictionary = self.generator.sample['dictionary']
+        counts = dictionary.counts or [1] * dictionary.size
+        start, end = dictionary.bounds(5)
+        top = max(range(start, end), key=counts.__getitem__)
+        expected = counts[top] / float(sum(counts[start:end]))
+        drawn = [self.generator.generate_word(5) for __ in range(10000)]
+        return drawn.count(dictionary.word(top)) / 10000.0 / expected
+
+
+class _CountingRandom(random.Random):
+    """Counts the integer draws."""
+
+    draws = 0
+
+    def randrange(self, *args):
+        self.draws += 1
+        return random.Random.randrange(self, *args)
+
+    def choice(self, sequence):
+        self.draws += 1
+        return random.Random.choice(self, sequence)
+
+
+class TimeNoRepeat(object):
+    """Time sentence generation avoiding the previous 0, 1 or 3 words, from a
+    lexicon of three words per length.
+
+    Spread is the maximum over the minimum amount of integer draws made to
+    generate a sentence of 20 words: avoiding recent words makes no extra
+    draw, so that it adds no variance to latency.
+    """
+
+    params = [0, 1, 3]
+    param_names = ['no_repeat']
+
+    def setup(self, no_repeat):
+        text, words, word_delimiters, sentence_delimiters = \
+            samples.DEFAULT.row()
+        lexicon = dict()
+        for word in words.split():
+            lexicon.setdefault(len(word), set()).add(word)
+        words = ' '.join(' '.join(sorted(group)[:3])
+                         for group in lexicon.values())
+        random.seed(common.SEED)
+        self.generator = generator.Generator(generator.Sample(
+            text=text, lexicon=words, word_delimiters=word_delimiters,
+            sentence_delimiters=sentence_delimiters))
+
+    def time_generate_sentence(self, no_repeat):
+        self.generator.generate_sentence(sentence_len=20, no_repeat=no_repeat)
+
+    def track_spread(self, no_repeat):
+        draws = list()
+        random_ = _CountingRandom(common.SEED)
+        for __ in range(1000):
+            random_.draws = 0
+            self.generator.generate_sentence(
+                sentence_len=20, no_repeat=no_repeat, random=random_)
+            draws.append(random_.draws)
+        return max(draws) / float(min(draws))
+
+
+class TimeRendering(object):
+    """Time and track the rendering throughput of sentences and paragraphs.
+
+    Throughput is the amount of UTF-8 encoded MiB rendered per second.
+    """
+
+    params = ['sentence', 'paragraph']
+    param_names = ['kind']
+
+    def setup(self, kind):
+        random.seed(common.SEED)
+        self.generator = generator.Generator(samples.DEFAULT)
+        self.generate = getattr(self.generator, 'generate_' + kind)
+
+    def time_render(self, kind):
+        self.generate()
+
+    def track_throughput(self, kind):
+        size, start = 0, timeit.default_timer()
+        while timeit.default_timer() - start < 1:
+            for __ in range(100):
+                size += len(self.generate()[-1].encode('UTF-8'))
+        return size / (timeit.default_timer() - start) / 2 ** 20
+
+
+class TimeBytesRendering(object):
+    """Time rendering UTF-8 encoded paragraphs: by a generator, then encoded,
+    or by a bytes generator."""
+
+    params = ['str', 'bytes']
+    param_names = ['mode']
+
+    def setup(self, mode):
+        random.seed(common.SEED)
+        if mode == 'bytes':
+            self.generator = generator.BytesGenerator(samples.DEFAULT)
+            self.encode = lambda text: text
+        else:
+            self.generator = generator.Generator(samples.DEFAULT)
+            self.encode = lambda text: text.encode('UTF-8')
+
+    def time_paragraph(self, mode):
+        self.encode(self.generator.generate_paragraph()[-1])
+
+    def time_text(self, mode):
+        self.encode(self.generator.generate_text(bytes=4096)[-1])
+
+
+class TimeRenderInto(object):
+    """Time filling up a 64 KiB buffer with a generated text: encoded and
+    copied, or rendered into it."""
+
+    params = ['copy', 'render_into']
+    param_names = ['mode']
+
+    def setup(self, mode):
+        random.seed(common.SEED)
+        self.generator = generator.Generator(samples.DEFAULT)
+        self.buffer = bytearray(2 ** 16)
+
+    def time_fill(self, mode):
+        if mode == 'copy':
+            text = self.generator.generate_text(bytes=len(self.buffer))[-1]
+            self.buffer[:] = text.encode('UTF-8')
+        else:
+            self.generator.render_into(self.buffer)
+
+
+class TimeUniqueRows(object):
+    """Time generating 1000 rows of a sentence column, unique or not, and
+    track the memory needed to remember each value: by a set of the values
+    or by a Bloom filter."""
+
+    params = [False, True]
+    param_names = ['unique']
+
+    def setup(self, unique):
+        random.seed(common.SEED)
+        self.generator = generator.Generator(samples.DEFAULT)
+        self.schema = [('bio', 'sentences', 1, 1, unique)]
+
+    def time_rows(self, unique):
+        next(records.generate_rows(self.schema, 1000,
+                                   generator_=self.generator))
+
+    def track_bytes_per_value(self, unique):
+        values = [row[0] for row in next(records.generate_rows(
+            self.schema, 10000, batch_size=10000, generator_=self.generator))]
+        if unique:
+            seen = records.BloomFilter(len(values))
+            return len(seen._bits) / float(len(values))
+        seen = set(values)
+        return (sys.getsizeof(seen) + sum(
+            sys.getsizeof(value) for value in seen)) / float(len(values))
+
+
+class TimePool(object):
+    """Time serving sentences and paragraphs from a generator or from a
+    pool of 10000 pre-rendered sentences."""
+
+    params = ['generator', 'pool']
+    param_names = ['source']
+
+    def setup(self, source):
+        random.seed(common.SEED)
+        self.source = generator.Generator(samples.DEFAULT)
+        if source == 'pool':
+            self.source = pool.SentencePool(self.source, seed=common.SEED)
+
+    def time_generate_sentence(self, source):
+        self.source.generate_sentence()
+
+    def time_generate_paragraph(self, source):
+        self.source.generate_paragraph()
+
+
+class TimePrefetching(object):
+    """Track the paragraph serving latency of a generator, or of a
+    prefetching generator working in a thread or in a process.
+
+    Latency is the 99th percentile of 500 calls, in microseconds, paced one
+    every millisecond like requests would be.
+    """
+
+    params = ['generator', 'thread', 'process']
+    param_names = ['worker']
+
+    def setup(self, worker):
+        random.seed(common.SEED)
+        self.source = generator.Generator(samples.DEFAULT)
+        if worker != 'generator':
+            self.source = pool.PrefetchingGenerator(
+                self.source, kinds=('paragraph',),
+                process=worker == 'process')
+
+    def teardown(self, worker):
+        if worker != 'generator':
+            self.source.close()
+
+    def track_p99(self, worker):
+        timings = list()
+        for __ in range(500):
+            start = timeit.default_timer()
+            self.source.generate_paragraph()
+            timings.append(timeit.default_timer() - start)
+            time.sleep(0.001)
+        return sorted(timings)[int(len(timings) * 0.99)] * 1e6
+
+
+class TimeCompressedStream(object):
+    """Time writing a gzip encoded stream of 1 MiB, encoding in the
+    generating thread or in a separate one."""
+
+    params = [False, True]
+    param_names = ['threaded']
+
+    def time_write_stream(self, threaded):
+        streaming.write_stream(io.BytesIO(), 'bytes', 2 ** 20,
+                               seed=common.SEED, content_encoding='gzip',
+                               threaded=threaded)
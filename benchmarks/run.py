@@ -0,0 +1,155 @@
+"""
+Runs the benchmark suite without any dependency, storing the results as JSON
+so that they can be compared across versions::
+
+    $ python -m benchmarks.run --output before.json
+    $ git checkout other-version
+    $ python -m benchmarks.run --output after.json --compare before.json
+
+Benchmarks can be filtered by a regular expression over their names::
+
+    $ python -m benchmarks.run --filter 'cooking\\..*cook'
+
+Besides ``time_`` benchmarks, ``track_`` methods return a measured value (like
+a generation fidelity), which is recorded as is.
+"""
+
+import argparse
+import importlib
+import json
+import platform
+import re
+import sys
+import timeit
+
+import loremipsum
+
+MODULES = ['generation', 'cooking', 'serialization']
+
+# Minimum time of a single timing measurement, in seconds.
+MIN_TIME = 0.2
+REPEAT = 5
+
+
+def _benchmarks():
+    """Yields name, class, method name and parameter of each benchmark."""
+    for module_name in MODULES:
+        module = importlib.import_module('benchmarks.' + module_name)
+        for class_name in sorted(dir(module)):
+            class_ = getattr(module, class_name)
+            if not (class_name.startswith('Time') and
+                    isinstance(class_, type)):
+                continue
+            params = getattr(class_, 'params', [None])
+            for method_name in sorted(dir(class_)):
+                if not method_name.startswith(('time_', 'track_')):
+                    continue
+                for param in params:
+                    name = '.'.join((module_name, class_name, method_name))
+                    if param is not None:
+                        name = '{0}({1})'.format(name, param)
+                    yield name, class_, method_name, param
+
+
+def _time(class_, method_name, param):
+    """Times a benchmark, returns the best and all the per call timings."""
+    args = () if param is None else (param,)
+    instance = class_()
+    if hasattr(instance, 'setup'):
+        instance.setup(*args)
+    method = getattr(instance, method_name)
+    timer = timeit.Timer(lambda: method(*args))
+    number = 1
+    while timer.timeit(number) < MIN_TIME:
+        number *= 10
+    timings = [t / number for t in timer.repeat(REPEAT, number)]
+    if hasattr(instance, 'teardown'):
+        instance.teardown(*args)
+    return min(timings), timings
+
+
+def _track(class_, method_name, param):
+    """Returns the value of a track benchmark."""
+    args = () if param is None else (param,)
+    instance = class_()
+    if hasattr(instance, 'setup'):
+        instance.setup(*args)
+    value = getattr(instance, method_name)(*args)
+    if hasattr(instance, 'teardown'):
+        instance.teardown(*args)
+    return value
+
+
+def run(pattern=None):
+    """Runs the benchmarks matching pattern, returns the results."""
+    results = {
+        'version': loremipsum.__version__,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'benchmarks': dict()}
+    for name, class_, method_name, param in _benchmarks():
+        if pattern and not re.search(pattern, name):
+            continue
+        if method_name.startswith('track_'):
+            value = _track(class_, method_name, param)
+            results['benchmarks'][name] = dict(value=value)
+            sys.stderr.write('{0:<68} {1:>14.6f}\n'.format(name, value))
+            continue
+        best, timings = _time(class_, method_name, param)
+        results['benchmarks'][name] = dict(best=best, timings=timings)
+        sys.stderr.write('{0:<68} {1:>12.3f}us\n'.format(name, best * 1e6))
+    return results
+
+
+def compare(baseline, results, threshold):
+    """Prints the comparison of results against baseline.
+
+    :returns:   The names of the benchmarks slower than baseline by more than
+                threshold (a ratio).
+    """
+    slower = list()
+    for name in sorted(results['benchmarks']):
+        if 'best' not in results['benchmarks'][name] or \
+                name not in baseline['benchmarks']:
+            continue
+        before = baseline['benchmarks'][name]['best']
+        after = results['benchmarks'][name]['best']
+        ratio = after / before
+        flag = ''
+        if ratio > 1 + threshold:
+            flag = 'slower'
+            slower.append(name)
+        elif ratio < 1 - threshold:
+            flag = 'faster'
+        sys.stdout.write('{0:<68} {1:>12.3f}us {2:>12.3f}us {3:>6.2f} {4}\n'
+                         .format(name, before * 1e6, after * 1e6, ratio, flag))
+    return slower
+
+
+def main(argv=None):
+    """Runs the benchmark suite command line interface."""
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.run')
+    parser.add_argument('--filter', metavar='REGEX',
+                        help='Only run the benchmarks matching REGEX.')
+    parser.add_argument('--output', metavar='FILE',
+                        help='Store the results into FILE as JSON.')
+    parser.add_argument('--compare', metavar='FILE',
+                        help='Compare the results against FILE.')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='Slowdown ratio reported as a regression. '
+                             'Defaults to 0.1.')
+    args = parser.parse_args(argv)
+    results = run(args.filter)
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(results, output, indent=2, sort_keys=True)
+    if args.compare:
+        with open(args.compare) as baseline:
+            baseline = json.load(baseline)
+        if compare(baseline, results, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,49 @@
+"""Sample serialization benchmarks."""
+
+from loremipsum import generator
+from loremipsum.serialization import content_encodings
+from loremipsum.serialization import content_types
+
+from benchmarks import common
+
+CONTENT_TYPES = sorted(content_types.registered())
+CONTENT_ENCODINGS = sorted(content_encodings.registered())
+
+
+class TimeContentTypes(object):
+    """Time formatting and parsing of a frozen sample, per content type."""
+
+    params = CONTENT_TYPES
+    param_names = ['content_type']
+
+    def setup(self, content_type):
+        sample = generator.Sample.cooked(*common.corpus(100))
+        self.type = content_types.get(content_type)
+        self.frozen = sample.frozen()
+        self.formatted = self.type.format(self.frozen)
+
+    def time_dump(self, content_type):
+        self.type.format(self.frozen)
+
+    def time_load(self, content_type):
+        generator.Sample(**self.type.parse(self.formatted))
+
+
+class TimeContentEncodings(object):
+    """Time encoding and decoding of a formatted sample, per encoding."""
+
+    params = CONTENT_ENCODINGS
+    param_names = ['content_encoding']
+
+    def setup(self, content_encoding):
+        sample = generator.Sample.cooked(*common.corpus(100))
+        self.encoding = content_encodings.get(content_encoding)
+        self.formatted = content_types.get('application/json').format(
+            sample.frozen())
+        self.encoded = self.encoding.encode(self.formatted)
+
+    def time_dump(self, content_encoding):
+        self.encoding.encode(self.formatted)
+
+    def time_load(self, content_encoding):
+        self.encoding.decode(self.encoded)
@@ -58,40 +58,67 @@ __classifiers__ = [
     'Programming Language :: Python :: Implementation :: PyPy',
     'Topic :: Software Development :: Libraries :: Python Modules']
 
+from loremipsum import document
+from loremipsum import engines
 from loremipsum import generator
+from loremipsum import parallel
 from loremipsum import plugs
+from loremipsum import pool
+from loremipsum import records
 from loremipsum import samples
 from loremipsum import serialization
+from loremipsum import streaming
+from loremipsum import tokenizers
 
 # Declaring the package public API
 __all__ = [
+    'Document',
+    'PrefetchingGenerator',
+    'SentencePool',
     'generate_sentence',
     'generate_sentences',
     'generate_paragraph',
     'generate_paragraphs',
+    'generate_text',
     'get_word',
     'get_words',
     'get_sentence',
     'get_sentences',
     'get_paragraph',
     'get_paragraphs',
+    'get_text',
+    'document',
+    'engines',
     'generator',
+    'parallel',
     'plugs',
+    'pool',
+    'records',
     'samples',
-    'serialization']
+    'serialization',
+    'streaming',
+    'tokenizers']
 
 
 # Setting up the plugs
+plugs.setup(engines)
 plugs.setup(samples)
 plugs.setup(serialization.schemes)
 plugs.setup(serialization.content_types)
 plugs.setup(serialization.content_encodings)
+plugs.setup(tokenizers)
 
 # Setting the plugs defaults
+engines.set_default('mersenne')
 serialization.schemes.set_default('file')
 serialization.content_types.set_default('application/json')
 serialization.content_encodings.set_default('gzip')
 samples.set_default('loremipsum')
+tokenizers.set_default('simple')
+
+Document = document.Document
+SentencePool = pool.SentencePool
+PrefetchingGenerator = pool.PrefetchingGenerator
 
 
 def get_word(length=None):
@@ -271,6 +298,30 @@ def get_paragraphs(amount, **args):
         yield paragraph[-1]
 
 
+def get_text(**args):
+    """Creates a single line plausible text of an exact size.
+
+    This function accepts the same arguments as
+    :py:meth:`Generator.generate_text`.
+
+    :rtype: str or unicode
+
+    Get a text that fits a 30 characters column:
+
+    >>> loremipsum.get_text(chars=30)
+    u'Mauris, commodo. Nulla sociis.'
+    >>>
+
+    Or a 15 bytes UTF-8 encoded payload:
+
+    >>> loremipsum.get_text(bytes=15).encode('UTF-8')
+    b'Etiam nunc est.'
+    >>>
+    """
+    default = generator.Generator(samples.DEFAULT)
+    return default.generate_text(**args)[-1]
+
+
 def generate_sentence(**args):
     """Returns a single plausible sentence text with sentence info.
 
@@ -407,3 +458,21 @@ def generate_paragraphs(amount, **args):
     """
     default = generator.Generator(samples.DEFAULT)
     return default.generate_paragraphs(amount, **args)
+
+
+def generate_text(**args):
+    """Creates a single line plausible text of an exact size, with stats.
+
+    The generated text is returned along with the amount of sentences and
+    words count. This function accepts the same arguments and returns the same
+    as :py:meth:`Generator.generate_text`.
+
+    :rtype: tuple
+
+    >>> loremipsum.generate_text(words=10)
+    (2, 10, u'Eget sapien ipsum pharetra. Dis nisi, in ante ac nunc.')
+    >>> loremipsum.generate_text(chars=12)
+    (1, 2, u'Potenti sit.')
+    """
+    default = generator.Generator(samples.DEFAULT)
+    return default.generate_text(**args)
@@ -0,0 +1,9 @@
+"""Runs the ``loremipsum`` command line interface: see :py:mod:`loremipsum.cli`.
+"""
+
+import sys
+
+from loremipsum import cli
+
+if __name__ == '__main__':
+    sys.exit(cli.main())
@@ -0,0 +1,177 @@
+"""
+This module provides the ``loremipsum`` command line interface, which streams
+generated text to the standard output or to a file. It can be run as
+``python -m loremipsum`` as well:
+
+.. code-block:: sh
+
+    $ loremipsum --sentences 3 --seed 1
+    $ loremipsum --bytes 1048576 --jobs 4 --output payload.txt
+    $ loremipsum --sample file:///path/to/sample.json --format jsonl | head
+
+If no amount is given, paragraphs are streamed forever, so that the command can
+be used as a text source in shell pipelines. The throughput is reported on the
+standard error, unless ``--quiet`` is given.
+
+Long runs writing to a file can be made resumable: if the command is run again
+after a failure, with the same arguments, it resumes from the last checkpoint
+instead of starting over:
+
+.. code-block:: sh
+
+    $ loremipsum --bytes 1099511627776 --seed 1 --output corpus.txt \
+    >     --checkpoint corpus.json
+
+The output can be compressed as it is written, using any plugged content
+encoding, optionally in a separate thread:
+
+.. code-block:: sh
+
+    $ loremipsum --bytes 1073741824 --content-encoding gzip --encoding-thread \
+    >     --output corpus.txt.gz
+
+See :py:mod:`loremipsum.streaming` for the supported kinds and formats.
+"""
+
+import argparse
+import errno
+import os
+import sys
+import time
+
+import loremipsum
+from loremipsum import streaming
+
+__all__ = ['main']
+
+
+def _parser():
+    """Builds the command line arguments parser."""
+    parser = argparse.ArgumentParser(
+        prog='loremipsum',
+        description='Stream random plausible text.')
+    amounts = parser.add_mutually_exclusive_group()
+    for kind in streaming.KINDS:
+        amounts.add_argument(
+            '--' + kind, type=int, metavar='N',
+            help='Generate N {0}.'.format(kind))
+    parser.add_argument(
+        '--sample', metavar='URL',
+        help='Load the sample from URL. Defaults to the default sample.')
+    parser.add_argument(
+        '--seed', type=int,
+        help='Seed the generation, for a reproducible output.')
+    parser.add_argument(
+        '--jobs', type=int, default=1, metavar='N',
+        help='Generate using N processes. Defaults to 1.')
+    parser.add_argument(
+        '--format', choices=streaming.FORMATS, default='text',
+        help='The output format. Defaults to text.')
+    parser.add_argument(
+        '--chunk-size', type=int, metavar='N',
+        help='Generate N items (or bytes) per chunk.')
+    parser.add_argument(
+        '--output', metavar='FILE',
+        help='Write to FILE instead of the standard output.')
+    parser.add_argument(
+        '--content-encoding', metavar='NAME',
+        help='Encode the output using the NAME content encoding (like gzip '
+             'or bzip2).')
+    parser.add_argument(
+        '--encoding-thread', action='store_true',
+        help='Encode the output in a separate thread.')
+    parser.add_argument(
+        '--checkpoint', metavar='FILE',
+        help='Checkpoint the generation into FILE, and resume from it if it '
+             'exists. Requires --output.')
+    parser.add_argument(
+        '--checkpoint-interval', type=float, metavar='SECONDS',
+        default=streaming.CHECKPOINT_INTERVAL,
+        help='Checkpoint every SECONDS. Defaults to {0:g}.'.format(
+            streaming.CHECKPOINT_INTERVAL))
+    parser.add_argument(
+        '--quiet', action='store_true',
+        help="Don't report the throughput on the standard error.")
+    parser.add_argument(
+        '--version', action='version',
+        version='%(prog)s {0}'.format(loremipsum.__version__))
+    return parser
+
+
+class _Counted(object):
+    """Counts the bytes written into a binary file."""
+
+    def __init__(self, output):
+        self.output, self.written = output, 0
+
+    def write(self, data):
+        self.output.write(data)
+        self.written += len(data)
+
+    def __getattr__(self, name):
+        return getattr(self.output, name)
+
+
+def _report(written, elapsed):
+    """Reports the throughput on the standard error."""
+    rate = written / max(elapsed, 1e-9) / 2 ** 20
+    message = 'loremipsum: {0} bytes in {1:.3f}s ({2:.2f} MiB/s)\n'
+    sys.stderr.write(message.format(written, elapsed, rate))
+
+
+def _validate(parser, args):
+    """Exits with a usage error if the parsed arguments are inconsistent.
+    Returns the kind and the amount of text to be generated."""
+    kind, amount = 'paragraphs', None
+    for name in streaming.KINDS:
+        if getattr(args, name) is not None:
+            kind, amount = name, getattr(args, name)
+    if kind == 'bytes' and args.format != 'text':
+        parser.error('--bytes can only be generated in text format')
+    if args.jobs < 1:
+        parser.error('--jobs must be at least 1')
+    if args.checkpoint and not args.output:
+        parser.error('--checkpoint requires --output')
+    return kind, amount
+
+
+def main(argv=None):
+    """Runs the command line interface.
+
+    :param list argv:   The command line arguments. Defaults to
+                        :py:data:`sys.argv`.
+    :returns:           The exit status.
+    :rtype:             int
+    """
+    parser = _parser()
+    args = parser.parse_args(argv)
+    kind, amount = _validate(parser, args)
+
+    if args.output:
+        resume = args.checkpoint and os.path.exists(args.checkpoint)
+        output = open(args.output, 'r+b' if resume else 'wb')
+    else:
+        output = getattr(sys.stdout, 'buffer', sys.stdout)
+    output = _Counted(output)
+    start = time.time()
+    try:
+        streaming.write_stream(
+            output, kind, amount, sample=args.sample, seed=args.seed,
+            jobs=args.jobs, format=args.format, chunk_size=args.chunk_size,
+            content_encoding=args.content_encoding,
+            threaded=args.encoding_thread, checkpoint=args.checkpoint,
+            checkpoint_interval=args.checkpoint_interval)
+    except IOError as error:
+        if error.errno != errno.EPIPE:
+            raise
+        # The reader went away: don't complain when flushing at exit.
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, output.fileno())
+    except ValueError as error:
+        parser.exit(1, 'loremipsum: error: {0}\n'.format(error))
+    finally:
+        if args.output:
+            output.close()
+    if not args.quiet:
+        _report(output.written, time.time() - start)
+    return 0
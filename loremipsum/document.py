@@ -0,0 +1,142 @@
+"""
+This module provides :py:class:`Document`: a read-only sequence of generated
+paragraphs, which is never materialized. Each paragraph is generated on access,
+using the :py:class:`Generator` counter based mode, so a document of a billion
+paragraphs takes as much memory as a document of ten:
+
+>>> document = loremipsum.Document(seed=42)
+>>> len(document)
+1000000000
+>>> document[123456] == document[123456]
+True
+>>> len(document[10:20])
+10
+>>>
+
+If ``paragraph_bytes`` is given, each paragraph is a single line text of that
+exact amount of UTF-8 encoded bytes, as per :py:meth:`Generator.generate_text`.
+The document can then be read as the UTF-8 encoded text made of the
+paragraphs, each followed by an empty line, at any byte offset:
+
+>>> document = loremipsum.Document(seed=42, paragraph_bytes=1022)
+>>> document.size
+1024000000000
+>>> len(document.read(2 ** 30, 4096))
+4096
+>>>
+"""
+
+import collections
+import sys
+
+from loremipsum import generator
+from loremipsum import samples
+
+__all__ = ['Document']
+
+builtins = sys.modules.get('__builtin__', sys.modules.get('builtins'))
+_irange = getattr(builtins, 'xrange', range)
+_abc = getattr(collections, 'abc', collections)
+
+# Follows each paragraph in the document text.
+SEPARATOR = b'\n\n'
+
+
+class Document(_abc.Sequence):
+    """A lazy, read-only, sequence of generated paragraphs.
+
+    :param sample:              The :py:class:`Sample` to be used. Defaults to
+                                the default sample.
+    :param int seed:            The document seed. Defaults to 0.
+    :param int paragraphs:      The amount of paragraphs. Defaults to 10 ** 9.
+    :param int paragraph_bytes: Optional. The exact size of each paragraph, in
+                                UTF-8 encoded bytes.
+
+    Slicing a document returns a document, sharing the same paragraphs.
+    """
+
+    def __init__(self, sample=None, seed=0, paragraphs=10 ** 9,
+                 paragraph_bytes=None):
+        if paragraphs < 0:
+            raise ValueError('Invalid paragraphs: {0}'.format(paragraphs))
+        self._generator = generator.Generator(sample or samples.DEFAULT)
+        self._seed = seed
+        self._paragraph_bytes = paragraph_bytes
+        self._start, self._step, self._len = 0, 1, paragraphs
+
+    @property
+    def seed(self):
+        return self._seed
+
+    @property
+    def paragraph_bytes(self):
+        return self._paragraph_bytes
+
+    @property
+    def size(self):
+        """The size of the document text in bytes, or None if paragraphs are
+        not of a fixed size."""
+        if self._paragraph_bytes is None:
+            return None
+        return self._len * (self._paragraph_bytes + len(SEPARATOR))
+
+    def _paragraph(self, position):
+        """Generates the paragraph at position, which must be in range."""
+        index = self._start + position * self._step
+        if self._paragraph_bytes is None:
+            return self._generator.generate_paragraph(
+                seed=self._seed, index=index)[-1]
+        return self._generator.generate_text(
+            bytes=self._paragraph_bytes, seed=self._seed, index=index)[-1]
+
+    def __len__(self):
+        return self._len
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self._len)
+            view = self.__class__.__new__(self.__class__)
+            view.__dict__.update(self.__dict__)
+            view._start = self._start + start * self._step
+            view._step = self._step * step
+            view._len = len(_irange(start, stop, step))
+            return view
+        if key < 0:
+            key += self._len
+        if not 0 <= key < self._len:
+            raise IndexError('Document index out of range')
+        return self._paragraph(key)
+
+    def __iter__(self):
+        for position in _irange(self._len):
+            yield self._paragraph(position)
+
+    def __repr__(self):
+        return '<{0} seed={1} paragraphs={2}>'.format(
+            self.__class__.__name__, self._seed, self._len)
+
+    def read(self, offset=0, size=None):
+        """Reads the document text.
+
+        :param int offset:      The offset of the first byte to be read.
+        :param int size:        The amount of bytes to be read. Defaults to
+                                the end of the document.
+        :returns:               The UTF-8 encoded text, which is shorter than
+                                size at the end of the document.
+        :rtype:                 bytes
+        :raises TypeError:      If paragraphs are not of a fixed size.
+        :raises ValueError:     If offset is negative.
+        """
+        if self._paragraph_bytes is None:
+            raise TypeError('Document paragraphs are not of a fixed size')
+        if offset < 0:
+            raise ValueError('Invalid offset: {0}'.format(offset))
+        stride = self._paragraph_bytes + len(SEPARATOR)
+        end = self.size if size is None else min(self.size, offset + size)
+        chunks = list()
+        position, skip = divmod(offset, stride)
+        while position * stride < end:
+            record = self._paragraph(position).encode('UTF-8') + SEPARATOR
+            chunks.append(record[skip:end - position * stride])
+            position, skip = position + 1, 0
+        return b''.join(chunks)
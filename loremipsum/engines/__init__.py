@@ -0,0 +1,43 @@
+"""
+This package provides the random number generator engines used by
+:py:class:`loremipsum.generator.Generator`. This is a pluggable package:
+default engine is named ``mersenne``.
+
+An engine is a module (or any object) exposing a ``Random`` class, whose
+instances are created with an optional integer seed (which defaults to a
+random one) and provide the following methods:
+
+.. py:method:: Random.random()
+
+   Returns a float in the [0.0, 1.0) interval.
+
+.. py:method:: Random.randrange(n)
+
+   Returns an integer in the [0, n) interval.
+
+.. py:method:: Random.choice(seq)
+
+   Returns a random item of a non-empty sequence.
+
+.. py:method:: Random.normalvariate(mu, sigma)
+
+   Returns a normally distributed float.
+
+.. py:method:: Random.randbelows(n, k)
+
+   Returns a list of k integers in the [0, n) interval.
+
+Plugged engines are:
+
+:``mersenne``:
+    The :py:class:`random.Random` Mersenne Twister, whose streams may change
+    across Python versions.
+:``portable``:
+    A generator whose streams are the same on every Python version and
+    implementation, see :py:mod:`loremipsum.engines.portable`.
+"""
+
+from loremipsum.engines import mersenne
+from loremipsum.engines import portable
+
+__all__ = ['mersenne', 'portable']
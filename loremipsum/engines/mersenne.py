@@ -0,0 +1,16 @@
+"""The :py:mod:`random` module Mersenne Twister engine."""
+
+import random
+import sys
+
+builtins = sys.modules.get('__builtin__', sys.modules.get('builtins'))
+_irange = getattr(builtins, 'xrange', range)
+
+
+class Random(random.Random):
+    """A :py:class:`random.Random` providing batched draws."""
+
+    def randbelows(self, n, k):
+        """Returns a list of k integers in the [0, n) interval."""
+        randrange = self.randrange
+        return [randrange(n) for __ in _irange(k)]
@@ -0,0 +1,80 @@
+"""
+The portable engine: its streams are the same on every Python version and
+implementation.
+
+The Mersenne Twister core stream of :py:class:`random.Random`, as returned by
+``getrandbits`` and ``random`` when seeded by an integer, never changed; the
+algorithms built on top of it (like ``choice``, ``sample`` and
+``normalvariate``) did. This engine implements its own on top of the core
+stream, so it is as fast as the :py:mod:`random` module.
+
+Integers in the [0, n) interval are drawn by multiplying 64 bits outputs by n
+and keeping the high 64 bits: the bias is below n / 2 ** 64. Normal variates
+are drawn using the Box-Muller transform.
+"""
+
+import math
+import random
+import sys
+
+builtins = sys.modules.get('__builtin__', sys.modules.get('builtins'))
+_irange = getattr(builtins, 'xrange', range)
+
+_TWO_PI = 2.0 * math.pi
+_EPSILON = 2.0 ** -53
+
+
+class Random(object):
+    """A portable random number generator.
+
+    :param int seed:    Optional. An integer. Defaults to a random one.
+    """
+
+    def __init__(self, seed=None):
+        self.seed(seed)
+
+    def seed(self, seed=None):
+        """Initializes the state from an integer seed."""
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(128)
+        self._core = random.Random(seed)
+        self._gauss = None
+        self.getrandbits = self._core.getrandbits
+        self.random = self._core.random
+
+    def getstate(self):
+        return self._core.getstate(), self._gauss
+
+    def setstate(self, state):
+        self._core.setstate(state[0])
+        self._gauss = state[1]
+
+    def randrange(self, n):
+        """Returns an integer in the [0, n) interval."""
+        if n <= 0:
+            raise ValueError('Empty range: {0}'.format(n))
+        return (self.getrandbits(64) * n) >> 64
+
+    def choice(self, seq):
+        """Returns a random item of a non-empty sequence."""
+        if not seq:
+            raise IndexError('Cannot choose from an empty sequence')
+        return seq[(self.getrandbits(64) * len(seq)) >> 64]
+
+    def normalvariate(self, mu, sigma):
+        """Returns a normally distributed float."""
+        z, self._gauss = self._gauss, None
+        if z is None:
+            # u1 is in the (0.0, 1.0] interval.
+            u1 = (self.getrandbits(53) + 1) * _EPSILON
+            angle = _TWO_PI * self.getrandbits(53) * _EPSILON
+            radius = math.sqrt(-2.0 * math.log(u1))
+            z, self._gauss = radius * math.cos(angle), radius * math.sin(angle)
+        return mu + z * sigma
+
+    def randbelows(self, n, k):
+        """Returns a list of k integers in the [0, n) interval."""
+        if n <= 0:
+            raise ValueError('Empty range: {0}'.format(n))
+        getrandbits = self.getrandbits
+        return [(getrandbits(64) * n) >> 64 for __ in _irange(k)]
@@ -6,24 +6,58 @@ This module exposes the 2 classes used to generate random plausible text:
     from a sample.
 :``Generator``:
     Provides the API to actually generate the text, using a sample.
+:``BytesGenerator``:
+    Generates the same text as UTF-8 encoded bytes.
+
+Both can optionally be instrumented using a :py:class:`Stats` object.
 """
 
 from __future__ import unicode_literals
+import array
+import bisect
+import codecs
 import collections
 import contextlib
+import functools
+import hashlib
 import math
 import random
 import re
 import sys
+import timeit
 
+from loremipsum import engines
 from loremipsum.serialization import schemes
+from loremipsum import tokenizers
 
-__all__ = ['Generator', 'Sample']
+__all__ = ['BytesGenerator', 'Chains', 'Generator', 'Lexicon', 'Sample',
+           'Stats']
 
 builtins = sys.modules.get('__builtin__', sys.modules.get('builtins'))
 _urlparse = 'urlparse' if sys.version_info[0] == 2 else 'urllib.parse'
 _urlparse = __import__(_urlparse, fromlist=_urlparse.split('.')[:1]).urlparse
 _irange = getattr(builtins, 'xrange', range)
+_text_types = (getattr(builtins, 'unicode', str), str)
+_integer_types = (getattr(builtins, 'long', int), int)
+_abc = getattr(collections, 'abc', collections)
+
+# Default Markov chains order: the amount of previous word lengths.
+ORDER = 2
+
+# Generation models: Markov chains of word lengths, or of words.
+MODELS = ('lengths', 'words')
+
+# Generators decode lexicons of up to this amount of words once, for speed.
+_DECODED_WORDS = 2 ** 16
+
+# Separate counter based mode words, sentences, paragraphs and texts.
+_COUNTER_KINDS = {'word': 1, 'sentence': 2, 'paragraph': 3, 'text': 4}
+
+# Compiled patterns: sentences ones by sentence delimiters.
+_SENTENCES = dict()
+_WORDS = re.compile(r'\s*([\S]+)')
+# A line of a lexicon with counts.
+_COUNTED = re.compile(r'^\s*(\S+)\t\s*(-?\d+)\s*$')
 
 
 def _mean(values):
@@ -36,6 +70,760 @@ def _sigma(values):
     return math.sqrt(_mean([v ** 2 for v in values]) - _mean(values) ** 2)
 
 
+def _histogram(values):
+    """Returns the histogram of a list of integers: sorted (value, count)
+    pairs."""
+    return tuple(sorted(collections.Counter(values).items()))
+
+
+def _alias_table(histogram):
+    """Builds the alias table of a histogram, using integer arithmetic only.
+
+    Returns a tuple containing the values, the total count, the thresholds and
+    the aliases of each column. See :py:func:`_alias_draw`.
+    """
+    values = [value for value, __ in histogram]
+    total = sum(count for __, count in histogram)
+    # Each column holds total weight: scale the counts accordingly.
+    scaled = [count * len(values) for __, count in histogram]
+    thresholds = [total] * len(values)
+    aliases = list(values)
+    small = [i for i, weight in enumerate(scaled) if weight < total]
+    large = [i for i, weight in enumerate(scaled) if weight >= total]
+    while small and large:
+        less, more = small.pop(), large.pop()
+        thresholds[less], aliases[less] = scaled[less], values[more]
+        scaled[more] -= total - scaled[less]
+        (small if scaled[more] < total else large).append(more)
+    return (values, total, thresholds, aliases)
+
+
+def _alias_draw(table, random_=random):
+    """Draws a value from an alias table, using a single integer draw."""
+    values, total, thresholds, aliases = table
+    column, weight = divmod(random_.randrange(len(values) * total), total)
+    if weight < thresholds[column]:
+        return values[column]
+    return aliases[column]
+
+
+def _draw_excluding(bucket, recent, random_=random, cumulative=None):
+    """Draws the position of a word of bucket, other than the recent words.
+
+    The bucket holds sorted words, the recent words it holds are excluded:
+    the position is drawn among the other words, then shifted past the
+    excluded positions, so that no draw is ever rejected. If all the words are
+    recent, the oldest ones are allowed again.
+
+    If cumulative (the cumulative counts of the words) is given, words are
+    drawn proportionally to their counts.
+    """
+    positions = list()
+    for word in recent:
+        position = bisect.bisect_left(bucket, word)
+        if position < len(bucket) and bucket[position] == word:
+            positions.append(position)
+    excluded = positions if len(positions) < 2 else sorted(set(positions))
+    while len(excluded) >= len(bucket):
+        positions = positions[1:]
+        excluded = sorted(set(positions))
+    if cumulative is None:
+        pick = random_.randrange(len(bucket) - len(excluded))
+        for position in excluded:
+            if pick >= position:
+                pick += 1
+        return pick
+    starts = [cumulative[position - 1] if position else 0
+              for position in excluded]
+    pick = random_.randrange(cumulative[-1] - sum(
+        cumulative[position] - start
+        for position, start in zip(excluded, starts)))
+    for position, start in zip(excluded, starts):
+        if pick >= start:
+            pick += cumulative[position] - start
+    return bisect.bisect_right(cumulative, pick)
+
+
+def _reachable(end, size, exact=True):
+    """Returns the size of the planned sentences: size if end[size] (whole
+    sentences can measure size), otherwise the closest size below it that
+    whole sentences (or no sentence) can measure.
+
+    :raises ValueError: If exact and whole sentences can't measure size.
+    """
+    if end[size]:
+        return size
+    if exact:
+        raise ValueError('Cannot generate text of size {0}'.format(size))
+    return max(t for t in _irange(size + 1) if t == 0 or end[t])
+
+
+def _single(group, singles):
+    """Returns the word of a group of words, as per
+    :py:func:`_measure_groups`, if it is the only word of its measure (in
+    singles), otherwise None."""
+    words = group[1]
+    return words[0] if len(words) == 1 and words[0] in singles else None
+
+
+def _feasible(groups, t, after, singles, key):
+    """Returns the groups of words after which t can be filled up, as per
+    :py:func:`_plan_tables`, except the group of the previous word, if it is
+    the only word of its measure (key)."""
+    return [group for group in groups
+            if group[0] <= t and after[_single(group, singles)][
+                t - group[0]] and (key is None or group[1] != (key,))]
+
+
+def _plan_tables(size, pool, singles, space, stop):
+    """Returns the tables of the measures the exact size planner can fill
+    up, given the groups of all the words and of all the first words of
+    sentences (pool, see :py:meth:`Generator._planned`), the words that are
+    the only ones of their measure (singles), and the measures of a space and
+    of a sentence ending (stop).
+
+    By remaining measure, the tables tell whether it can be filled up
+    exactly: by whole sentences (``sentences``), by the words following a
+    word in a sentence and what follows them (``words``), after a word, by
+    its ending or a space and more words (``after``), and between sentences,
+    by nothing or a space and whole sentences (``between``). Words are
+    assumed to be separated by spaces: other spacers are checked against the
+    tables as they are drawn.
+
+    As no word follows itself, ``words`` and ``after`` are dictionaries of
+    tables, by previous word: one of singles, or None for any other word.
+    """
+    plains = [(group[0], _single(group, singles)) for group in pool[0]]
+    titles = [(group[0], _single(group, singles)) for group in pool[1]]
+    keys = [None] + sorted(singles)
+    sentences = [False] * (size + 1)
+    words = dict((key, [False] * (size + 1)) for key in keys)
+    after = dict((key, [False] * (size + 1)) for key in keys)
+    between = [True] + [False] * size
+    for t in _irange(1, size + 1):
+        for key in keys:
+            words[key][t] = any(
+                after[single][t - word] for word, single in plains
+                if word <= t and (single is None or single != key))
+        sentences[t] = any(after[single][t - word]
+                           for word, single in titles if word <= t)
+        for key in keys:
+            after[key][t] = t >= stop and between[t - stop] or \
+                t > space and words[key][t - space]
+        between[t] = t > space and sentences[t - space]
+    return sentences, words, after, between
+
+
+def _random_len(mean, sigma, random_=random):
+    """Draws a normally distributed length, which is at least 2."""
+    return max(2, int(round(abs(random_.normalvariate(mean, sigma)))))
+
+
+def _randbelows(random_, n, k):
+    """Draws a list of k integers in the [0, n) interval, in a single batch
+    if random_ is an engine random number generator."""
+    if hasattr(random_, 'randbelows'):
+        return random_.randbelows(n, k)
+    randrange = random_.randrange
+    return [randrange(n) for __ in _irange(k)]
+
+
+def _weighted_pick(weights, random_=random):
+    """Draws the index of one of the weights, proportionally to it."""
+    if len(weights) == 1:
+        return 0
+    pick = random_.randrange(sum(weights))
+    for index, weight in enumerate(weights):
+        if pick < weight:
+            return index
+        pick -= weight
+
+
+def _fresh(words, recent):
+    """Returns True if some of the words are not recent."""
+    return len(words) > len(recent) or \
+        any(word not in recent for word in words)
+
+
+def _measure_groups(words, counts, measure):
+    """Groups sorted words by their measure, for the exact size planner.
+
+    Returns a list of (measure, words, cumulative counts) tuples, sorted by
+    measure: the words of each group are still sorted, and the cumulative
+    counts are None if counts is None. Groups whose words all count 0 are
+    dropped.
+    """
+    positions = collections.defaultdict(list)
+    for position, word in enumerate(words):
+        positions[measure(word)].append(position)
+    groups = list()
+    for key in sorted(positions):
+        cumulative = None
+        if counts is not None:
+            total, cumulative = 0, list()
+            for position in positions[key]:
+                total += counts[position]
+                cumulative.append(total)
+            if not total:
+                continue
+            cumulative = _array('L', cumulative)
+        groups.append((key, tuple(words[position]
+                                  for position in positions[key]),
+                       cumulative))
+    return groups
+
+
+def _group_weight(group):
+    """Returns the weight of a group of words, as per
+    :py:func:`_measure_groups`: its total count."""
+    return len(group[1]) if group[2] is None else group[2][-1]
+
+
+def _counter_random(seed, index, kind, engine):
+    """Returns an engine random number generator seeded by seed, index and
+    kind.
+
+    The generator only depends on its arguments, so any element of a counter
+    based sequence can be generated independently.
+    """
+    return engine.Random(_counter_seed(seed, index, kind))
+
+
+def _counter_seed(seed, index, kind):
+    """Returns the seed of the counter based mode generator of seed, index
+    and kind."""
+    if seed < 0 or not 0 <= index < 2 ** 64:
+        raise ValueError('Invalid seed or index: {0} {1}'.format(seed, index))
+    return (seed << 3 | _COUNTER_KINDS[kind]) << 64 | index
+
+
+def _counter(args):
+    """Pops the counter based mode seed and index out of args.
+
+    Returns None if neither is given, otherwise a tuple containing the seed and
+    the index, both defaulting to 0.
+    """
+    seed = args.pop('seed', None)
+    index = args.pop('index', None)
+    if seed is None and index is None:
+        return None
+    return (seed or 0, index or 0)
+
+
+def _key_bytes(key):
+    """Encodes a key as bytes, the same way on any platform and version."""
+    if isinstance(key, bytes):
+        return b'b' + key
+    elif isinstance(key, _text_types):
+        return b's' + key.encode('UTF-8')
+    elif isinstance(key, _integer_types) and not isinstance(key, bool):
+        return b'i' + str(key).encode('ascii')
+    elif isinstance(key, tuple):
+        items = [_key_bytes(item) for item in key]
+        return b't' + b''.join(str(len(item)).encode('ascii') + b':' + item
+                               for item in items)
+    raise TypeError('Unsupported key type: {0}'.format(type(key)))
+
+
+def _key_seed(key):
+    """Maps a key to a counter based mode seed, through a stable hash."""
+    return int(hashlib.sha256(_key_bytes(key)).hexdigest()[:16], 16)
+
+
+def _tokenizer(tokenizer):
+    """Returns a tokenizer, given a tokenizer, its plug name or None for the
+    default tokenizer."""
+    if tokenizer is None:
+        # The default sample is cooked before the plugs are set up.
+        return getattr(tokenizers, 'DEFAULT', None) or tokenizers.simple
+    elif not hasattr(tokenizer, 'tokenize'):
+        return tokenizers.get(tokenizer)
+    return tokenizer
+
+
+def _lengths_chains(tokenizer, text, word_delimiters, sentence_delimiters,
+                    order):
+    """Builds the Markov chains of the word lengths of a sample text, in a
+    single pass over the tokenized text.
+
+    Returns the chains transitions, the states that can start a sentence, and
+    the lengths of the sentences (in words) and of the paragraphs (in
+    sentences).
+    """
+    paragraphs_lens = list()
+    sentences_lens = list()
+    previous = (0,) * order
+    # Chains of order + 1 words that appear in the sample text
+    # Maps order word-lengths to a next word-length and an optional
+    # piece of trailing punctuation (for example, a period, comma, etc.)
+    chains = collections.defaultdict(list)
+    starts = [previous]
+    last_paragraph = last_sentence = None
+    for paragraph, sentence, length, delimiter in tokenizer.tokenize(
+            text, word_delimiters, sentence_delimiters):
+        if paragraph != last_paragraph:
+            paragraphs_lens.append(0)
+            last_paragraph = paragraph
+        if sentence is None:
+            continue
+        if sentence != last_sentence:
+            sentences_lens.append(0)
+            paragraphs_lens[-1] += 1
+            last_sentence = sentence
+        sentences_lens[-1] += 1
+        if length:
+            chains[previous].append((length, delimiter))
+            if delimiter:
+                starts.append(previous)
+            previous = previous[1:] + (length,)
+    return chains, starts, sentences_lens, paragraphs_lens
+
+
+def _words_chains(sample):
+    """Builds the Markov chains of the words of the sample text.
+
+    Returns the chains, whose states are tuples of word ids, the states that
+    can start a sentence and the vocabulary: the words by id. Word id 0 is no
+    word.
+    """
+    tokenizer = _tokenizer(sample._tokenizer)
+    order = sample._s.get('order', ORDER)
+    sentence_delimiters = sample['sentence_delimiters']
+    ids, vocabulary = dict(), ['']
+    chains = collections.defaultdict(list)
+    previous = (0,) * order
+    starts = [previous]
+    for __, __, word, delimiter in tokenizer.words(
+            sample['text'], sample['word_delimiters'], sentence_delimiters):
+        if not word:
+            continue
+        word = word.lower()
+        if word not in ids:
+            ids[word] = len(vocabulary)
+            vocabulary.append(word)
+        chains[previous].append((ids[word], delimiter))
+        previous = previous[1:] + (ids[word],)
+        if delimiter and delimiter in sentence_delimiters:
+            starts.append(previous)
+    return Chains(chains, order), starts, vocabulary
+
+
+def _lexicon(text):
+    """Parses a lexicon text: whitespace separated words, or lines of tab
+    separated words and counts.
+
+    Counts are only parsed if every line holding a tab is a word, a tab and
+    an integer (lines without tabs hold words counted 1). Otherwise, tabs are
+    whitespace like any other.
+
+    Returns a tuple containing the list of the words and the list of their
+    counts, which is None if no count is given.
+    """
+    lines = [line for line in text.splitlines() if '\t' in line]
+    if not lines or not all(_COUNTED.match(line) for line in lines):
+        return text.split(), None
+    words, counts = list(), list()
+    for line in text.splitlines():
+        match = _COUNTED.match(line)
+        if match is None:
+            line_words = line.split()
+            words.extend(line_words)
+            counts.extend([1] * len(line_words))
+            continue
+        words.append(match.group(1))
+        counts.append(int(match.group(2)))
+    return words, counts
+
+
+def _array(typecode, values):
+    """Returns an array of values, or a list if they don't fit typecode."""
+    try:
+        return array.array(typecode, values)
+    except (OverflowError, ValueError):
+        return list(values)
+
+
+def _lexicon_groups(words, counts):
+    """Groups the words of a :py:class:`Lexicon` (and their counts, if any)
+    by length. Returns the dictionaries of the words and of the counts (or
+    None), mapping lengths to lists."""
+    if isinstance(words, dict):
+        for length, group in words.items():
+            if group and set(map(len, group)) != set([length]):
+                raise ValueError('Invalid lexicon length: {0}'.format(length))
+        return words, counts
+    groups = dict()
+    if counts is None:
+        for word in words:
+            groups.setdefault(len(word), list()).append(word)
+        return groups, None
+    count_groups = dict()
+    for word, count in zip(words, counts):
+        groups.setdefault(len(word), list()).append(word)
+        count_groups.setdefault(len(word), list()).append(count)
+    return groups, count_groups
+
+
+def _lexicon_totals(group, counts):
+    """Adds up the counts of the repeated words of a group of words of the
+    same length. Returns the sorted words which count, and their counts (or
+    None, if every word counts 1 once)."""
+    if counts is None:
+        if len(set(group)) == len(group):
+            return sorted(group), None
+        totals = collections.Counter(group)
+    else:
+        totals = collections.defaultdict(int)
+        for word, count in zip(group, counts):
+            if count < 0:
+                raise ValueError('Invalid lexicon count: {0}'.format(word))
+            totals[word] += count
+    group = sorted(word for word in totals if totals[word])
+    return group, [totals[word] for word in group]
+
+
+def _lexicon_counts(size, weights):
+    """Returns the counts of the words of a :py:class:`Lexicon` of size
+    words, given the (start, counts) weights of its groups, or None if every
+    word counts 1."""
+    if all(set(counts) == set([1]) for __, counts in weights):
+        return None
+    counts = [1] * size
+    for start, group_counts in weights:
+        counts[start:start + len(group_counts)] = group_counts
+    return _array('L', counts)
+
+
+class Chains(object):
+    """The Markov chains of word lengths, in compressed sparse rows.
+
+    :param dict transitions:    Maps states (tuples of ``order`` word lengths)
+                                to lists of (word length, delimiter) tuples.
+    :param int order:           The length of the states. Defaults to the
+                                length of the first state.
+
+    States are packed into integers, concatenating the word lengths bits, and
+    sorted. Each state row lists its distinct transitions in sorted order, as
+    parallel arrays of word lengths, delimiter indexes, cumulative counts and
+    rows of the following states (or -1, if they have no transitions).
+
+    ``Chains`` behaves like a read-only dictionary of the transitions.
+    """
+
+    def __init__(self, transitions, order=None):
+        if order is None:
+            order = len(next(iter(transitions), (0, 0)))
+        self.order = order
+        rows = [(state, sorted(collections.Counter(values).items()))
+                for state, values in transitions.items()]
+        lengths = [max(state + (values[-1][0][0],)) for state, values in rows]
+        self._bits = max(lengths or [1]).bit_length() or 1
+        self._mask = (1 << self._bits * order) - 1
+        self.delimiters = tuple(sorted(set(
+            delimiter for __, values in rows
+            for (__, delimiter), __ in values)))
+        indexes = dict((d, i) for i, d in enumerate(self.delimiters))
+        rows = sorted((self.pack(state), values) for state, values in rows)
+        self.states = _array('Q', [state for state, __ in rows])
+        offsets, lengths, delimiters, counts = [0], list(), list(), list()
+        for __, values in rows:
+            total = 0
+            for (length, delimiter), count in values:
+                total += count
+                lengths.append(length)
+                delimiters.append(indexes[delimiter])
+                counts.append(total)
+            offsets.append(len(lengths))
+        self.offsets = _array('L', offsets)
+        self.lengths = _array('H', lengths)
+        self.delimiter_indexes = _array('B', delimiters)
+        self.counts = _array('L', counts)
+        self.next_rows = _array('l', [
+            self.row(self.shift(state, self.lengths[index]))
+            for row, (state, __) in enumerate(rows)
+            for index in _irange(offsets[row], offsets[row + 1])])
+
+    def pack(self, state):
+        """Packs a state into an integer."""
+        packed = 0
+        for length in state:
+            packed = packed << self._bits | length
+        return packed
+
+    def unpack(self, packed):
+        """Unpacks an integer into a state."""
+        mask = (1 << self._bits) - 1
+        return tuple((packed >> self._bits * shift) & mask
+                     for shift in _irange(self.order - 1, -1, -1))
+
+    def shift(self, packed, length):
+        """Returns the packed state following packed, given a word length."""
+        return (packed << self._bits | length) & self._mask
+
+    def row(self, packed):
+        """Returns the row of a packed state, or -1 if it has no transitions."""
+        row = bisect.bisect_left(self.states, packed)
+        if row < len(self.states) and self.states[row] == packed:
+            return row
+        return -1
+
+    def draw(self, row, random_=random):
+        """Randomly selects a transition of a row, weighted by its count.
+
+        Returns the index of the transition.
+        """
+        start, end = self.offsets[row], self.offsets[row + 1]
+        pick = random_.randrange(self.counts[end - 1])
+        return bisect.bisect_right(self.counts, pick, start, end)
+
+    def transitions(self, row):
+        """Returns the list of (word length, delimiter) tuples of a row, as
+        many times as they appear in the sample text."""
+        transitions, previous = list(), 0
+        for index in _irange(self.offsets[row], self.offsets[row + 1]):
+            transition = (self.lengths[index],
+                          self.delimiters[self.delimiter_indexes[index]])
+            transitions.extend([transition] * (self.counts[index] - previous))
+            previous = self.counts[index]
+        return transitions
+
+    def items(self):
+        for row, packed in enumerate(self.states):
+            yield self.unpack(packed), self.transitions(row)
+
+    def _find(self, state):
+        """Returns the row of a state, or -1 if it has no transitions."""
+        if len(state) != self.order or \
+                any(length >> self._bits for length in state):
+            return -1
+        return self.row(self.pack(state))
+
+    def __getitem__(self, state):
+        row = self._find(state)
+        if row < 0:
+            raise KeyError(state)
+        return self.transitions(row)
+
+    def __contains__(self, state):
+        return self._find(state) >= 0
+
+    def __iter__(self):
+        return (self.unpack(packed) for packed in self.states)
+
+    def __len__(self):
+        return len(self.states)
+
+
+class Lexicon(object):
+    """The words of a sample lexicon, packed into a single UTF-8 buffer.
+
+    :param words:   An iterable of words, or a dictionary mapping word
+                    lengths to lists of words of that length. Empty words are
+                    dropped.
+    :param counts:  Optional. The count of each word: an iterable of counts,
+                    or a dictionary mapping word lengths to lists of counts,
+                    parallel to ``words``. Each word counts 1 by default.
+    :raises ValueError: If a dictionary maps a length to words of another
+                    length, or a count is negative.
+
+    Words are sorted by length (in characters), then alphabetically, and
+    their UTF-8 encoded bytes are concatenated into ``buffer``. The word at
+    index ``i`` spans ``buffer[offsets[i]:offsets[i + 1]]``, and the words of
+    each length span a contiguous range of indexes, so a random word of a
+    given length is selected in constant time, and its bytes can be written
+    out without copying them (see :py:meth:`view`).
+
+    The counts of repeated words add up, and words counted 0 are dropped. If
+    any word doesn't count 1, ``counts`` holds the count of each word, by
+    index: words are then meant to be drawn proportionally to their counts.
+    Otherwise, ``counts`` is None.
+
+    ``Lexicon`` behaves like a read-only dictionary mapping word lengths to
+    read-only sequences of words, which decode the words on access.
+    """
+
+    def __init__(self, words, counts=None):
+        words, counts = _lexicon_groups(words, counts)
+        self._bounds = dict()
+        chunks, offsets = list(), _array('L', [0])
+        weights = list()
+        for length, group in sorted(words.items()):
+            if not length or not group:
+                continue
+            group, totals = _lexicon_totals(
+                group, None if counts is None else counts[length])
+            if not group:
+                continue
+            if totals is not None:
+                weights.append((len(offsets) - 1, totals))
+            self._bounds[length] = (len(offsets) - 1,
+                                    len(offsets) - 1 + len(group))
+            chunk = ''.join(group).encode('UTF-8')
+            chunks.append(chunk)
+            if len(chunk) == length * len(group):
+                # Single byte characters only: fixed size words.
+                offsets.extend(_irange(offsets[-1] + length,
+                                       offsets[-1] + len(chunk) + 1, length))
+            else:
+                for word in group:
+                    offsets.append(offsets[-1] + len(word.encode('UTF-8')))
+        self.lengths = tuple(sorted(self._bounds))
+        self.buffer = b''.join(chunks)
+        self.offsets = offsets
+        self.counts = _lexicon_counts(self.size, weights)
+
+    @property
+    def size(self):
+        """The amount of words."""
+        return len(self.offsets) - 1
+
+    def bounds(self, length):
+        """Returns the range of the indexes of the words of a length, as a
+        (start, end) tuple, which is empty if there are no such words."""
+        return self._bounds.get(length, (0, 0))
+
+    def word(self, index):
+        """Returns the word at index."""
+        offsets = self.offsets
+        return self.buffer[offsets[index]:offsets[index + 1]].decode('UTF-8')
+
+    def view(self, index):
+        """Returns the UTF-8 encoded word at index, as a memoryview over the
+        buffer."""
+        offsets = self.offsets
+        return memoryview(self.buffer)[offsets[index]:offsets[index + 1]]
+
+    def items(self):
+        for length in self.lengths:
+            yield length, self[length]
+
+    def values(self):
+        for length in self.lengths:
+            yield self[length]
+
+    def get(self, length, default=None):
+        return self[length] if length in self._bounds else default
+
+    def __getitem__(self, length):
+        if length not in self._bounds:
+            raise KeyError(length)
+        return _LexiconWords(self, length)
+
+    def __contains__(self, length):
+        return length in self._bounds
+
+    def __iter__(self):
+        return iter(self.lengths)
+
+    def __len__(self):
+        return len(self.lengths)
+
+
+class _LexiconWords(_abc.Sequence):
+    """The read-only sequence of the words of a length of a
+    :py:class:`Lexicon`. If encoded, words are UTF-8 encoded bytes."""
+
+    def __init__(self, lexicon, length, encoded=False):
+        self._lexicon = lexicon
+        self._length = length
+        self._encoded = encoded
+        self._start, self._end = lexicon.bounds(length)
+
+    def __len__(self):
+        return self._end - self._start
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('Lexicon index out of range')
+        if self._encoded:
+            return self._lexicon.view(self._start + index).tobytes()
+        return self._lexicon.word(self._start + index)
+
+    def __iter__(self):
+        # All the words have the same length: decode them at once.
+        offsets, length = self._lexicon.offsets, self._length
+        text = self._lexicon.buffer[offsets[self._start]:offsets[self._end]]
+        if self._encoded:
+            return iter([text[offsets[index] - offsets[self._start]:
+                              offsets[index + 1] - offsets[self._start]]
+                         for index in _irange(self._start, self._end)])
+        text = text.decode('UTF-8')
+        return iter([text[offset:offset + length]
+                     for offset in _irange(0, len(text), length)])
+
+
+class Stats(object):
+    """Collects generation metrics.
+
+    :param callable callback:   Optional. Called as ``callback(name, value)``
+                                on every update.
+
+    :py:class:`Sample` and :py:class:`Generator` instances given a ``Stats``
+    object update it with the following counters:
+
+    :``words``:         Generated words.
+    :``sentences``:     Generated sentences.
+    :``paragraphs``:    Generated paragraphs.
+    :``restarts``:      Sentence chains restarted from a random starting point,
+                        because the current one has no follower.
+    :``rerolls``:       Words drawn among the others of their length, to
+                        avoid repeating a recent word.
+    :``duplicates``:    Unique :py:mod:`loremipsum.records` values
+                        generated again, because they were already generated.
+
+    And with the following timings, in seconds:
+
+    :``cook``:          Building a sample from its text and lexicon.
+    :``reheat``:        Building a sample from its frozen representation.
+    :``load``:          Loading a sample from an URL, cooking included.
+    :``dump``:          Dumping a sample to an URL.
+
+    Instrumentation has no overhead when no ``Stats`` is given.
+
+    >>> stats = Stats()
+    >>> g = Generator(samples.DEFAULT, stats=stats)
+    >>> paragraphs = list(g.generate_paragraphs(3))
+    >>> stats.counters['paragraphs']
+    3
+    """
+
+    COUNTERS = ('words', 'sentences', 'paragraphs', 'restarts', 'rerolls',
+                'duplicates')
+    TIMINGS = ('cook', 'reheat', 'load', 'dump')
+
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.reset()
+
+    def reset(self):
+        """Resets all the counters and timings to zero."""
+        self.counters = dict.fromkeys(self.COUNTERS, 0)
+        self.timings = dict.fromkeys(self.TIMINGS, 0.0)
+
+    def count(self, name, value=1):
+        """Increases a counter by value."""
+        self.counters[name] += value
+        if self.callback is not None:
+            self.callback(name, value)
+
+    def time(self, name, seconds):
+        """Increases a timing by seconds."""
+        self.timings[name] += seconds
+        if self.callback is not None:
+            self.callback(name, seconds)
+
+    @contextlib.contextmanager
+    def timing(self, name):
+        """Context manager. Times its body as the named timing."""
+        start = timeit.default_timer()
+        try:
+            yield self
+        finally:
+            self.time(name, timeit.default_timer() - start)
+
+
 class Sample(object):
     """The sample that generated sentences are based on.
 
@@ -62,11 +850,31 @@ class Sample(object):
                                         included in ``lexicon`` and any
                                         character included in
                                         ``word_delimiters`` argument.
-    :param str lexicon:                 A list of strings to be used as words.
+    :param str lexicon:                 A string of whitespace separated words
+                                        to be used. Alternatively, lines of tab
+                                        separated words and counts
+                                        (``word<TAB>count``): words are then
+                                        drawn proportionally to their counts.
+                                        Lines of other tab separated words
+                                        make the whole lexicon whitespace
+                                        separated words.
     :param str word_delimiters:         A string of characters used as word
                                         delimiters.
     :param str sentence_delimiters:     A string of characters used as sentence
                                         delimiters.
+    :param tokenizer:                   Optional. The name of a plugged
+                                        :py:mod:`loremipsum.tokenizers`
+                                        tokenizer, or a tokenizer, used to
+                                        analyse ``text``. Defaults to the
+                                        default tokenizer. It is kept by
+                                        copies, but not by frozen or dumped
+                                        samples.
+    :param int order:                   Optional. The order of the Markov
+                                        chains: the amount of previous words
+                                        lengths determining the next one.
+                                        Defaults to 2.
+    :param Stats stats:                 Optional. Collects the cook or reheat
+                                        timing.
     :raises TypeError:                  If neither frozen nor sample are
                                         provided and any of text, lexicon,
                                         word_delimiters or sentence_delimiters
@@ -88,6 +896,10 @@ class Sample(object):
     ``Sample`` instances behave like read-only dictionay and can be hashed.
     """
 
+    # The tokenizer the text was cooked with, or None if unknown (like for
+    # frozen samples): then, the default tokenizer is used.
+    _tokenizer = None
+
     def __init__(self, **args):
         frozen = args.get('frozen')
         sample = args.get('sample')
@@ -96,26 +908,47 @@ class Sample(object):
         word_delimiters = args.get('word_delimiters')
         sentence_delimiters = args.get('sentence_delimiters')
         ingredients = [text, lexicon, word_delimiters, sentence_delimiters]
+        tokenizer = args.get('tokenizer')
+        order = args.get('order', ORDER)
+        stats = args.get('stats')
         if frozen:
-            self._reheat(frozen)
+            if stats is None:
+                self._reheat(frozen)
+            else:
+                with stats.timing('reheat'):
+                    self._reheat(frozen)
         elif sample:
             if isinstance(sample, self.__class__):
                 self._s = sample._s.copy()
+                self._tokenizer = sample._tokenizer
             else:
                 self._s = dict()
                 self._s.update(sample)
+                if not isinstance(self._s['chains'], Chains):
+                    self._s['chains'] = Chains(self._s['chains'],
+                                               self._s.get('order'))
+                if not isinstance(self._s['dictionary'], Lexicon):
+                    self._s['dictionary'] = Lexicon(
+                        self._s['dictionary'], self._s.pop('weights', None))
         elif all(ingredients):
-            self._cook(*ingredients)
+            if stats is None:
+                self._cook(*ingredients, tokenizer=tokenizer, order=order)
+            else:
+                with stats.timing('cook'):
+                    self._cook(*ingredients, tokenizer=tokenizer,
+                               order=order)
         else:
             raise TypeError('Missing argument')
-        self._hash = hash(self.frozen())
+        # Hashed on demand: freezing a big sample is costly.
+        self._hash = None
 
-    def _cook(self, text, lexicon, word_delimiters, sentence_delimiters):
+    def _cook(self, text, lexicon, word_delimiters, sentence_delimiters,
+              tokenizer=None, order=ORDER):
         """Builds the internal state using the provided arguments."""
 
-        paragraphs_lens = list()
-        sentences_lens = list()
-        previous = (0, 0)
+        self._tokenizer = tokenizer = _tokenizer(tokenizer)
+        if order < 1:
+            raise ValueError('Invalid order: {0}'.format(order))
 
         us = lambda s: getattr(builtins, 'unicode', str)(s).strip('\n')
         self._s = {
@@ -124,51 +957,35 @@ class Sample(object):
             'word_delimiters': us(word_delimiters),
             'sentence_delimiters': us(sentence_delimiters)}
 
-        # Chains of three words that appear in the sample text
-        # Maps a pair of word-lengths to a third word-length and an optional
-        # piece of trailing punctuation (for example, a period, comma, etc.)
-        self._s['chains'] = chains = collections.defaultdict(list)
-
-        # Pairs of word-lengths that can appear at the beginning of sentences
-        self._s['starts'] = starts = [previous]
+        self._s['order'] = order
 
         # Words that can be used in the generated output
-        # Maps a word-length to a list of words of that length
-        self._s['dictionary'] = dict()
-        for word in self._s['lexicon'].split():
-            self._s['dictionary'].setdefault(len(word), list()).append(word)
+        # Maps a word-length to the words of that length
+        self._s['dictionary'] = Lexicon(*_lexicon(self._s['lexicon']))
 
+        # First sentence ever will be set as sample incipit.
         for paragraph in self._s['text'].split('\n\n'):
+            for sentence in self._find_sentences(paragraph):
+                self._s['incipit'] = sentence.group(0)
+                break
+            if 'incipit' in self._s:
+                break
+
+        chains, starts, sentences_lens, paragraphs_lens = _lengths_chains(
+            tokenizer, self._s['text'], self._s['word_delimiters'],
+            self._s['sentence_delimiters'], order)
+        self._s['chains'] = Chains(chains, order)
+        # Word-lengths that can appear at the beginning of sentences
+        self._s['starts'] = starts
+        self._count(sentences_lens, paragraphs_lens)
+        self._taste()
 
-            # We've got a paragraph, so prepare to count sentences.
-            paragraphs_lens.append(0)
-
-            for sentence in self._find_sentences(paragraph.strip()):
-
-                # We've got a sentence, so prepare to count words an increas
-                # paragraph length.
-                sentences_lens.append(0)
-                paragraphs_lens[-1] += 1
-
-                # First sentence ever will be set as sample incipit.
-                self._s.setdefault('incipit', sentence.group(0))
-
-                # Generates the chains and starts values required for sentence
-                # generation.
-                for word in self._find_words(sentence.group(0)):
-
-                    # We've got a word, so increas sentence length.
-                    sentences_lens[-1] += 1
-
-                    # Build chains and starts based on text analysis.
-                    word, delimiter = word.group(0).strip(), ''
-                    while word and word[-1] in self._s['word_delimiters']:
-                        word, delimiter = word[:-1], word[-1]
-                    if word:
-                        chains[previous].append((len(word), delimiter))
-                        if delimiter:
-                            starts.append(previous)
-                        previous = (previous[1], len(word))
+    def _count(self, sentences_lens, paragraphs_lens):
+        """Builds the statistics of the sentences and paragraphs lengths."""
+        # Keeps the histograms of the lengths of sentences (in words) and
+        # paragraphs (in sentences), as sorted (length, count) pairs.
+        self._s['sentence_lengths'] = _histogram(sentences_lens)
+        self._s['paragraph_lengths'] = _histogram(paragraphs_lens)
 
         # Calculates the mean and standard deviation of the lengths of
         # sentences (in words) in a sample text.
@@ -179,17 +996,21 @@ class Sample(object):
         # paragraphs (in sentences) in a sample text.
         self._s['paragraph_mean'] = _mean(paragraphs_lens)
         self._s['paragraph_sigma'] = _sigma(paragraphs_lens)
-        self._taste()
 
     def _reheat(self, frozen):
         """Builds the internal state using a frozen sample."""
 
         _s = dict(frozen)
-        _s['chains'] = dict((tuple(k), v) for k, v in _s['chains'])
-        for chain, values in _s['chains'].items():
-            _s['chains'][chain] = [tuple(v) for v in values]
+        _s['chains'] = Chains(dict(
+            (tuple(k), [tuple(v) for v in values])
+            for k, values in _s['chains']), _s.get('order'))
         _s['starts'] = [tuple(s) for s in _s['starts']]
-        _s['dictionary'] = dict(_s['dictionary'])
+        weights = _s.pop('weights', None)
+        _s['dictionary'] = Lexicon(dict(_s['dictionary']),
+                                   weights and dict(weights))
+        for key in ('sentence_lengths', 'paragraph_lengths'):
+            if key in _s:
+                _s[key] = tuple(tuple(item) for item in _s[key])
         self._s = _s
         self._taste()
 
@@ -204,15 +1025,17 @@ class Sample(object):
     def _find_sentences(self, text):
         """Creates an iterator over text, which yields sentences."""
 
-        delimiters = '\\'.join(self._s['sentence_delimiters'])
-        sentences = re.compile(r'([^\\{d}])*[\\{d}]'.format(d=delimiters))
-        return sentences.finditer(text.strip())
+        delimiters = self._s['sentence_delimiters']
+        if delimiters not in _SENTENCES:
+            pattern = '\\'.join(delimiters)
+            pattern = r'([^\\{d}])*[\\{d}]'.format(d=pattern)
+            _SENTENCES[delimiters] = re.compile(pattern)
+        return _SENTENCES[delimiters].finditer(text.strip())
 
     def _find_words(self, text):
         """Creates an iterator over text, which yields words."""
 
-        words = re.compile(r'\s*([\S]+)')
-        return words.finditer(text.strip())
+        return _WORDS.finditer(text.strip())
 
     def row(self):
         """Returns the row components of a sample.
@@ -240,7 +1063,14 @@ class Sample(object):
         _s = self._s.copy()
         ts = lambda i: tuple(sorted(i))
         _s['chains'] = ts((k, ts(v)) for k, v in _s['chains'].items())
-        _s['dictionary'] = ts((k, ts(v)) for k, v in _s['dictionary'].items())
+        dictionary = _s['dictionary']
+        _s['dictionary'] = ts((k, ts(v)) for k, v in dictionary.items())
+        if dictionary.counts is not None:
+            # Counts by word length, in the same order as words.
+            _s['weights'] = tuple(
+                (length, tuple(dictionary.counts[slice(
+                    *dictionary.bounds(length))]))
+                for length in dictionary.lengths)
         _s['starts'] = ts(_s['starts'])
         return ts(_s.items())
 
@@ -339,6 +1169,9 @@ class Sample(object):
             Force the content encoding to be handled as specified. By content
             encoding, basically, we mean compression method. If this keyword
             argument is not specified, it will be guessed using the URL.
+        :stats:
+            A :py:class:`Stats` object collecting the load timing, as well as
+            the cook or reheat one.
 
         Other keyword arguments are passed to the handlers. See their
         respective documentation.
@@ -348,7 +1181,12 @@ class Sample(object):
         documentation for more information.
         """
         url = _urlparse(url)
-        return schemes.get(url.scheme).load(class_, url, **args)
+        stats = args.pop('stats', None)
+        if stats is None:
+            return schemes.get(url.scheme).load(class_, url, **args)
+        with stats.timing('load'):
+            class_ = functools.partial(class_, stats=stats)
+            return schemes.get(url.scheme).load(class_, url, **args)
 
     def dump(self, url, **args):
         """Dumps a sample to an URL.
@@ -361,7 +1199,12 @@ class Sample(object):
         ``content_type`` or ``content_encoding`` guessing.
         """
         url = _urlparse(url)
-        schemes.get(url.scheme).dump(self, url, **args)
+        stats = args.pop('stats', None)
+        if stats is None:
+            schemes.get(url.scheme).dump(self, url, **args)
+        else:
+            with stats.timing('dump'):
+                schemes.get(url.scheme).dump(self, url, **args)
 
     @staticmethod
     def remove(url, **args):
@@ -387,10 +1230,12 @@ class Sample(object):
         return self._s.__len__()
 
     def __hash__(self):
-        return hash(self.frozen())
+        if self._hash is None:
+            self._hash = hash(self.frozen())
+        return self._hash
 
     def __eq__(self, other):
-        return self._hash == hash(other)
+        return hash(self) == hash(other)
 
 
 class Generator(object):
@@ -398,14 +1243,71 @@ class Generator(object):
 
     :param sample:  A :py:class:`Sample` that will provide all the needed info
                     to generate the text.
+    :param stats:   Optional. A :py:class:`Stats` object collecting generation
+                    metrics.
+    :param int memo_size:
+                    The maximum amount of texts memoized by :py:meth:`for_key`
+                    and :py:meth:`for_keys`. Defaults to 0: no memoization.
+    :param engine:  Optional. The name of a plugged
+                    :py:mod:`loremipsum.engines` engine, or an engine. If
+                    given, text is generated by a randomly seeded generator of
+                    the engine, instead of the :py:mod:`random` module.
+    :param str model:
+                    One of :py:data:`MODELS`. The ``lengths`` model (the
+                    default) chains word lengths, then picks words of those
+                    lengths from the sample lexicon. The ``words`` model
+                    chains the words of the sample text itself, as split by
+                    the sample tokenizer, for a more realistic text:
+                    sentences, paragraphs and exact size texts are then made
+                    of the text words, and the lexicon is only used by
+                    :py:meth:`generate_word` and :py:meth:`generate_words`.
 
     The attributes of this class should be considered 'read-only'. Even if
     you can access the internal state of the generator, you don't want to mess
     with it: we are all grown adults.
+
+    All the ``generate_`` methods draw from the :py:mod:`random` module (or
+    from the engine), unless given either of the following keyword arguments:
+
+    :param random:      A :py:class:`random.Random` instance, or an engine
+                        ``Random`` instance, to draw from.
+    :param int seed:    Enables the counter based mode: each word, sentence,
+                        paragraph or text is generated by its own random
+                        number generator of the engine (or of the default
+                        engine), seeded by ``seed``, by its ``index`` and by
+                        its kind. Defaults to 0.
+    :param int index:   The index of the (first) generated element in the
+                        counter based mode. Defaults to 0.
+
+    In counter based mode, any element is computable in constant time and
+    independently of the others, given the same sample and Python version (or
+    on any Python version, using the ``portable`` engine):
+
+    >>> g = Generator(samples.DEFAULT)
+    >>> paragraphs = list(g.generate_paragraphs(5, seed=42, index=4000))
+    >>> g.generate_paragraph(seed=42, index=4003) == paragraphs[3]
+    True
     """
 
-    def __init__(self, sample=None):
+    # The empty text and the space, of the generated text type.
+    _empty, _space = '', ' '
+
+    def __init__(self, sample=None, stats=None, memo_size=0, engine=None,
+                 model='lengths'):
+        if model not in MODELS:
+            raise ValueError('Unknown model: {0}'.format(model))
+        self._model_name = model
         self._sample = sample
+        self._stats = stats
+        self._cache = dict()
+        self._memo_size = memo_size
+        self._memo = collections.OrderedDict()
+        if engine is None:
+            self._engine, self._random_ = None, random
+        else:
+            if not hasattr(engine, 'Random'):
+                engine = engines.get(engine)
+            self._engine, self._random_ = engine, engine.Random()
 
     @property
     def sample(self):
@@ -426,6 +1328,26 @@ class Generator(object):
             self._sample = value
         else:
             raise ValueError(type(value))
+        self._cache = dict()
+        self._memo.clear()
+
+    @property
+    def stats(self):
+        return self._stats
+
+    @property
+    def engine(self):
+        return self._engine
+
+    @property
+    def random(self):
+        """The random number generator: an instance of the engine ``Random``,
+        or the :py:mod:`random` module if no engine is given."""
+        return self._random_
+
+    @property
+    def model(self):
+        return self._model_name
 
     @contextlib.contextmanager
     def default(self, **args):
@@ -444,21 +1366,221 @@ class Generator(object):
         """
         copy = self._sample._s.copy()
         copy.update(args)
-        yield Generator(sample=Sample(sample=copy))
+        # Lengths are drawn from the overridden distributions.
+        for kind in ('sentence', 'paragraph'):
+            if kind + '_mean' in args or kind + '_sigma' in args:
+                copy.pop(kind + '_lengths', None)
+        sample = Sample(sample=copy)
+        sample._tokenizer = self._sample._tokenizer
+        generator_ = self.__class__(
+            sample=sample, stats=self._stats,
+            engine=self._engine, model=self._model_name)
+        generator_._random_ = self._random_
+        yield generator_
+
+    def _encode(self, text):
+        """Converts a sample text into the generated text type."""
+        return text
+
+    def _model(self):
+        """Returns the chains of the generation model, the rows of the chains
+        that can start a sentence, the chains spacers (by delimiter index:
+        the delimiter that can follow a word in a sentence, and a space), and
+        the vocabulary of the ``words`` model (None for the ``lengths``
+        model)."""
+        if 'model' not in self._cache:
+            if self._model_name == 'words':
+                chains, starts, vocabulary = _words_chains(self._sample)
+            else:
+                chains, vocabulary = self._sample['chains'], None
+                starts = self._sample['starts']
+            rows = set(chains._find(state) for state in starts)
+            rows.discard(-1)
+            # If the word delimiter contained in the chain is also a sentence
+            # delimiter, then we don't include it because we don't want the
+            # sentence to end prematurely (we want the length to match the
+            # sentence_len value).
+            sentence_delimiters = self._sample['sentence_delimiters']
+            spacers = [self._encode(
+                (delimiter if delimiter not in sentence_delimiters else '') +
+                ' ') for delimiter in chains.delimiters]
+            if vocabulary is not None:
+                vocabulary = [self._encode(word) for word in vocabulary]
+            self._cache['model'] = (chains, sorted(rows), spacers, vocabulary)
+        return self._cache['model']
+
+    def _endings(self):
+        """Returns the sentence delimiters ending the sample sentences, the
+        most frequent first, and their alias table (or None if sentences
+        always end the same way)."""
+        if 'endings' not in self._cache:
+            text = self._sample['text']
+            histogram = sorted(
+                ((delimiter, text.count(delimiter))
+                 for delimiter in set(self._sample['sentence_delimiters'])),
+                key=lambda item: (-item[1], item[0]))
+            histogram = [(self._encode(delimiter), count)
+                         for delimiter, count in histogram
+                         if count] or [(self._encode('.'), 1)]
+            table = _alias_table(histogram) if len(histogram) > 1 else None
+            self._cache['endings'] = ([ending for ending, __ in histogram],
+                                      table)
+        return self._cache['endings']
+
+    def _incipit(self):
+        """Returns the words of the sample incipit, each along with itself
+        stripped of a trailing word delimiter (to end a sentence with)."""
+        if 'incipit' not in self._cache:
+            word_delimiters = self._sample['word_delimiters']
+            self._cache['incipit'] = [
+                (self._encode(word), self._encode(
+                    word[:-1] if word[-1:] in word_delimiters else word))
+                for word in self._sample['incipit'].split()]
+        return self._cache['incipit']
+
+    def _lengths(self):
+        """Returns the sorted list of the dictionary word lengths."""
+        if 'lengths' not in self._cache:
+            self._cache['lengths'] = list(self._sample['dictionary'].lengths)
+        return self._cache['lengths']
+
+    def _length(self, kind, args, random_):
+        """Draws the length of a sentence or a paragraph.
+
+        Lengths are drawn from the sample histogram, unless its mean or sigma
+        are overridden by args (or the sample has no histogram): in that case,
+        they are normally distributed.
+        """
+        key = kind + '_lengths'
+        if key not in self._cache:
+            # Empty sentences or paragraphs are never generated.
+            histogram = [item for item in self._sample._s.get(key, ())
+                         if item[0] > 0]
+            self._cache[key] = _alias_table(histogram) if histogram else None
+        table = self._cache[key]
+        mean, sigma = kind + '_mean', kind + '_sigma'
+        if table is None or mean in args or sigma in args:
+            mean = args.get(mean, self._sample[mean])
+            sigma = args.get(sigma, self._sample[sigma])
+            return _random_len(mean, sigma, random_)
+        return _alias_draw(table, random_)
+
+    def _dictionary(self):
+        """Returns the dictionary words by length: decoded tuples, unless the
+        dictionary is too big to be decoded (then, the lazy sequences of the
+        :py:class:`Lexicon`)."""
+        if 'dictionary' not in self._cache:
+            dictionary = self._sample['dictionary']
+            decode = dictionary.size <= _DECODED_WORDS
+            self._cache['dictionary'] = dict(
+                (length, tuple(words) if decode else words)
+                for length, words in self._words(dictionary))
+        return self._cache['dictionary']
+
+    def _words(self, dictionary):
+        """Yields the lengths of the dictionary words, along with the
+        sequences of the words of each length."""
+        return dictionary.items()
+
+    def _tables(self):
+        """Returns the alias tables of the dictionary words by length, as per
+        :py:func:`_alias_table`, whose values are the positions of the words
+        among the words of their length. Returns None if the words are not
+        weighted."""
+        if 'tables' not in self._cache:
+            dictionary, tables = self._sample['dictionary'], None
+            if dictionary.counts is not None:
+                tables = dict()
+                for length in dictionary.lengths:
+                    counts = dictionary.counts[slice(
+                        *dictionary.bounds(length))]
+                    values, total, thresholds, aliases = _alias_table(
+                        list(enumerate(counts)))
+                    tables[length] = (_irange(len(values)), total,
+                                      _array('L', thresholds),
+                                      _array('L', aliases))
+            self._cache['tables'] = tables
+        return self._cache['tables']
+
+    def _cumulative(self):
+        """Returns the cumulative counts of the dictionary words by length, or
+        None if the words are not weighted."""
+        if 'cumulative' not in self._cache:
+            dictionary, cumulative = self._sample['dictionary'], None
+            if dictionary.counts is not None:
+                cumulative = dict()
+                for length in dictionary.lengths:
+                    total, sums = 0, list()
+                    for count in dictionary.counts[slice(
+                            *dictionary.bounds(length))]:
+                        total += count
+                        sums.append(total)
+                    cumulative[length] = _array('L', sums)
+            self._cache['cumulative'] = cumulative
+        return self._cache['cumulative']
+
+    def _buckets(self):
+        """Returns, by chains word length, the dictionary words whose length
+        is the closest to it, their slot (the first chains word length sharing
+        them), and their alias tables and cumulative counts (or None, if the
+        words are not weighted)."""
+        if 'buckets' not in self._cache:
+            lengths, dictionary = self._lengths(), self._dictionary()
+            tables, cumulative = self._tables(), self._cumulative()
+            closest = [min(lengths, key=lambda x: abs(x - length))
+                       for length in _irange(
+                           max(self._sample['chains'].lengths) + 1)]
+            self._cache['buckets'] = (
+                [dictionary[length] for length in closest],
+                [closest.index(length) for length in closest],
+                None if tables is None else
+                [tables[length] for length in closest],
+                None if cumulative is None else
+                [cumulative[length] for length in closest])
+        return self._cache['buckets']
+
+    def _random(self, args, kind):
+        """Returns the random number generator to be used according to args.
+
+        The counter based mode seed and index are popped out of args.
+        """
+        if not args:
+            return self._random_
+        counter = _counter(args)
+        if counter is not None:
+            engine = self._engine or engines.DEFAULT
+            return _counter_random(counter[0], counter[1], kind, engine)
+        return args.get('random') or self._random_
+
+    def _sequence(self, amount, args):
+        """Yields the arguments of each element of a sequence.
+
+        In counter based mode, the index is increased by one for each element.
+        """
+        counter = _counter(args)
+        for offset in _irange(amount):
+            if counter is not None:
+                args['seed'], args['index'] = counter[0], counter[1] + offset
+            yield args
 
-    def generate_word(self, length=None):
+    def generate_word(self, length=None, **args):
         """Selects a random word from the lexicon.
 
         :param int length:  the length of the generate word
         :rtype:             str or unicode or None
         """
 
-        dictionary = self._sample['dictionary']
+        random_ = self._random(args, 'word')
+        dictionary, tables = self._dictionary(), self._tables()
         if not length:
-            length = random.choice(list(dictionary))
-        return random.choice(dictionary.get(length, (None,)))
-
-    def generate_words(self, amount, length=None):
+            length = random_.choice(self._lengths())
+        if self._stats is not None:
+            self._stats.count('words')
+        if tables is not None and length in tables:
+            return dictionary[length][_alias_draw(tables[length], random_)]
+        return random_.choice(dictionary.get(length, (None,)))
+
+    def generate_words(self, amount, length=None, **args):
         """Creates a generatator of the specified amount of words.
 
         :param int amount:  the amount of words to be generated
@@ -468,84 +1590,199 @@ class Generator(object):
         argument as per :py:meth:`generate_word`.
         """
 
-        for __ in _irange(amount):
-            yield self.generate_word(length)
+        for args in self._sequence(amount, args):
+            yield self.generate_word(length, **args)
 
     def generate_sentence(self, **args):
         """Generates a single sentence, of random length.
 
         :param bool incipit:            If True, then the text will begin with
-                                        the sample text incipit sentence.
+                                        the sample text incipit sentence, cut
+                                        to the sentence length.
         :param int sentence_len:        The length of the sentence in words.
                                         Takes precedence over sentence_mean and
                                         sentence_sigma.
         :param float sentence_mean:     Override the sentence mean value.
         :param float sentence_sigma:    Override the sentence sigma value.
+        :param int no_repeat:           No word repeats any of the previous
+                                        no_repeat words of the sentence.
+                                        Defaults to 1: no word is next to
+                                        itself. 0 allows repetitions.
+
+        Sentence lengths are drawn from the sample sentence lengths histogram,
+        unless sentence_mean or sentence_sigma are given: then they are
+        normally distributed.
+
+        Avoiding repetitions costs no extra draw: the words are drawn among
+        the words that are not recent, see :py:func:`_draw_excluding`.
+
+        Sentences end with one of the sentence delimiters ending the sample
+        sentences, drawn proportionally to their counts.
         :retruns:                       A tuple containing sentence length and
                                         sentence text.
         :rtype:                         tuple(int, str or unicode)
         """
 
-        # The length of the sentence is a normally distributed random variable.
-        mean = args.get('sentence_mean', self._sample['sentence_mean'])
-        sigma = args.get('sentence_sigma', self._sample['sentence_sigma'])
+        pieces = list()
+        return (self._render_sentence(pieces, args),
+                self._empty.join(pieces))
+
+    def _render_sentence(self, pieces, args, pending=None):
+        """Renders a sentence, as per :py:meth:`generate_sentence`, by
+        appending its pieces of text to pieces. Returns the amount of words.
+
+        If pending (a list) is given, the stats counts of the sentence are
+        appended to it instead of being counted, see
+        :py:meth:`_count_sentence`.
+        """
+        # The length of the sentence is a random variable.
+        random_ = self._random(args, 'sentence')
         incipit = args.get('incipit', False)
-        random_len = max(2, int(round(abs(random.normalvariate(mean, sigma)))))
-        sentence_len = args.get('sentence_len', random_len)
-        previous_set = set(self._sample['chains']) & set(self._sample['starts'])
-        words = list()
-        previous = tuple()
-        last_word = ''
-        dictionary = self._sample['dictionary']
-
-        # Defined here in case while loop doesn't run
-        word_delimiter = ''
-
-        # Start the sentence with sample incipit, if desired
-        if incipit:
-            words.extend(self.sample['incipit'].split()[:sentence_len])
-            if words[-1][-1] in self.sample['word_delimiters']:
-                word_delimiter = words[-1][-1]
+        sentence_len = self._sentence_len(args, incipit, random_)
+        chains, starts, spacers, vocabulary = self._model()
+        offsets, counts = chains.offsets, chains.counts
+        lengths, next_rows = chains.lengths, chains.next_rows
+        delimiter_indexes = chains.delimiter_indexes
+        randrange, bisect_right = random_.randrange, bisect.bisect_right
+        buckets = slots = tables = cumulative = None
+        if vocabulary is None:
+            buckets, slots, tables, cumulative = self._buckets()
+        choice, append = random_.choice, pieces.append
+        row = -1
+        # By bucket slot, the position until which the bucket holds a recent
+        # word.
+        no_repeat = args.get('no_repeat', 1)
+        recent_until = [-1] * len(buckets or ())
+        restarts = rerolls = 0
+
+        # Start the sentence with sample incipit, if desired. Words and their
+        # spacers (their delimiter and a space) are appended in turn.
+        first = len(pieces)
+        incipit_words = self._render_incipit(pieces, sentence_len) \
+            if incipit else ()
+        generated = len(pieces)
 
         # Generate a sentence from the "chains"
-        for __ in _irange(sentence_len - len(words)):
+        for position in _irange(sentence_len - len(incipit_words)):
             # If the current starting point is invalid, choose another randomly
-            if previous not in self._sample['chains']:
-                previous = random.sample(previous_set, 1)[0]
+            if row < 0:
+                row = choice(starts)
+                restarts += 1
 
             # Choose the next "chain" to go to. This determines the next word
             # length we'll use, and whether there is e.g. a comma at the end of
-            # the word.
-            chain = random.choice(self._sample['chains'][previous])
-            word_len = chain[0]
+            # the word. Inlines Chains.draw.
+            start, end = offsets[row], offsets[row + 1]
+            index = bisect_right(counts, randrange(counts[end - 1]), start,
+                                 end)
+            word_len = lengths[index]
+
+            if vocabulary is None:
+                # Choose a word randomly that matches (or closely matches) the
+                # length we're after.
+                bucket, slot = buckets[word_len], slots[word_len]
+
+                # Readability. No word can repeat one of the previous
+                # no_repeat words: if some of them are in the bucket, the word
+                # is drawn among the others.
+                if recent_until[slot] >= position and len(bucket) > 1:
+                    if no_repeat == 1 and tables is None:
+                        # Inlines _draw_excluding for the previous word: the
+                        # bucket is sorted, so shifting past its position is
+                        # shifting past it.
+                        pick = randrange(len(bucket) - 1)
+                        if bucket[pick] >= pieces[-2]:
+                            pick += 1
+                        word = bucket[pick]
+                    else:
+                        word = bucket[_draw_excluding(
+                            bucket, pieces[max(
+                                generated, len(pieces) - 2 * no_repeat)::2],
+                            random_, None if cumulative is None else
+                            cumulative[word_len])]
+                    rerolls += 1
+                elif tables is None:
+                    word = choice(bucket)
+                else:
+                    # Weighted words are drawn from their alias table.
+                    word = bucket[_alias_draw(tables[word_len], random_)]
+                recent_until[slot] = position + no_repeat
+            else:
+                # The words model chains word ids instead of word lengths.
+                word = vocabulary[word_len]
 
-            # If the word delimiter contained in the chain is also a sentence
-            # delimiter, then we don't include it because we don't want the
-            # sentence to end prematurely (we want the length to match the
-            # sentence_len value).
-            word_delimiter = ''
-            if chain[1] not in self.sample['sentence_delimiters']:
-                word_delimiter = chain[1]
-
-            # Choose a word randomly that matches (or closely matches) the
-            # length we're after.
-            closest = min(list(dictionary), key=lambda x: abs(x - word_len))
-
-            # Readability. No word can appear next to itself.
-            word = random.choice(dictionary[closest])
-            while word == last_word and len(dictionary[closest]) > 1:
-                word = random.choice(dictionary[closest])
-            last_word = word
-
-            words.append(word + word_delimiter)
-            previous = (previous[1], word_len)
-
-        # Finish the sentence off with capitalisation, a period and
-        # form it into a string.
-        # TODO(sentence_delimiters): should analyze sample to randomize
-        #                            sentence delimiter choice.
-        sentence = ' '.join(words).capitalize().rstrip(word_delimiter) + '.'
-        return (len(words), sentence)
+            append(word)
+            append(spacers[delimiter_indexes[index]])
+            row = next_rows[index]
+
+        self._finish_sentence(pieces, first, incipit_words, generated, random_)
+        if self._stats is not None:
+            self._count_sentence(sentence_len, restarts, rerolls, pending)
+        return sentence_len
+
+    def _sentence_len(self, args, incipit, random_):
+        """Returns the given sentence length, or draws it from random_.
+
+        The incipit is a whole sentence: a drawn length doesn't run past it.
+        """
+        sentence_len = args.get('sentence_len')
+        if sentence_len:
+            return sentence_len
+        sentence_len = self._length('sentence', args, random_)
+        if incipit:
+            return min(sentence_len, len(self._incipit()))
+        return sentence_len
+
+    def _count_sentence(self, sentence_len, restarts, rerolls,
+                        pending=None):
+        """Counts a rendered sentence into the stats. Counters are only
+        increased by non zero values.
+
+        If pending (a list) is given, the counts are appended to it instead,
+        to be counted later if the sentence is kept.
+        """
+        if pending is not None:
+            pending.append((sentence_len, restarts, rerolls))
+            return
+        self._stats.count('sentences')
+        self._stats.count('words', sentence_len)
+        if restarts:
+            self._stats.count('restarts', restarts)
+        if rerolls:
+            self._stats.count('rerolls', rerolls)
+
+    def _render_incipit(self, pieces, sentence_len):
+        """Appends the first sentence_len words of the sample incipit, and
+        their spacers, to pieces. Returns the incipit words appended, as per
+        :py:meth:`_incipit`.
+
+        If the sentence is longer than the incipit, its last word is appended
+        without its delimiter, which ends the incipit sentence.
+        """
+        incipit_words = self._incipit()[:sentence_len]
+        for word, __ in incipit_words:
+            pieces.append(word)
+            pieces.append(self._space)
+        if sentence_len > len(incipit_words):
+            pieces[-2] = incipit_words[-1][1]
+        return incipit_words
+
+    def _finish_sentence(self, pieces, first, incipit_words, generated,
+                         random_):
+        """Finishes the sentence whose first piece is at first off with a
+        capital, and a delimiter drawn from the sample sentences endings
+        instead of the last spacer (and of the delimiter of a last incipit
+        word, if no word is generated after the incipit ones)."""
+        if len(pieces) == generated:
+            pieces[-2] = incipit_words[-1][1]
+        pieces[first] = self._capitalize(pieces[first])
+        endings, table = self._endings()
+        pieces[-1] = endings[0] if table is None else \
+            _alias_draw(table, random_)
+
+    def _capitalize(self, word):
+        """Capitalizes the first character of a word."""
+        return word[:1].upper() + word[1:]
 
     def generate_sentences(self, amount, **args):
         """Generator method that yields sentences, of random length.
@@ -557,9 +1794,10 @@ class Generator(object):
 
         Also accepts the same arguments as :py:meth:`generate_sentence`.
         """
-        yield self.generate_sentence(**args)
+        sequence = self._sequence(max(1, amount), args)
+        yield self.generate_sentence(**next(sequence))
         args['incipit'] = False
-        for __ in _irange(amount - 1):
+        for args in sequence:
             yield self.generate_sentence(**args)
 
     def generate_paragraph(self, **args):
@@ -575,24 +1813,30 @@ class Generator(object):
                                         text.
         :rtype:                         tuple(int, int, str or unicode)
 
-        Also accepts the same arguments as :py:meth:`generate_sentence`.
+        Paragraph lengths are drawn like sentence lengths, see
+        :py:meth:`generate_sentence`. Also accepts the same arguments as
+        :py:meth:`generate_sentence`.
         """
-        # The length of the paragraph is a normally distributed random
-        # variable.
-        mean = args.get('paragraph_mean', self._sample['paragraph_mean'])
-        sigma = args.get('paragraph_sigma', self._sample['paragraph_sigma'])
-        random_len = max(2, int(round(abs(random.normalvariate(mean, sigma)))))
-        paragraph_len = args.get('paragraph_len', random_len)
+        # The length of the paragraph is a random variable.
+        args['random'] = random_ = self._random(args, 'paragraph')
+        paragraph_len = args.get('paragraph_len') or \
+            self._length('paragraph', args, random_)
 
+        # The sentences are rendered into the same pieces, as per
+        # generate_sentences, and joined once.
         words_count = 0
-        paragraph = list()
+        pieces = list()
+        for args in self._sequence(paragraph_len, args):
+            if pieces:
+                pieces.append(self._space)
+            words_count += self._render_sentence(pieces, dict(args))
+            args['incipit'] = False
 
-        for count, text in self.generate_sentences(paragraph_len, **args):
-            words_count += count
-            paragraph.append(text)
+        if self._stats is not None:
+            self._stats.count('paragraphs')
 
         # Turn the paragraph into a string.
-        return (paragraph_len, words_count, ' '.join(paragraph))
+        return (paragraph_len, words_count, self._empty.join(pieces))
 
     def generate_paragraphs(self, amount, **args):
         """Generator method that yields paragraphs, of random length.
@@ -604,7 +1848,521 @@ class Generator(object):
 
         Also accepts the same arguments as :py:meth:`generate_paragraph`.
         """
-        yield self.generate_paragraph(**args)
+        sequence = self._sequence(max(1, amount), args)
+        yield self.generate_paragraph(**next(sequence))
         args['incipit'] = False
-        for __ in _irange(amount - 1):
+        for args in sequence:
             yield self.generate_paragraph(**args)
+
+    def generate_text(self, **args):
+        """Generates a single line text of an exact size.
+
+        :param int chars:               The exact length of the text in
+                                        characters.
+        :param int bytes:               The exact length of the text in bytes,
+                                        once encoded.
+        :param str encoding:            The encoding used to measure ``bytes``.
+                                        Defaults to ``UTF-8``. Stateful
+                                        encodings (like ``UTF-16``, which
+                                        prepends a BOM) are not supported.
+        :param int words:               The exact amount of words.
+        :returns:                       A tuple containing number of sentences,
+                                        number of words, and the text.
+        :rtype:                         tuple(int, int, str or unicode)
+        :raises TypeError:              If not exactly one of ``chars``,
+                                        ``bytes`` or ``words`` is supplied.
+        :raises ValueError:             If the requested size cannot be reached
+                                        using the sample dictionary.
+
+        Also accepts the same arguments as :py:meth:`generate_sentence`.
+
+        The text is made of whole sentences: no word is truncated and the text
+        always ends with a sentence delimiter. Sentences are generated as usual
+        until the remaining size is small, then the last sentences are planned
+        word by word to land exactly on the requested size.
+        """
+        sizes = dict((key, args.pop(key, None))
+                     for key in ('chars', 'bytes', 'words'))
+        encoding = args.pop('encoding', 'UTF-8')
+        args['random'] = self._random(args, 'text')
+        if list(sizes.values()).count(None) != 2:
+            raise TypeError('Expected exactly one of chars, bytes or words')
+        if sizes['words'] is not None:
+            return self._generate_words_text(sizes['words'], **args)
+        if sizes['chars'] is not None:
+            return self._generate_sized_text(sizes['chars'], None, **args)
+        return self._generate_sized_text(sizes['bytes'], encoding, **args)
+
+    def render_into(self, buffer, offset=0, **args):
+        """Renders a single line text into a writable buffer, as UTF-8
+        encoded bytes, up to the end of the buffer.
+
+        :param buffer:                  A writable buffer of bytes, like a
+                                        ``bytearray``, a ``mmap.mmap`` or the
+                                        buffer of a shared memory block.
+        :param int offset:              The offset of the text in buffer.
+                                        Defaults to 0.
+        :param int size:                The size of the text in bytes, at
+                                        most. Defaults to the rest of the
+                                        buffer.
+        :returns:                       A tuple containing number of
+                                        sentences, number of words, and the
+                                        amount of bytes written.
+        :rtype:                         tuple(int, int, int)
+        :raises ValueError:             If offset or size are out of buffer.
+
+        Also accepts the same arguments as :py:meth:`generate_sentence`.
+
+        The text is the same as :py:meth:`generate_text` ``bytes`` one: whole
+        sentences filling up exactly size. If the sample dictionary cannot
+        reach size, the text is the longest one below it, instead of raising
+        an error. Each sentence is written into the buffer as soon as it is
+        rendered, so the whole text never exists as a Python object. The rest
+        of the buffer is left untouched.
+        """
+        view = memoryview(buffer)
+        try:
+            size = args.pop('size', len(view) - offset)
+            if not 0 <= offset <= len(view):
+                raise ValueError('Invalid offset: {0}'.format(offset))
+            if not 0 <= size <= len(view) - offset:
+                raise ValueError('Invalid size: {0}'.format(size))
+            args['random'] = self._random(args, 'text')
+            encoded = self._encoded()
+            space = encoded._space
+            sentences_count = words_count = 0
+            position = offset
+            for count, sentence in encoded._sized_sentences(
+                    size, 'UTF-8', args, exact=False):
+                if sentences_count:
+                    view[position:position + 1] = space
+                    position += 1
+                view[position:position + len(sentence)] = sentence
+                position += len(sentence)
+                sentences_count += 1
+                words_count += count
+            return (sentences_count, words_count, position - offset)
+        finally:
+            # Don't keep the buffer exported: a mmap could not be closed.
+            getattr(view, 'release', lambda: None)()
+
+    def _encoded(self):
+        """Returns a :py:class:`BytesGenerator` sharing the sample, the
+        stats, the engine and the random number generator."""
+        if 'encoded' not in self._cache:
+            encoded = BytesGenerator(self._sample, self._stats,
+                                     engine=self._engine,
+                                     model=self._model_name)
+            encoded._random_ = self._random_
+            self._cache['encoded'] = encoded
+        return self._cache['encoded']
+
+    def _generate_words_text(self, amount, **args):
+        """Generates a text made of an exact amount of words."""
+        sentence_len = args.pop('sentence_len', None)
+        sentences = list()
+        words_count = 0
+        while words_count < amount:
+            remaining = amount - words_count
+            length = min(remaining, sentence_len or
+                         self._length('sentence', args, args['random']))
+            # Don't leave a lonely word for the last sentence.
+            if remaining - length == 1:
+                length = remaining
+            count, sentence = self.generate_sentence(sentence_len=length,
+                                                     **args)
+            args['incipit'] = False
+            words_count += count
+            sentences.append(sentence)
+        return (len(sentences), words_count, self._space.join(sentences))
+
+    def _generate_sized_text(self, size, encoding, **args):
+        """Generates a text of an exact size, measured using encoding."""
+        if size < 0:
+            raise ValueError('Invalid size: {0}'.format(size))
+        sentences = list(self._sized_sentences(size, encoding, args))
+        return (len(sentences), sum(count for count, __ in sentences),
+                self._space.join(sentence for __, sentence in sentences))
+
+    def _sized_sentences(self, size, encoding, args, exact=True):
+        """Yields the sentences of a text of an exact size, measured using
+        encoding, as tuples containing sentence length and sentence text.
+
+        If not exact, the text is the longest one up to size, if size cannot
+        be reached.
+        """
+        planned = self._planned(encoding)
+        measure, plains, titles = planned[:3]
+        ending = self._endings()[0][0]
+        space, stop = measure(self._space), measure(ending)
+
+        # The remaining size must be big enough to be filled up with planned
+        # sentences.
+        steps = [word + space for word in plains]
+        reserve = max(steps) * min(steps) + max(titles) + stop + space
+
+        # The sentence overflowing the reserve is not counted in the stats.
+        pending = None if self._stats is None else list()
+        used = 0
+        while size - used > reserve:
+            pieces = list()
+            count = self._render_sentence(pieces, dict(args), pending)
+            sentence = self._empty.join(pieces)
+            needed = measure(sentence) + (space if used else 0)
+            if size - used - needed < reserve:
+                break
+            if pending:
+                self._count_sentence(*pending.pop())
+            args['incipit'] = False
+            yield count, sentence
+            used += needed
+
+        remaining = size - used - (space if used else 0)
+        if remaining > 0:
+            for item in self._plan_sentences(
+                    remaining, planned, space, stop, args, ending, exact):
+                yield item
+
+    def _measure(self, encoding):
+        """Returns the function measuring generated text: its length, or its
+        size once encoded if encoding is given."""
+        if encoding is None:
+            return len
+        return lambda text: len(text.encode(encoding))
+
+    def _planned(self, encoding):
+        """Returns the words of the exact size planner, measured using
+        encoding.
+
+        Returns a tuple containing the measure function, the sorted measures
+        of the words and of the first words of sentences (capitalized), the
+        average measure of the words, the words groups by chains transition
+        value (word length or word id), the groups of all the words, the words
+        that are the only ones of their measure and the planner tables (see
+        :py:func:`_plan_tables`) computed so far. Words groups are pairs of
+        lists of groups, as per :py:func:`_measure_groups`, measured as they
+        are and capitalized.
+        """
+        key = ('planned', encoding)
+        if key not in self._cache:
+            measure, capitalize = self._measure(encoding), self._capitalize
+
+            def titled(word):
+                return measure(capitalize(word))
+
+            chains, __, __, vocabulary = self._model()
+            if vocabulary is None:
+                # The lexicon words, the closest length ones for each chains
+                # word length.
+                lexicon, dictionary = self._sample['dictionary'], \
+                    self._dictionary()
+                groups = dict()
+                for length in self._lengths():
+                    counts = None if lexicon.counts is None else \
+                        lexicon.counts[slice(*lexicon.bounds(length))]
+                    words = dictionary[length]
+                    groups[length] = (_measure_groups(words, counts, measure),
+                                      _measure_groups(words, counts, titled))
+                lengths = self._lengths()
+                values = [groups[min(lengths, key=lambda x: abs(x - length))]
+                          for length in _irange(max(chains.lengths) + 1)]
+                pool = tuple([group for length in lengths
+                              for group in groups[length][side]]
+                             for side in (0, 1))
+            else:
+                # The sample words, by word id.
+                values = [([(measure(word), (word,), None)],
+                           [(titled(word), (word,), None)])
+                          for word in vocabulary]
+                words = sorted(vocabulary[1:])
+                pool = (_measure_groups(words, None, measure),
+                        _measure_groups(words, None, titled))
+            average = float(sum(group[0] * _group_weight(group)
+                                for group in pool[0]))
+            average /= sum(_group_weight(group) for group in pool[0])
+            singles = frozenset(group[1][0] for group in pool[0]
+                                if len(group[1]) == 1)
+            self._cache[key] = (
+                measure, sorted(set(group[0] for group in pool[0])),
+                sorted(set(group[0] for group in pool[1])), average, values,
+                pool, singles, dict())
+        return self._cache[key]
+
+    def _plan_sentences(self, size, planned, space, stop, args, ending='.',
+                        exact=True):
+        """Plans sentences whose overall measure is exactly size, given the
+        planner words (see :py:meth:`_planned`). Sentences end with ending,
+        whose measure is stop. If not exact, and size cannot be reached,
+        sentences measure the closest size below it.
+
+        Sentences are drawn like :py:meth:`generate_sentence` draws them
+        (following the model chains, excluding recent words and drawing
+        weighted words proportionally to their counts), among the words that
+        keep size reachable, see :py:meth:`_plan_word`.
+
+        Returns a list of tuples containing sentence length and sentence text.
+        """
+        # The tables of a size start with the tables of any smaller one.
+        key = (space, stop)
+        tables = planned[7].get(key)
+        if tables is None or len(tables[0]) <= size:
+            tables = planned[7][key] = _plan_tables(
+                max(size, 2 * len(tables[0]) if tables else 0), planned[5],
+                planned[6], space, stop)
+        size = _reachable(tables[0], size, exact)
+        # Sentences are not ended before a shorter one than two average words
+        # if they can go on.
+        short = 2 * (planned[3] + space) + stop
+        plan = (tables, planned, space, stop, ending, short)
+        sentences = list()
+        t = size
+        while t > 0:
+            count, sentence, t = self._plan_sentence(t, plan, args)
+            sentences.append((count, sentence))
+            if t > 0:
+                t -= space
+        return sentences
+
+    def _plan_sentence(self, t, plan, args):
+        """Plans the first sentence of a text measuring t, as per
+        :py:meth:`_plan_sentences`.
+
+        Returns a tuple containing the sentence length, the sentence text and
+        the measure left after it.
+        """
+        tables, planned, space, stop, ending, short = plan
+        words_tables, between = tables[1], tables[3]
+        measure, random_ = planned[0], args['random']
+        chains, starts, spacers, __ = self._model()
+        no_repeat = args.get('no_repeat', 1)
+        sentence_len = args.get('sentence_len') or \
+            self._length('sentence', args, random_)
+        pieces = list()
+        row, restarts, rerolls = -1, 0, 0
+        while True:
+            if row < 0:
+                row = random_.choice(starts)
+                restarts += 1
+            recent = pieces[-2 * no_repeat::2] if no_repeat else ()
+            word, word_measure, index, rerolled = self._plan_word(
+                t, pieces[-2:-1], row, recent, plan, random_)
+            t -= word_measure
+            rerolls += rerolled
+            pieces.append(word)
+            words_table = words_tables[
+                word if word in planned[6] else None]
+            # The spacer of the chains, or a space if the chains one can't
+            # be followed by any word.
+            spacer = self._space if index < 0 else \
+                spacers[chains.delimiter_indexes[index]]
+            gap = measure(spacer)
+            if t <= gap or not words_table[t - gap]:
+                spacer, gap = self._space, space
+            go_on = t > gap and words_table[t - gap]
+            rest = t - stop
+            if rest >= 0 and between[rest] and (not go_on or (
+                    len(pieces) // 2 + 1 >= sentence_len and
+                    not 0 < rest < short)):
+                break
+            pieces.append(spacer)
+            t -= gap
+            row = chains.next_rows[index] if index >= 0 else -1
+        pieces[0] = self._capitalize(pieces[0])
+        pieces.append(ending)
+        sentence_len = len(pieces) // 2
+        if self._stats is not None:
+            self._count_sentence(sentence_len, restarts, rerolls)
+        return sentence_len, self._empty.join(pieces), rest
+
+    def _plan_word(self, t, previous, row, recent, plan, random_):
+        """Draws a planned word following the previous one (a list of one
+        word, or empty for the first word of a sentence), among the words
+        after which t can be filled up: a word drawn following the chains
+        row, or any word if the row offers none. Recent words are excluded,
+        unless every word is recent.
+
+        Returns a tuple containing the word, its measure, the index of the
+        chains transition (-1 if the word is drawn among any words) and
+        whether recent words were excluded.
+        """
+        planned, after = plan[1], plan[0][2]
+        singles, side = planned[6], 0 if previous else 1
+        key = previous[0] if previous and previous[0] in singles else None
+        candidates = self._plan_candidates(t, key, row, recent, side, plan)
+        if candidates:
+            weight, index, groups = candidates[_weighted_pick(
+                [candidate[0] for candidate in candidates], random_)]
+        else:
+            index = -1
+            groups = _feasible(planned[5][side], t, after, singles, key)
+            groups = [group for group in groups
+                      if _fresh(group[1], recent)] or groups
+        word_measure, words, cumulative = groups[_weighted_pick(
+            [_group_weight(group) for group in groups], random_)]
+        rerolled = any(other in words for other in recent)
+        return (words[_draw_excluding(words, recent, random_, cumulative)],
+                word_measure, index, rerolled)
+
+    def _plan_candidates(self, t, key, row, recent, side, plan):
+        """Returns the transitions of a chains row followed by words after
+        which t can be filled up, preferably by words that are not recent,
+        as a list of (count, transition index, words groups) tuples.
+
+        The previous word is key, if it is the only one of its measure.
+        """
+        planned, after = plan[1], plan[0][2]
+        singles, values, any_after = planned[6], planned[4], after[None]
+        chains = self._model()[0]
+        offsets, counts, lengths = chains.offsets, chains.counts, \
+            chains.lengths
+        start = offsets[row]
+        candidates, fresh = list(), list()
+        for index in _irange(start, offsets[row + 1]):
+            groups = values[lengths[index]][side]
+            if len(groups) == 1 and groups[0][0] <= t:
+                # Inlines _feasible and _fresh for a single group.
+                words = groups[0][1]
+                if len(words) > 1:
+                    if not any_after[t - groups[0][0]]:
+                        continue
+                    new = len(words) > len(recent) or _fresh(words, recent)
+                elif words[0] != key and after[
+                        words[0] if words[0] in singles else None][
+                        t - groups[0][0]]:
+                    new = words[0] not in recent
+                else:
+                    continue
+            else:
+                groups = _feasible(groups, t, after, singles, key)
+                if not groups:
+                    continue
+                new = [group for group in groups if _fresh(group[1], recent)]
+                if new and len(new) < len(groups):
+                    fresh.append((counts[index] - (
+                        counts[index - 1] if index > start else 0),
+                        index, new))
+                    new = False
+            candidates.append((counts[index] - (
+                counts[index - 1] if index > start else 0), index, groups))
+            if new:
+                fresh.append(candidates[-1])
+        return fresh or candidates
+
+    def _keyed(self, kind, keys, args):
+        """Generates the texts of kind for keys, in counter based mode.
+
+        The keys are hashed in a single pass, and a single generator of the
+        engine is seeded again for each key, as per :py:func:`_counter_random`.
+        """
+        generate = dict(word=self.generate_word,
+                        sentence=self.generate_sentence,
+                        paragraph=self.generate_paragraph,
+                        text=self.generate_text).get(kind)
+        if generate is None:
+            raise ValueError('Unknown kind: {0}'.format(kind))
+        seeds = [_counter_seed(_key_seed(key), 0, kind) for key in keys]
+        args.pop('seed', None)
+        args.pop('index', None)
+        args['random'] = random_ = (self._engine or engines.DEFAULT).Random(0)
+        texts = list()
+        for seed in seeds:
+            random_.seed(seed)
+            text = generate(**dict(args))
+            texts.append(text if kind == 'word' else text[-1])
+        return texts
+
+    def for_key(self, key, kind='paragraph', **args):
+        """Generates the text of a key, which is the same on every run.
+
+        :param key:             A string, bytes, integer or tuple of them.
+        :param str kind:        One of ``word``, ``sentence``, ``paragraph``
+                                or ``text``.
+        :returns:               The text.
+        :rtype:                 str or unicode
+        :raises TypeError:      If the key type is not supported.
+        :raises ValueError:     If the kind is unknown.
+
+        Also accepts the same arguments as the ``generate_`` method of the
+        kind, except ``seed``, ``index`` and ``random``. The key is mapped
+        through a stable hash into the seed of the counter based mode, so the
+        text only depends on the key, the kind, the arguments and the sample.
+
+        >>> g = Generator(samples.DEFAULT, memo_size=1000)
+        >>> g.for_key(42, 'sentence') == g.for_key(42, 'sentence')
+        True
+        """
+        return self.for_keys((key,), kind, **args)[0]
+
+    def for_keys(self, keys, kind='paragraph', **args):
+        """Generates the texts of many keys, as per :py:meth:`for_key`.
+
+        :param keys:            An iterable of keys.
+        :returns:               The list of the texts, in keys order.
+        :rtype:                 list
+
+        Memoized texts are looked up first, then the missing ones are
+        generated once per distinct key: the keys are hashed in one pass and
+        the texts are drawn from a single generator of the engine, seeded
+        again for each key.
+        """
+        keys = list(keys)
+        memo, options = self._memo, tuple(sorted(args.items()))
+        texts = dict()
+        for key in keys:
+            if key not in texts and (kind, key, options) in memo:
+                texts[key] = memo.pop((kind, key, options))
+                memo[(kind, key, options)] = texts[key]
+        missing = [key for key in collections.OrderedDict.fromkeys(keys)
+                   if key not in texts]
+        for key, text in zip(missing, self._keyed(kind, missing, dict(args))):
+            texts[key] = text
+            if self._memo_size:
+                memo[(kind, key, options)] = text
+        while len(memo) > self._memo_size:
+            memo.popitem(last=False)
+        return [texts[key] for key in keys]
+
+
+class BytesGenerator(Generator):
+    """Generates random strings of plausible text, as UTF-8 encoded bytes.
+
+    Accepts the same arguments, and generates the same text given the same
+    draws, as :py:class:`Generator`: only the text is ``bytes`` (instead of
+    ``str`` or ``unicode``), ready to be written to a socket or a file without
+    being encoded again.
+
+    The dictionary words are taken from the UTF-8 buffer of the sample
+    :py:class:`Lexicon`, and sentences and paragraphs are rendered by a
+    single join of encoded pieces. The ``bytes`` size of
+    :py:meth:`generate_text` is measured without encoding anything.
+
+    >>> g = BytesGenerator(samples.DEFAULT)
+    >>> text = Generator(samples.DEFAULT).generate_paragraph(seed=42)[-1]
+    >>> g.generate_paragraph(seed=42)[-1] == text.encode('UTF-8')
+    True
+    """
+
+    _empty, _space = b'', b' '
+
+    def _encode(self, text):
+        return text.encode('UTF-8')
+
+    def _encoded(self):
+        return self
+
+    def _words(self, dictionary):
+        for length in dictionary.lengths:
+            yield length, _LexiconWords(dictionary, length, encoded=True)
+
+    def _capitalize(self, word):
+        if word[:1] < b'\x80':
+            # An ASCII character.
+            return word[:1].upper() + word[1:]
+        word = word.decode('UTF-8')
+        return (word[:1].upper() + word[1:]).encode('UTF-8')
+
+    def _measure(self, encoding):
+        if encoding is not None and codecs.lookup(encoding).name == 'utf-8':
+            return len
+        measure = Generator._measure(self, encoding)
+        return lambda text: measure(text.decode('UTF-8'))
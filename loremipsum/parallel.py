@@ -0,0 +1,162 @@
+"""
+This module provides :py:func:`generate_shards`: it splits a corpus of an
+exact size into shard files, generated in parallel by a pool of processes, and
+describes them in a manifest, so that they can be loaded in parallel and
+verified:
+
+>>> manifest = loremipsum.parallel.generate_shards(
+...     None, 2 ** 30, shards=64, seed=1, out_dir='corpus',
+...     content_encoding='gzip')
+>>> manifest['shards'][0]['name']
+'shard-00000.txt.gz'
+>>>
+
+Each shard is seeded independently, from the corpus seed and the shard index:
+the shards only depend on the sample, the corpus size, the amount of shards
+and the seed, not on the amount of processes generating them. A shard is made
+of text lines of whole sentences, like a ``bytes`` stream of
+:py:mod:`loremipsum.streaming`.
+
+The manifest is also written to the ``manifest.json`` file of the output
+directory. Besides the corpus arguments, it lists the shards, each as an
+object of:
+
+:``name``:      The shard file name, in the output directory.
+:``bytes``:     The size of the shard text, in UTF-8 encoded bytes.
+:``words``:     The amount of words of the shard.
+:``size``:      The size of the shard file, content encoding included.
+:``sha256``:    The SHA-256 hex digest of the shard file.
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import random
+
+from loremipsum import generator
+from loremipsum import samples
+from loremipsum import streaming
+from loremipsum.serialization import content_encodings
+
+__all__ = ['MANIFEST', 'generate_shards']
+
+# The manifest file name.
+MANIFEST = 'manifest.json'
+
+# Shard file name extensions, by content encoding.
+_EXTENSIONS = {'gzip': '.gz', 'bzip2': '.bz2', 'compress': '.Z'}
+
+# The generator used by the pool processes.
+_GENERATOR = None
+
+
+def _generator(url):
+    """Returns a generator of the sample loaded from url, or of the default
+    one."""
+    return generator.Generator(
+        generator.Sample.load(url) if url else samples.DEFAULT)
+
+
+def _setup(url):
+    """Initializes a pool process."""
+    globals()['_GENERATOR'] = _generator(url)
+
+
+def _write_shard(generator_, task):
+    """Generates, encodes and writes a shard. Returns its manifest entry."""
+    index, seed, size, out_dir, content_encoding = task
+    name = 'shard-{0:05d}.txt'.format(index)
+    encoder = None
+    if content_encoding:
+        encoder = content_encodings.get(content_encoding).encoder()
+        name += _EXTENSIONS.get(content_encoding, '.' + content_encoding)
+    entry = dict(name=name, bytes=0, words=0, size=0)
+    checksum = hashlib.sha256()
+    amounts = streaming.chunk_amounts('bytes', size)
+    with open(os.path.join(out_dir, name), 'wb') as output:
+        for chunk_index, amount in enumerate(amounts):
+            text = streaming.generate_chunk(generator_, 'bytes', seed,
+                                            chunk_index, amount)
+            entry['words'] += len(text.split())
+            data = text.encode('UTF-8')
+            entry['bytes'] += len(data)
+            if encoder is not None:
+                data = encoder.compress(data)
+            entry['size'] += len(data)
+            checksum.update(data)
+            output.write(data)
+        if encoder is not None:
+            data = encoder.flush()
+            entry['size'] += len(data)
+            checksum.update(data)
+            output.write(data)
+    entry['sha256'] = checksum.hexdigest()
+    return entry
+
+
+def _work(task):
+    """Writes a shard in a pool process."""
+    return _write_shard(_GENERATOR, task)
+
+
+def generate_shards(sample, total_bytes, **args):
+    """Generates a corpus of an exact size into shard files.
+
+    :param str sample:              The URL of the sample to be used, as per
+                                    :py:meth:`Sample.load`. If None, the
+                                    default sample is used.
+    :param int total_bytes:         The size of the corpus, in UTF-8 encoded
+                                    bytes.
+    :param int shards:              The amount of shards. Defaults to 1.
+    :param int seed:                The corpus seed. Defaults to a random
+                                    one.
+    :param str out_dir:             The output directory, created if missing.
+                                    Defaults to the current directory.
+    :param str content_encoding:    Optional. The name of a plugged content
+                                    encoding (like ``gzip``) the shard files
+                                    are encoded with, as they are written.
+    :param int jobs:                The amount of processes generating shards.
+                                    Defaults to the amount of CPUs.
+    :returns:                       The manifest.
+    :rtype:                         dict
+    :raises ValueError:             If the shards are too small to be
+                                    generated, or if the content encoding is
+                                    unknown.
+
+    The corpus size is split evenly among the shards.
+    """
+    shards = args.get('shards', 1)
+    if shards < 1 or total_bytes < shards:
+        raise ValueError('Invalid shards: {0}'.format(shards))
+    seed = args.get('seed')
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(32)
+    out_dir = args.get('out_dir', os.curdir)
+    content_encoding = args.get('content_encoding')
+    if content_encoding and content_encodings.get(content_encoding) is None:
+        raise ValueError('Unknown content encoding: {0}'.format(
+            content_encoding))
+    jobs = args.get('jobs') or multiprocessing.cpu_count()
+    if not os.path.isdir(out_dir):
+        os.makedirs(out_dir)
+
+    size, remainder = divmod(total_bytes, shards)
+    tasks = [(index, streaming.chunk_seed(seed, index),
+              size + (index < remainder), out_dir, content_encoding)
+             for index in range(shards)]
+    if jobs <= 1:
+        generator_ = _generator(sample)
+        entries = [_write_shard(generator_, task) for task in tasks]
+    else:
+        pool = multiprocessing.Pool(min(jobs, shards), _setup, (sample,))
+        try:
+            entries = pool.map(_work, tasks, 1)
+        finally:
+            pool.terminate()
+
+    manifest = dict(sample=sample, total_bytes=total_bytes, seed=seed,
+                    content_encoding=content_encoding, shards=entries)
+    with open(os.path.join(out_dir, MANIFEST), 'w') as output:
+        json.dump(manifest, output, indent=2, sort_keys=True)
+    return manifest
@@ -77,10 +77,9 @@ def setup(package):
 
     pkg_name = package.__name__
     for module_name in package.__all__:
-        try:
+        value = getattr(package, module_name, None)
+        if value is None:
             value = importlib.import_module(module_name, pkg_name)
-        except ImportError:
-            value = getattr(package, module_name)
 
         name = module_name.rstrip('_')
         _REGISTERED[pkg_name][name] = value
@@ -0,0 +1,365 @@
+"""
+This module provides :py:class:`SentencePool`: a pool of sentences rendered
+once by a :py:class:`Generator`, then served by index draws only. It trades
+some variety for latency, for example to serve mock endpoints:
+
+>>> pool = loremipsum.SentencePool(size=1000, seed=1)
+>>> words_count, sentence = pool.generate_sentence()
+>>> sentences_count, words_count, paragraph = pool.generate_paragraph()
+>>>
+
+The pooled sentences are stored in a single string, separated by spaces, along
+with their offsets: a paragraph is a slice of consecutive pooled sentences.
+A share of the pool can be rendered again, on demand or every ``interval``
+seconds by a background thread, to keep some variety:
+
+>>> with loremipsum.SentencePool(size=1000, interval=1.0) as pool:
+...     paragraph = pool.get_paragraph()
+...
+>>>
+
+It also provides :py:class:`PrefetchingGenerator`, which keeps the full
+variety of a :py:class:`Generator`, but generates sentences and paragraphs
+ahead of time in a background thread (or process), into bounded buffers:
+
+>>> with loremipsum.PrefetchingGenerator(size=100) as prefetching:
+...     paragraph = prefetching.get_paragraph()
+...
+>>>
+"""
+
+import array
+import multiprocessing
+import multiprocessing.dummy
+import random
+import sys
+import threading
+
+from loremipsum import generator
+from loremipsum import samples
+
+__all__ = ['SentencePool', 'PrefetchingGenerator']
+
+builtins = sys.modules.get('__builtin__', sys.modules.get('builtins'))
+_irange = getattr(builtins, 'xrange', range)
+_queue = __import__('Queue' if sys.version_info[0] == 2 else 'queue')
+
+# How long the prefetching worker sleeps when all its buffers are full, and
+# how long serving waits for a buffered text before checking the worker is
+# still alive, in seconds.
+POLL = 0.01
+
+
+class SentencePool(object):
+    """A pool of pre-rendered sentences, served by index draws only.
+
+    :param generator_:          The :py:class:`Generator` rendering the
+                                sentences. Defaults to a generator of the
+                                default sample.
+    :param int size:            The amount of pooled sentences. Defaults to
+                                10000.
+    :param float refresh:       The share of the pool rendered again by
+                                :py:meth:`refresh`. Defaults to 0.1.
+    :param float interval:      Optional. Refresh the pool every interval
+                                seconds, in a background thread, until the
+                                pool is closed.
+    :param int seed:            Optional. Seeds the rendering and the draws.
+
+    Serving methods return the same as the :py:class:`Generator` methods of
+    the same name, and are safe to be called while the pool is refreshed.
+    """
+
+    def __init__(self, generator_=None, size=10000, refresh=0.1,
+                 interval=None, seed=None):
+        if size < 1:
+            raise ValueError('Invalid size: {0}'.format(size))
+        if not 0 <= refresh <= 1:
+            raise ValueError('Invalid refresh: {0}'.format(refresh))
+        self._generator = generator_ or generator.Generator(samples.DEFAULT)
+        self._size = size
+        self._refresh = refresh
+        # Private generators of the generator engine (the random module has
+        # a Random class too).
+        engine = self._generator.engine or random
+        self._render_random = engine.Random(seed)
+        self._random = engine.Random(self._render_random.getrandbits(64))
+        self._lock = threading.Lock()
+        self._sentences = [self._render() for __ in _irange(size)]
+        self._paragraph_lens = array.array('L', [
+            min(size, self._paragraph_len()) for __ in _irange(size)])
+        self._pack()
+        self._closed = threading.Event()
+        self._thread = None
+        if interval is not None:
+            self._thread = threading.Thread(target=self._run,
+                                            args=(interval,))
+            self._thread.daemon = True
+            self._thread.start()
+
+    def __len__(self):
+        return self._size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _render(self):
+        """Renders a sentence, returns its amount of words and its text."""
+        return self._generator.generate_sentence(random=self._render_random)
+
+    def _paragraph_len(self):
+        """Draws the amount of sentences of a paragraph."""
+        return self._generator._length('paragraph', dict(),
+                                       self._render_random)
+
+    def _pack(self):
+        """Packs the sentences into the pool: their text, joined by spaces,
+        the offsets of their ends and their cumulative amount of words."""
+        offsets, words = array.array('L', [0]), array.array('L', [0])
+        for count, sentence in self._sentences:
+            offsets.append(offsets[-1] + len(sentence) + 1)
+            words.append(words[-1] + count)
+        text = ' '.join(sentence for __, sentence in self._sentences)
+        # A single assignment: readers always see a consistent pool.
+        self._pool = (text, offsets, words, self._paragraph_lens)
+
+    def _run(self, interval):
+        """Refreshes the pool every interval seconds, until closed."""
+        while not self._closed.wait(interval):
+            self.refresh()
+
+    def refresh(self):
+        """Renders again a share of the pooled sentences (and of the
+        paragraphs lengths), at random positions."""
+        amount = int(round(self._size * self._refresh))
+        with self._lock:
+            # A partial shuffle: engines don't all provide sample.
+            positions = list(_irange(self._size))
+            randrange = self._render_random.randrange
+            for index in _irange(amount):
+                other = index + randrange(self._size - index)
+                positions[index], positions[other] = \
+                    positions[other], positions[index]
+            del positions[amount:]
+            paragraph_lens = array.array('L', self._paragraph_lens)
+            for position in positions:
+                self._sentences[position] = self._render()
+                paragraph_lens[position] = min(self._size,
+                                               self._paragraph_len())
+            self._paragraph_lens = paragraph_lens
+            self._pack()
+
+    def close(self):
+        """Stops the background refresh, if any."""
+        self._closed.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def generate_sentence(self):
+        """Draws a pooled sentence.
+
+        :returns:   A tuple containing sentence length and sentence text.
+        :rtype:     tuple(int, str or unicode)
+        """
+        text, offsets, words, __ = self._pool
+        index = self._random.randrange(self._size)
+        return (words[index + 1] - words[index],
+                text[offsets[index]:offsets[index + 1] - 1])
+
+    def get_sentence(self):
+        """Draws a pooled sentence, as per :py:meth:`generate_sentence`.
+
+        :rtype:     str or unicode
+        """
+        return self.generate_sentence()[-1]
+
+    def generate_paragraph(self):
+        """Draws a paragraph of consecutive pooled sentences.
+
+        :returns:   A tuple containing number of sentences, number of words,
+                    and the paragraph text.
+        :rtype:     tuple(int, int, str or unicode)
+        """
+        text, offsets, words, paragraph_lens = self._pool
+        randrange = self._random.randrange
+        paragraph_len = paragraph_lens[randrange(self._size)]
+        start = randrange(self._size - paragraph_len + 1)
+        end = start + paragraph_len
+        return (paragraph_len, words[end] - words[start],
+                text[offsets[start]:offsets[end] - 1])
+
+    def get_paragraph(self):
+        """Draws a paragraph, as per :py:meth:`generate_paragraph`.
+
+        :rtype:     str or unicode
+        """
+        return self.generate_paragraph()[-1]
+
+
+def _prefetch(generator_, kinds, args, buffers, closed):
+    """Fills the buffers of a prefetching generator, until closed.
+
+    If generating fails, the error is put into the buffers which are not
+    full, to be raised by the serving side, and the worker stops.
+    """
+    methods = [getattr(generator_, 'generate_' + kind) for kind in kinds]
+    failed = list()
+    try:
+        while not closed.is_set():
+            idle = True
+            for method, buffer_ in zip(methods, buffers):
+                # The worker is the only producer: the buffer can't be filled
+                # up in the meanwhile.
+                if not buffer_.full():
+                    buffer_.put(method(**args))
+                    idle = False
+            if idle:
+                closed.wait(POLL)
+    except Exception as error:
+        failed = [buffer_ for buffer_ in buffers if not buffer_.full()]
+        for buffer_ in failed:
+            buffer_.put(error)
+    # Don't wait for the unread items to be flushed to the buffers, but for
+    # the error.
+    for buffer_ in buffers:
+        if buffer_ not in failed:
+            getattr(buffer_, 'cancel_join_thread', lambda: None)()
+
+
+class PrefetchingGenerator(object):
+    """Generates sentences and paragraphs ahead of time, in the background.
+
+    :param generator_:          The :py:class:`Generator` to be used. Defaults
+                                to a generator of the default sample.
+    :param int size:            The capacity of each buffer. Defaults to 100.
+    :param tuple kinds:         The kinds of text to be prefetched, among
+                                ``sentence`` and ``paragraph``. Defaults to
+                                both.
+    :param bool process:        If True, generate in a process instead of a
+                                thread. The generator is then copied into a
+                                forked process, so it is not supported on
+                                Windows. Defaults to False.
+
+    Also accepts the same arguments as the :py:class:`Generator`
+    ``generate_`` methods of the kinds, which are given to every call.
+
+    Each kind has its own bounded buffer, filled up by a single background
+    worker. Serving methods pop the oldest buffered text, waiting for it if
+    the buffer is empty (as per :py:attr:`fill`): such waits are counted in
+    :py:attr:`stalls`. The
+    worker is stopped by :py:meth:`close`, or when the ``with`` block exits.
+
+    If generating fails, the worker stops and the error is raised by the
+    serving methods, once the texts buffered before are served. Serving a
+    kind whose buffer is empty once the worker stopped raises
+    :py:exc:`RuntimeError`.
+    """
+
+    def __init__(self, generator_=None, size=100,
+                 kinds=('sentence', 'paragraph'), process=False, **args):
+        if size < 1:
+            raise ValueError('Invalid size: {0}'.format(size))
+        for kind in kinds:
+            if kind not in ('sentence', 'paragraph'):
+                raise ValueError('Unknown kind: {0}'.format(kind))
+        generator_ = generator_ or generator.Generator(samples.DEFAULT)
+        backend = multiprocessing.dummy
+        if process:
+            backend = multiprocessing
+            if hasattr(multiprocessing, 'get_context'):
+                backend = multiprocessing.get_context('fork')
+        self._buffers = dict((kind, backend.Queue(size)) for kind in kinds)
+        self._error = None
+        self._closed = backend.Event()
+        #: The amount of serving calls which waited for an empty buffer, by
+        #: kind.
+        self.stalls = dict.fromkeys(kinds, 0)
+        self._worker = backend.Process(target=_prefetch, args=(
+            generator_, kinds, args, [self._buffers[kind] for kind in kinds],
+            self._closed))
+        self._worker.daemon = True
+        self._worker.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def fill(self):
+        """The amount of buffered texts, by kind."""
+        return dict((kind, buffer_.qsize())
+                    for kind, buffer_ in self._buffers.items())
+
+    def close(self):
+        """Stops the background worker. Buffered texts are discarded."""
+        if self._worker is None:
+            return
+        self._closed.set()
+        self._worker.join()
+        self._worker = None
+
+    def _pop(self, kind):
+        """Pops the oldest buffered text of kind."""
+        if kind not in self._buffers:
+            raise ValueError('Not prefetched: {0}'.format(kind))
+        if self._worker is None:
+            raise ValueError('Prefetching generator is closed')
+        buffer_ = self._buffers[kind]
+        # Measured like fill: a process buffer may hold a generated text not
+        # readable yet, while it is sent through the pipe.
+        if not buffer_.qsize():
+            self.stalls[kind] += 1
+        while True:
+            try:
+                item = buffer_.get(timeout=POLL)
+                break
+            except _queue.Empty:
+                # Don't wait for a worker which stopped: its last items (and
+                # its error) are flushed before it stops.
+                if not self._worker.is_alive() and buffer_.empty():
+                    if self._error is not None:
+                        raise self._error
+                    raise RuntimeError('Prefetching worker stopped')
+        if isinstance(item, Exception):
+            self._error = item
+            raise item
+        return item
+
+    def generate_sentence(self):
+        """Pops a prefetched sentence.
+
+        :returns:           A tuple containing sentence length and sentence
+                            text.
+        :rtype:             tuple(int, str or unicode)
+        :raises ValueError: If sentences are not prefetched, or if closed.
+        """
+        return self._pop('sentence')
+
+    def get_sentence(self):
+        """Pops a prefetched sentence, as per :py:meth:`generate_sentence`.
+
+        :rtype:             str or unicode
+        """
+        return self._pop('sentence')[-1]
+
+    def generate_paragraph(self):
+        """Pops a prefetched paragraph.
+
+        :returns:           A tuple containing number of sentences, number of
+                            words, and the paragraph text.
+        :rtype:             tuple(int, int, str or unicode)
+        :raises ValueError: If paragraphs are not prefetched, or if closed.
+        """
+        return self._pop('paragraph')
+
+    def get_paragraph(self):
+        """Pops a prefetched paragraph, as per :py:meth:`generate_paragraph`.
+
+        :rtype:             str or unicode
+        """
+        return self._pop('paragraph')[-1]
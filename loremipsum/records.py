@@ -0,0 +1,326 @@
+"""
+This module provides a bulk API to generate fixed schema records, i.e. to seed
+database tables. A schema is a sequence of columns, each column being a
+:py:class:`Column` or a plain tuple of the same items:
+
+>>> schema = [('name', 'words', 1, 3),
+...           ('title', 'chars', 20, 40),
+...           ('bio', 'sentences', 1, 2),
+...           ('body', 'paragraphs', 1, 3)]
+>>> for rows in loremipsum.records.generate_rows(schema, 2500):
+...     print(len(rows))
+...
+1000
+1000
+500
+>>>
+
+The column kind tells how each cell is generated, while the bounds tell the
+minimum and maximum (inclusive) cell length:
+
+:``words``:
+    Space separated words from the sample lexicon, bounds are in words.
+:``chars``:
+    Text of whole sentences, as per :py:meth:`Generator.generate_text`, bounds
+    are in characters, and at least 2.
+:``sentences``:
+    Space separated sentences, bounds are in sentences.
+:``paragraphs``:
+    Single line paragraphs, bounds are in sentences.
+
+Rows are generated column by column, one batch at a time, and can be written
+straight to a stream as CSV, TSV or PostgreSQL ``COPY`` text format:
+
+>>> with open('users.tsv', 'w') as stream:
+...     loremipsum.records.dump_copy(stream, schema, 10 ** 6)
+...
+1000000
+>>>
+
+Columns can be unique, like the columns of a ``UNIQUE`` constraint: the
+values already generated are tracked by a :py:class:`BloomFilter`, instead of
+a set of the values themselves, and regenerated:
+
+>>> schema = [('email', 'words', 2, 2, True)]
+>>> rows = next(loremipsum.records.generate_rows(schema, 1000))
+>>> len(set(rows))
+1000
+>>>
+"""
+
+import collections
+import csv
+import hashlib
+import math
+import re
+import sys
+
+from loremipsum import generator
+from loremipsum import samples
+
+__all__ = ['BloomFilter', 'Column', 'generate_rows', 'dump_csv', 'dump_copy']
+
+builtins = sys.modules.get('__builtin__', sys.modules.get('builtins'))
+_irange = getattr(builtins, 'xrange', range)
+
+BATCH_SIZE = 1000
+
+# The default false positive rate of the unique columns values tracking.
+FALSE_POSITIVE_RATE = 0.001
+
+# How many times in a row a unique column value is generated again, before
+# giving up.
+UNIQUE_ATTEMPTS = 100
+
+
+class Column(collections.namedtuple(
+        'Column', 'name kind minimum maximum unique')):
+    """A schema column: name, kind, inclusive length bounds and whether its
+    values are unique (defaults to False).
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, name, kind, minimum, maximum, unique=False):
+        return super(Column, cls).__new__(
+            cls, name, kind, minimum, maximum, unique)
+
+
+# The minimum cell length of the kinds whose cells can't be of any length: a
+# text is at least a one letter word and a sentence delimiter.
+_MINIMUMS = {'chars': 2}
+
+_COPY_ESCAPES = {'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'}
+_COPY_SPECIALS = re.compile(r'[\\\t\n\r]')
+
+
+def _words(generator_, lengths):
+    """Generates cells of space separated words."""
+    generate_words = generator_.generate_words
+    return [' '.join(generate_words(length)) for length in lengths]
+
+
+def _chars(generator_, lengths):
+    """Generates cells of whole sentences, of an exact size in characters."""
+    generate_text = generator_.generate_text
+    return [generate_text(chars=length)[-1] for length in lengths]
+
+
+def _sentences(generator_, lengths):
+    """Generates cells of space separated sentences."""
+    generate_sentence = generator_.generate_sentence
+    return [' '.join(generate_sentence()[-1] for __ in _irange(length))
+            for length in lengths]
+
+
+def _paragraphs(generator_, lengths):
+    """Generates cells of single line paragraphs."""
+    generate_paragraph = generator_.generate_paragraph
+    return [generate_paragraph(paragraph_len=length)[-1] if length else ''
+            for length in lengths]
+
+
+_KINDS = {
+    'words': _words,
+    'chars': _chars,
+    'sentences': _sentences,
+    'paragraphs': _paragraphs}
+
+
+class BloomFilter(object):
+    """A compact set of strings, which may tell that a string was added even
+    if it was not (a false positive), but never the other way around.
+
+    :param int capacity:                The amount of strings to be added.
+    :param float false_positive_rate:   The probability of a false positive,
+                                        once capacity strings are added.
+                                        Defaults to
+                                        :py:data:`FALSE_POSITIVE_RATE`.
+    :raises ValueError:                 If the false positive rate is not
+                                        between 0 and 1 (excluded).
+
+    Each string sets a few bits of a bit array, at positions derived from its
+    SHA-256 hash: about 1.8 bytes are needed by string for a 0.001 false
+    positive rate, whatever the length of the strings.
+    """
+
+    def __init__(self, capacity, false_positive_rate=FALSE_POSITIVE_RATE):
+        if not 0 < false_positive_rate < 1:
+            raise ValueError('Invalid false positive rate: {0}'.format(
+                false_positive_rate))
+        capacity = max(1, capacity)
+        size = -capacity * math.log(false_positive_rate) / math.log(2) ** 2
+        self._size = max(8, int(math.ceil(size)))
+        self._hashes = max(1, int(round(
+            self._size / float(capacity) * math.log(2))))
+        self._bits = bytearray((self._size + 7) // 8)
+
+    def _positions(self, value):
+        """Returns the first bit position of a string, and the step to the
+        next ones (double hashing)."""
+        digest = int(hashlib.sha256(value.encode('UTF-8')).hexdigest()[:32],
+                     16)
+        return ((digest >> 64) % self._size,
+                (digest & 0xffffffffffffffff | 1) % self._size)
+
+    def __contains__(self, value):
+        bits, size = self._bits, self._size
+        position, step = self._positions(value)
+        for __ in _irange(self._hashes):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+            position = (position + step) % size
+        return True
+
+    def add(self, value):
+        """Adds a string.
+
+        :returns:   False if the string was (probably) added already, True
+                    otherwise.
+        :rtype:     bool
+        """
+        bits, size = self._bits, self._size
+        position, step = self._positions(value)
+        added = False
+        for __ in _irange(self._hashes):
+            mask = 1 << (position & 7)
+            if not bits[position >> 3] & mask:
+                bits[position >> 3] |= mask
+                added = True
+            position += step
+            if position >= size:
+                position -= size
+        return added
+
+
+def _unique(generator_, column, cells, seen):
+    """Generates again the cells whose value was seen, until they are all
+    new."""
+    generate, randrange = _KINDS[column.kind], generator_.random.randrange
+    width = column.maximum - column.minimum + 1
+    for index, cell in enumerate(cells):
+        attempts = 0
+        while not seen.add(cell):
+            attempts += 1
+            if attempts > UNIQUE_ATTEMPTS:
+                raise ValueError('Cannot generate unique values: {0}'.format(
+                    column.name))
+            if generator_.stats is not None:
+                generator_.stats.count('duplicates')
+            length = column.minimum + randrange(width)
+            cell = cells[index] = generate(generator_, [length])[0]
+
+
+def _columns(schema):
+    """Validates the schema and returns a list of :py:class:`Column`."""
+    columns = [Column(*column) for column in schema]
+    for column in columns:
+        if column.kind not in _KINDS:
+            raise ValueError('Unknown column kind: {0}'.format(column.kind))
+        if not _MINIMUMS.get(column.kind, 0) <= column.minimum <= \
+                column.maximum:
+            raise ValueError('Invalid bounds: {0}'.format(column.name))
+    return columns
+
+
+def generate_rows(schema, amount, batch_size=BATCH_SIZE, generator_=None,
+                  columnar=False, false_positive_rate=FALSE_POSITIVE_RATE):
+    """Creates a generator of batches of rows.
+
+    :param schema:              A sequence of :py:class:`Column` or tuples.
+    :param int amount:          The amount of rows to be generated.
+    :param int batch_size:      The maximum amount of rows of each batch.
+    :param generator_:          The :py:class:`Generator` to be used. Defaults
+                                to one using the default sample.
+    :param bool columnar:       If True, batches are lists of columns values
+                                instead of lists of rows.
+    :param float false_positive_rate:
+                                The false positive rate of the
+                                :py:class:`BloomFilter` of each unique column.
+                                Defaults to :py:data:`FALSE_POSITIVE_RATE`.
+    :returns:                   A generator of lists of tuples, or of lists.
+    :rtype:                     generator
+    :raises ValueError:         If the schema is invalid, or if a unique
+                                column runs out of new values.
+
+    Cell lengths are drawn from the random number generator of the
+    generator, so that its engine is used.
+
+    The values of unique columns which were (probably) generated already are
+    generated again, with a new length: false positives only cost extra
+    generations, and skip a few values which were actually new.
+    """
+    columns = _columns(schema)
+    if generator_ is None:
+        generator_ = generator.Generator(samples.DEFAULT)
+    seen = [BloomFilter(amount, false_positive_rate) if column.unique
+            else None for column in columns]
+    random_ = generator_.random
+    for start in _irange(0, amount, batch_size):
+        size = min(batch_size, amount - start)
+        batch = list()
+        for column, column_seen in zip(columns, seen):
+            # The lengths of a column are drawn in a single batch.
+            minimum = column.minimum
+            lengths = [minimum + length for length in generator._randbelows(
+                random_, column.maximum - minimum + 1, size)]
+            cells = _KINDS[column.kind](generator_, lengths)
+            if column_seen is not None:
+                _unique(generator_, column, cells, column_seen)
+            batch.append(cells)
+        yield batch if columnar else list(zip(*batch))
+
+
+def dump_csv(stream, schema, amount, dialect='excel', header=True, **args):
+    """Writes generated rows to a stream, in CSV format.
+
+    :param stream:              A text file-like object.
+    :param schema:              See :py:func:`generate_rows`.
+    :param int amount:          The amount of rows to be written.
+    :param dialect:             A :py:mod:`csv` dialect. Use ``excel-tab`` to
+                                write TSV.
+    :param bool header:         If True, writes the column names first.
+    :returns:                   The amount of rows written.
+    :rtype:                     int
+
+    Also accepts the same keyword arguments as :py:func:`generate_rows`,
+    except ``columnar``.
+    """
+    writer = csv.writer(stream, dialect=dialect)
+    if header:
+        writer.writerow([column.name for column in _columns(schema)])
+    written = 0
+    for rows in generate_rows(schema, amount, **args):
+        writer.writerows(rows)
+        written += len(rows)
+    return written
+
+
+def _copy_escape(value):
+    """Escapes a value for the PostgreSQL COPY text format."""
+    if _COPY_SPECIALS.search(value):
+        return _COPY_SPECIALS.sub(lambda m: _COPY_ESCAPES[m.group(0)], value)
+    return value
+
+
+def dump_copy(stream, schema, amount, **args):
+    """Writes generated rows to a stream, in PostgreSQL COPY text format.
+
+    :param stream:              A text file-like object.
+    :param schema:              See :py:func:`generate_rows`.
+    :param int amount:          The amount of rows to be written.
+    :returns:                   The amount of rows written.
+    :rtype:                     int
+
+    Columns are tab separated and rows are newline terminated, so the output
+    can be fed to ``COPY table FROM STDIN``. Also accepts the same keyword
+    arguments as :py:func:`generate_rows`, except ``columnar``.
+    """
+    written = 0
+    for rows in generate_rows(schema, amount, **args):
+        lines = ['\t'.join(_copy_escape(value) for value in row)
+                 for row in rows]
+        lines.append('')
+        stream.write('\n'.join(lines))
+        written += len(rows)
+    return written
@@ -1,3 +1,24 @@
+"""
+This package provides the content encodings, used to compress serialized
+samples and generated text. This is a pluggable package: default content
+encoding is named ``gzip``.
+
+A content encoding is a module (or any object) exposing ``encode`` and
+``decode`` functions, which take and return binary data, and an ``encoder``
+function:
+
+.. py:function:: encoder(level=LEVEL)
+
+   :param int level:    The compression level.
+   :returns:            A streaming encoder: its ``compress`` method encodes
+                        a chunk of binary data and returns the encoded data
+                        available so far, its ``flush`` method returns the
+                        end of the encoded data.
+
+It can also expose a ``CONCATENABLE`` boolean: True if concatenated encoded
+streams decode as a single one. Defaults to False.
+"""
+
 from loremipsum.serialization.content_encodings import bzip2
 from loremipsum.serialization.content_encodings import compress
 from loremipsum.serialization.content_encodings import gzip_
@@ -4,6 +4,9 @@ import bz2
 
 LEVEL = 6
 
+# Concatenated encoded streams decode as a single one.
+CONCATENABLE = True
+
 
 def decode(binary):
     """Decode (bunzip2) binary data."""
@@ -13,3 +16,9 @@ def decode(binary):
 def encode(binary):
     """Encode (bzip2) binary data."""
     return bz2.compress(binary, LEVEL)
+
+
+def encoder(level=LEVEL):
+    """Returns a streaming (bzip2) encoder: its ``compress`` method encodes a
+    chunk of binary data, its ``flush`` method ends the encoded data."""
+    return bz2.BZ2Compressor(level)
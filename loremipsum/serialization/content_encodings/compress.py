@@ -4,6 +4,9 @@ import zlib
 
 LEVEL = 6
 
+# Concatenated encoded streams can't be decoded.
+CONCATENABLE = False
+
 
 def decode(binary):
     """Decode (uncompress) binary data."""
@@ -13,3 +16,9 @@ def decode(binary):
 def encode(binary):
     """Encode (compress) binary data."""
     return zlib.compress(binary, LEVEL)
+
+
+def encoder(level=LEVEL):
+    """Returns a streaming (compress) encoder: its ``compress`` method encodes a
+    chunk of binary data, its ``flush`` method ends the encoded data."""
+    return zlib.compressobj(level)
@@ -2,9 +2,13 @@
 
 import gzip
 import io
+import zlib
 
 LEVEL = 9
 
+# Concatenated encoded streams decode as a single one.
+CONCATENABLE = True
+
 
 def decode(binary):
     """Decode (gunzip) binary data."""
@@ -22,3 +26,9 @@ def encode(binary):
         file_.write(binary)
     encoded.seek(0)
     return encoded.read()
+
+
+def encoder(level=LEVEL):
+    """Returns a streaming (gzip) encoder: its ``compress`` method encodes a
+    chunk of binary data, its ``flush`` method ends the encoded data."""
+    return zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
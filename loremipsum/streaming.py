@@ -0,0 +1,474 @@
+"""
+This module provides the API to stream large amounts of generated text. The
+text is generated in chunks, which can be generated in parallel by a pool of
+processes, and yielded in order:
+
+>>> chunks = loremipsum.streaming.generate_chunks('sentences', 1000, seed=1)
+>>> with open('sentences.txt', 'w') as stream:
+...     for chunk in chunks:
+...         stream.write(chunk)
+...
+>>>
+
+Each chunk is generated using its own seed, derived from the stream seed and
+the chunk index, so the streamed text depends on the seed only: not on the
+amount of processes generating it.
+
+Supported kinds of stream are:
+
+:``words``:
+    Space separated words, one line per chunk.
+:``sentences``:
+    One sentence per line.
+:``paragraphs``:
+    One paragraph per line, followed by an empty line.
+:``bytes``:
+    An exact amount of UTF-8 encoded bytes of text lines, each line being made
+    of whole sentences.
+
+Supported formats are ``text``, ``jsonl`` (one JSON object per item) and
+``csv`` (one row per item, see :py:func:`header`). Streaming ``bytes`` is only
+supported in ``text`` format.
+
+Since each chunk only depends on the seed and its index, a stream written to
+a file by :py:func:`write_stream` can be checkpointed: the stream seed, the
+index of the next chunk, the amount of items written and the output offset
+are periodically saved into a small JSON file. If the writing process dies,
+running it again with the same checkpoint resumes the stream from the last
+checkpoint, producing the same bytes as an uninterrupted run:
+
+>>> with open('sentences.txt', 'wb') as output:
+...     written = loremipsum.streaming.write_stream(
+...         output, 'sentences', 10 ** 7, checkpoint='sentences.json')
+...
+>>>
+"""
+
+import collections
+import csv
+import io
+import itertools
+import json
+import multiprocessing
+import multiprocessing.dummy
+import os
+import random
+import sys
+import threading
+import time
+
+from loremipsum import generator
+from loremipsum import samples
+from loremipsum.serialization import content_encodings
+
+__all__ = ['KINDS', 'FORMATS', 'CHUNK_SIZES', 'CHECKPOINT_INTERVAL',
+           'chunk_seed', 'chunk_amounts', 'generate_chunk', 'generate_chunks',
+           'header', 'write_stream']
+
+builtins = sys.modules.get('__builtin__', sys.modules.get('builtins'))
+_irange = getattr(builtins, 'xrange', range)
+
+KINDS = ('words', 'sentences', 'paragraphs', 'bytes')
+FORMATS = ('text', 'jsonl', 'csv')
+
+# Default amount of items (or bytes) per chunk.
+CHUNK_SIZES = {
+    'words': 1000,
+    'sentences': 100,
+    'paragraphs': 10,
+    'bytes': 2 ** 16}
+
+# Default time between checkpoints, in seconds.
+CHECKPOINT_INTERVAL = 60.0
+
+_FIELDS = {
+    'words': ('text',),
+    'sentences': ('words', 'text'),
+    'paragraphs': ('sentences', 'words', 'text')}
+
+# The generator used by the pool processes.
+_GENERATOR = None
+
+
+def _sample(url):
+    """Returns the sample loaded from url, or the default one."""
+    return generator.Sample.load(url) if url else samples.DEFAULT
+
+
+def _setup(url):
+    """Initializes a pool process."""
+    globals()['_GENERATOR'] = generator.Generator(_sample(url))
+
+
+def chunk_seed(seed, index):
+    """Derives the seed of a chunk from the stream seed.
+
+    :param int seed:        The stream seed.
+    :param int index:       The chunk index.
+    :rtype:                 int
+    """
+    return (seed << 32) + index
+
+
+def _generate(generator_, kind, amount, random_):
+    """Generates the items of a chunk, as a list of tuples, drawing from
+    random_."""
+    if kind == 'words':
+        return [(word,) for word in generator_.generate_words(
+            amount, random=random_)]
+    elif kind == 'sentences':
+        return list(generator_.generate_sentences(amount, random=random_))
+    elif kind == 'paragraphs':
+        return list(generator_.generate_paragraphs(amount, random=random_))
+    # The trailing new line is part of the chunk size.
+    return [generator_.generate_text(bytes=amount - 1, random=random_)]
+
+
+def _format(kind, format_, items):
+    """Formats the items of a chunk."""
+    if format_ == 'jsonl':
+        fields = _FIELDS[kind]
+        lines = [json.dumps(dict(zip(fields, item)), sort_keys=True)
+                 for item in items]
+        return '\n'.join(lines) + '\n'
+    elif format_ == 'csv':
+        stream = io.BytesIO() if str is bytes else io.StringIO()
+        csv.writer(stream).writerows(items)
+        return stream.getvalue()
+    elif kind == 'words':
+        return ' '.join(item[-1] for item in items) + '\n'
+    elif kind == 'paragraphs':
+        return ''.join(item[-1] + '\n\n' for item in items)
+    return ''.join(item[-1] + '\n' for item in items)
+
+
+def generate_chunk(generator_, kind, seed, index, amount, format_='text'):
+    """Generates and formats a chunk of a stream.
+
+    :param Generator generator_:    The generator to be used.
+    :param str kind:                One of :py:data:`KINDS`.
+    :param int seed:                The stream seed.
+    :param int index:               The chunk index.
+    :param int amount:              The amount of items (or bytes) of the
+                                    chunk.
+    :param str format_:             One of :py:data:`FORMATS`. Defaults to
+                                    ``text``.
+    :returns:                       The chunk text.
+    :rtype:                         str or unicode
+    """
+    # A private generator of the engine (the random module has a Random class
+    # too): the caller random module state is left untouched.
+    random_ = (generator_.engine or random).Random(chunk_seed(seed, index))
+    return _format(kind, format_, _generate(generator_, kind, amount, random_))
+
+
+def _work(task):
+    """Generates and formats a chunk in a pool process."""
+    return generate_chunk(_GENERATOR, *task)
+
+
+def chunk_amounts(kind, amount, chunk_size=None):
+    """Splits the amount of a stream into the amounts of its chunks.
+
+    :param str kind:            One of :py:data:`KINDS`.
+    :param int amount:          The amount of items (or bytes) of the stream.
+                                If None, chunk amounts are yielded forever.
+    :param int chunk_size:      The amount of items (or bytes) per chunk.
+                                Defaults to :py:data:`CHUNK_SIZES` value.
+    :returns:                   A generator of chunk amounts.
+    :rtype:                     generator
+    """
+    chunk_size = chunk_size or CHUNK_SIZES[kind]
+    while amount is None:
+        yield chunk_size
+    chunks, remainder = divmod(amount, chunk_size)
+    if kind == 'bytes' and chunks and remainder:
+        # Don't leave a too short last line.
+        chunks, remainder = chunks - 1, chunk_size + remainder
+    for __ in _irange(chunks):
+        yield chunk_size
+    if remainder:
+        yield remainder
+
+
+def _check(kind, format_):
+    """Raises ValueError if the stream is not supported."""
+    if kind not in KINDS or format_ not in FORMATS:
+        raise ValueError('Unsupported stream: {0} {1}'.format(kind, format_))
+    if kind == 'bytes' and format_ != 'text':
+        raise ValueError('Bytes can only be streamed as text')
+
+
+def header(kind, format_):
+    """Returns the stream header: the field names line in ``csv`` format.
+
+    :param str kind:        One of :py:data:`KINDS`.
+    :param str format_:     One of :py:data:`FORMATS`.
+    :rtype:                 str or unicode
+    """
+    if format_ != 'csv':
+        return ''
+    return ','.join(_FIELDS[kind]) + '\r\n'
+
+
+def generate_chunks(kind, amount=None, **args):
+    """Creates a generator of chunks of text.
+
+    :param str kind:            One of :py:data:`KINDS`.
+    :param int amount:          The amount of items (or bytes) to generate. If
+                                None, chunks are generated forever.
+    :param str sample:          The URL of the sample to be used, as per
+                                :py:meth:`Sample.load`. Defaults to the
+                                default sample.
+    :param int seed:            The stream seed. Defaults to a random one.
+    :param int jobs:            The amount of processes generating chunks.
+                                Defaults to 1: chunks are generated by the
+                                calling process.
+    :param str format:          One of :py:data:`FORMATS`. Defaults to
+                                ``text``.
+    :param int chunk_size:      The amount of items (or bytes) per chunk.
+                                Defaults to :py:data:`CHUNK_SIZES` value.
+    :param int start:           The index of the first chunk to generate.
+                                Defaults to 0.
+    :returns:                   A generator of text chunks.
+    :rtype:                     generator
+    :raises ValueError:         If kind or format are not supported.
+    """
+    format_ = args.get('format', 'text')
+    _check(kind, format_)
+    seed = args.get('seed')
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(32)
+    jobs = args.get('jobs', 1)
+    chunk_size = args.get('chunk_size') or CHUNK_SIZES[kind]
+    start = args.get('start', 0)
+    amounts = itertools.islice(chunk_amounts(kind, amount, chunk_size), start,
+                               None)
+    tasks = ((kind, seed, index, amount_, format_)
+             for index, amount_ in enumerate(amounts, start))
+
+    if jobs <= 1:
+        generator_ = generator.Generator(_sample(args.get('sample')))
+        for task in tasks:
+            yield generate_chunk(generator_, *task)
+        return
+
+    # Keep a bounded amount of chunks in flight, so that endless streams
+    # don't flood the memory.
+    pool = multiprocessing.Pool(jobs, _setup, (args.get('sample'),))
+    try:
+        pending = collections.deque()
+        for task in tasks:
+            pending.append(pool.apply_async(_work, (task,)))
+            if len(pending) >= 2 * jobs:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+    finally:
+        pool.terminate()
+
+
+class _Writer(object):
+    """Writes binary data into output, optionally encoded using a content
+    encoding, optionally in a separate thread."""
+
+    # Ends the encoded stream, in the queue of the writing thread.
+    _END = object()
+
+    def __init__(self, output, content_encoding=None, threaded=False):
+        self.output, self.written = output, 0
+        self._encoding = self._encoder = None
+        if content_encoding:
+            self._encoding = content_encodings.get(content_encoding)
+            if self._encoding is None:
+                raise ValueError('Unknown content encoding: {0}'.format(
+                    content_encoding))
+            self._encoder = self._encoding.encoder()
+        self._queue = self._thread = self._error = None
+        if threaded:
+            # Bounded, so that generation can't run too far ahead.
+            self._queue = multiprocessing.dummy.Queue(4)
+            self._thread = threading.Thread(target=self._run)
+            self._thread.daemon = True
+            self._thread.start()
+
+    def _write(self, data):
+        """Encodes and writes data."""
+        if self._encoder is not None:
+            data = self._encoder.compress(data)
+        self.output.write(data)
+        self.written += len(data)
+
+    def _end(self):
+        """Ends the encoded stream: the next data starts a new one."""
+        if self._encoder is not None:
+            data = self._encoder.flush()
+            self.output.write(data)
+            self.written += len(data)
+            self._encoder = self._encoding.encoder()
+
+    def _run(self):
+        """Writes the queued data, until None is queued."""
+        while True:
+            data = self._queue.get()
+            try:
+                if data is None:
+                    return
+                if self._error is not None:
+                    continue
+                if data is self._END:
+                    self._end()
+                else:
+                    self._write(data)
+            except Exception as error:
+                self._error = error
+            finally:
+                self._queue.task_done()
+
+    def _raise(self):
+        """Raises the error of the writing thread, if any."""
+        if self._error is not None:
+            raise self._error
+
+    def write(self, data):
+        """Writes data."""
+        if self._queue is None:
+            return self._write(data)
+        self._raise()
+        self._queue.put(data)
+
+    def sync(self):
+        """Ends the encoded stream, and waits for all the data to be
+        written."""
+        if self._queue is None:
+            return self._end()
+        self._queue.put(self._END)
+        self._queue.join()
+        self._raise()
+
+    def close(self):
+        """Stops the writing thread, if any. Unsynced data is discarded."""
+        if self._thread is not None:
+            self._error = self._error or ValueError('Writer is closed')
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+
+def _save_checkpoint(output, path, state):
+    """Saves the checkpoint state, once the output is on disk."""
+    output.flush()
+    os.fsync(output.fileno())
+    with open(path + '.tmp', 'w') as checkpoint:
+        json.dump(state, checkpoint, sort_keys=True)
+        checkpoint.flush()
+        os.fsync(checkpoint.fileno())
+    getattr(os, 'replace', os.rename)(path + '.tmp', path)
+
+
+def write_stream(output, kind, amount=None, **args):
+    """Writes a stream, header included, optionally resuming it.
+
+    :param output:              The binary file to write the UTF-8 encoded
+                                stream into. It must be seekable if
+                                checkpoint is given.
+    :param str kind:            One of :py:data:`KINDS`.
+    :param int amount:          The amount of items (or bytes) to generate. If
+                                None, chunks are written forever.
+    :param str content_encoding:
+                                Optional. The name of a plugged content
+                                encoding (like ``gzip``) the stream is encoded
+                                with, as it is written.
+    :param bool threaded:       If True, encode and write in a separate
+                                thread, so that generation and encoding
+                                overlap. Defaults to False.
+    :param str checkpoint:      Optional. The path of the checkpoint file. If
+                                it exists, the stream is resumed from it: the
+                                output is truncated to the checkpointed offset
+                                and written from the checkpointed chunk on.
+                                The file is removed once the stream is
+                                complete.
+    :param float checkpoint_interval:
+                                The time between checkpoints, in seconds.
+                                Defaults to :py:data:`CHECKPOINT_INTERVAL`.
+    :returns:                   The amount of bytes written by this call.
+    :rtype:                     int
+    :raises ValueError:         If the checkpoint was saved by a different
+                                stream, if the content encoding is unknown,
+                                or doesn't support concatenated streams while
+                                checkpoint is given, or as per
+                                :py:func:`generate_chunks`.
+
+    Also accepts the same arguments as :py:func:`generate_chunks`, except
+    ``start``. A checkpoint is also saved if writing is interrupted by an
+    exception.
+
+    Encoded streams end at each checkpoint, and a new one starts: the
+    content encoding must support concatenated streams, like ``gzip`` and
+    ``bzip2`` do (but not ``compress``), in order to be checkpointed.
+    """
+    path = args.pop('checkpoint', None)
+    interval = args.pop('checkpoint_interval', CHECKPOINT_INTERVAL)
+    content_encoding = args.pop('content_encoding', None)
+    threaded = args.pop('threaded', False)
+    format_ = args.get('format', 'text')
+    _check(kind, format_)
+    chunk_size = args.get('chunk_size') or CHUNK_SIZES[kind]
+    stream = dict(kind=kind, amount=amount, format=format_,
+                  chunk_size=chunk_size, sample=args.get('sample'),
+                  content_encoding=content_encoding)
+    encoding = content_encodings.get(content_encoding) \
+        if content_encoding else None
+    if path is not None and encoding is not None and \
+            not getattr(encoding, 'CONCATENABLE', False):
+        raise ValueError('Content encoding can\'t be checkpointed: {0}'.format(
+            content_encoding))
+    state = None
+    if path is not None and os.path.exists(path):
+        with open(path) as checkpoint:
+            state = json.load(checkpoint)
+        if any(state.get(key) != value for key, value in stream.items()) or \
+                args.get('seed') not in (None, state['seed']):
+            raise ValueError('Checkpoint mismatch: {0}'.format(path))
+        output.seek(state['offset'])
+        output.truncate()
+    else:
+        seed = args.get('seed')
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(32)
+        state = dict(stream, seed=seed, chunk=0, items=0, offset=0)
+    writer = _Writer(output, content_encoding, threaded)
+    args['seed'], args['start'] = state['seed'], state['chunk']
+    chunks = generate_chunks(kind, amount, **args)
+    amounts = itertools.islice(chunk_amounts(kind, amount, chunk_size),
+                               state['chunk'], None)
+
+    # The state of the written data, as of the last sync.
+    offset, synced = state['offset'], dict(state)
+    saved, complete = time.time(), False
+    try:
+        if state['offset'] == 0:
+            writer.write(header(kind, format_).encode('UTF-8'))
+        for chunk in chunks:
+            writer.write(chunk.encode('UTF-8'))
+            state['chunk'] += 1
+            state['items'] += next(amounts)
+            if path is not None and time.time() - saved >= interval:
+                writer.sync()
+                state['offset'] = offset + writer.written
+                synced = dict(state)
+                _save_checkpoint(output, path, synced)
+                saved = time.time()
+        writer.sync()
+        output.flush()
+        complete = True
+    finally:
+        chunks.close()
+        writer.close()
+        if path is not None:
+            if complete:
+                if os.path.exists(path):
+                    os.remove(path)
+            else:
+                _save_checkpoint(output, path, synced)
+    return writer.written
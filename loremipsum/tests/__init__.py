@@ -1,20 +1,44 @@
 import unittest
 
 from loremipsum.tests import plugs_testpackage
+from loremipsum.tests import test_cli
+from loremipsum.tests import test_document
+from loremipsum.tests import test_engines
 from loremipsum.tests import test_generator
 from loremipsum.tests import test_loremipsum
+from loremipsum.tests import test_parallel
 from loremipsum.tests import test_plugs
+from loremipsum.tests import test_pool
+from loremipsum.tests import test_records
 from loremipsum.tests import test_serialization
+from loremipsum.tests import test_streaming
+from loremipsum.tests import test_tokenizers
 
 __all__ = [
     'plugs_testpackage',
+    'test_cli',
+    'test_document',
+    'test_engines',
     'test_generator',
     'test_loremipsum',
-    'test_plugs']
+    'test_parallel',
+    'test_plugs',
+    'test_pool',
+    'test_records',
+    'test_streaming',
+    'test_tokenizers']
 
 suite = unittest.TestSuite()
 loader = unittest.defaultTestLoader
+suite.addTest(loader.loadTestsFromModule(test_cli))
+suite.addTest(loader.loadTestsFromModule(test_document))
+suite.addTest(loader.loadTestsFromModule(test_engines))
 suite.addTest(loader.loadTestsFromModule(test_generator))
 suite.addTest(loader.loadTestsFromModule(test_loremipsum))
+suite.addTest(loader.loadTestsFromModule(test_parallel))
 suite.addTest(loader.loadTestsFromModule(test_plugs))
+suite.addTest(loader.loadTestsFromModule(test_pool))
+suite.addTest(loader.loadTestsFromModule(test_records))
 suite.addTest(loader.loadTestsFromModule(test_serialization))
+suite.addTest(loader.loadTestsFromModule(test_streaming))
+suite.addTest(loader.loadTestsFromModule(test_tokenizers))
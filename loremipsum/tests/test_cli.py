@@ -0,0 +1,89 @@
+"""Test cli module."""
+
+from loremipsum import cli
+
+import bz2
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+
+class TestCli(unittest.TestCase):
+    """Command line interface TestCase."""
+
+    def setUp(self):
+        self._prefix = tempfile.mkdtemp()
+        self._output = os.path.join(self._prefix, 'output.txt')
+
+    def tearDown(self):
+        shutil.rmtree(self._prefix)
+
+    def _main(self, *argv):
+        """Runs the command line interface and returns the output."""
+        self.assertEqual(cli.main(['--output', self._output] + list(argv)), 0)
+        with open(self._output, 'rb') as output:
+            return output.read().decode('UTF-8')
+
+    def test_main(self):
+        """Test cli.main function."""
+        output = self._main('--sentences', '10', '--seed', '1', '--quiet',
+                            '--chunk-size', '3')
+        self.assertEqual(len(output.splitlines()), 10)
+        parallel = self._main('--sentences', '10', '--seed', '1', '--quiet',
+                              '--chunk-size', '3', '--jobs', '2')
+        self.assertEqual(output, parallel)
+
+        output = self._main('--bytes', '12345', '--quiet')
+        self.assertEqual(len(output.encode('UTF-8')), 12345)
+
+        output = self._main('--words', '3', '--format', 'csv', '--quiet')
+        self.assertEqual(output.splitlines()[0], 'text')
+        self.assertEqual(len(output.splitlines()), 4)
+
+    def test_content_encoding(self):
+        """Test cli.main function content encoding."""
+        expected = self._main('--words', '300', '--seed', '1', '--quiet')
+        self.assertEqual(cli.main([
+            '--output', self._output, '--words', '300', '--seed', '1',
+            '--quiet', '--content-encoding', 'bzip2', '--encoding-thread']),
+            0)
+        with open(self._output, 'rb') as output:
+            self.assertEqual(bz2.decompress(output.read()).decode('UTF-8'),
+                             expected)
+
+    def test_checkpoint(self):
+        """Test cli.main function checkpoints."""
+        expected = self._main('--sentences', '30', '--seed', '1', '--quiet',
+                              '--chunk-size', '7')
+        checkpoint = os.path.join(self._prefix, 'checkpoint.json')
+        # A checkpoint of the first two chunks, and some garbage.
+        offset = len(''.join(expected.splitlines(True)[:14]).encode('UTF-8'))
+        with open(checkpoint, 'w') as stream:
+            json.dump(dict(kind='sentences', amount=30, format='text',
+                           chunk_size=7, sample=None, seed=1, chunk=2,
+                           items=14, offset=offset), stream)
+        with open(self._output, 'ab') as output:
+            output.write(b'garbage')
+        output = self._main('--sentences', '30', '--quiet', '--chunk-size',
+                            '7', '--checkpoint', checkpoint)
+        self.assertEqual(output, expected)
+        self.assertFalse(os.path.exists(checkpoint))
+
+    def test_errors(self):
+        """Test cli.main function errors."""
+        stderr, sys.stderr = sys.stderr, open(os.devnull, 'w')
+        try:
+            with self.assertRaises(SystemExit):
+                cli.main(['--bytes', '10', '--format', 'jsonl'])
+            with self.assertRaises(SystemExit):
+                cli.main(['--words', '10', '--sentences', '10'])
+            with self.assertRaises(SystemExit):
+                cli.main(['--output', self._output, '--bytes', '2'])
+            with self.assertRaises(SystemExit):
+                cli.main(['--bytes', '10', '--checkpoint', self._output])
+        finally:
+            sys.stderr.close()
+            sys.stderr = stderr
@@ -0,0 +1,53 @@
+"""Test document module."""
+
+from loremipsum import document
+from loremipsum import generator
+from loremipsum import samples
+
+import unittest
+
+
+class TestDocument(unittest.TestCase):
+    """Document TestCase."""
+
+    @classmethod
+    def setUpClass(class_):
+        """Setup a document to use in tests."""
+        class_._d = document.Document(samples.DEFAULT, seed=3)
+
+    def test___getitem__(self):
+        """Test Document item access and slicing."""
+        self.assertEqual(len(self._d), 10 ** 9)
+        paragraph = self._d[123456]
+        self.assertEqual(self._d[123456], paragraph)
+        self.assertEqual(
+            generator.Generator(samples.DEFAULT).generate_paragraph(
+                seed=3, index=123456)[-1],
+            paragraph)
+        self.assertEqual(self._d[-1], self._d[10 ** 9 - 1])
+        with self.assertRaises(IndexError):
+            self._d[10 ** 9]
+
+        view = self._d[123450:123460]
+        self.assertEqual(len(view), 10)
+        self.assertEqual(view[6], paragraph)
+        self.assertEqual(list(view)[6], paragraph)
+        self.assertEqual(view[::-3][1], paragraph)
+        self.assertEqual(len(self._d[5:2]), 0)
+        self.assertNotEqual(document.Document(seed=4)[123456], paragraph)
+
+    def test_read(self):
+        """Test Document.read method."""
+        fixed = document.Document(seed=3, paragraphs=5, paragraph_bytes=100)
+        self.assertEqual(fixed.size, 510)
+        text = fixed.read()
+        self.assertEqual(len(text), 510)
+        self.assertEqual(text.decode('UTF-8').split('\n\n')[:-1], list(fixed))
+        for offset, size in ((0, 10), (95, 20), (102, 102), (500, 100)):
+            self.assertEqual(fixed.read(offset, size),
+                             text[offset:offset + size])
+        self.assertEqual(fixed[1:4].read(), text[102:408])
+        with self.assertRaises(TypeError):
+            self._d.read()
+        with self.assertRaises(ValueError):
+            fixed.read(-1)
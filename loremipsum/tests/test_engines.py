@@ -0,0 +1,70 @@
+"""Test engines package."""
+
+from loremipsum import engines
+from loremipsum import generator
+from loremipsum import records
+from loremipsum import samples
+from loremipsum import streaming
+
+import random
+import unittest
+
+
+class TestEngines(unittest.TestCase):
+    """Engines TestCase."""
+
+    def test_portable(self):
+        """Test portable engine streams."""
+        # The streams must never change.
+        self.assertEqual(engines.portable.Random(7).randbelows(100, 5),
+                         [94, 39, 4, 82, 9])
+        rng = engines.portable.Random(7)
+        self.assertEqual([rng.randrange(100) for __ in range(5)],
+                         [94, 39, 4, 82, 9])
+        self.assertEqual(rng.choice('abcdefghij'), 'f')
+        normal = engines.portable.Random(7)
+        self.assertEqual(
+            [round(normal.normalvariate(0, 1), 12) for __ in range(3)],
+            [-0.258347319968, 0.200854924436, 1.066051300448])
+
+        state = rng.getstate()
+        draws = [rng.normalvariate(5, 2) for __ in range(3)]
+        rng.setstate(state)
+        self.assertEqual([rng.normalvariate(5, 2) for __ in range(3)], draws)
+        with self.assertRaises(ValueError):
+            rng.randrange(0)
+        with self.assertRaises(IndexError):
+            rng.choice([])
+
+    def test_mersenne(self):
+        """Test mersenne engine."""
+        self.assertIs(engines.DEFAULT, engines.mersenne)
+        rng, reference = engines.mersenne.Random(7), random.Random(7)
+        self.assertEqual(rng.randbelows(100, 5),
+                         [reference.randrange(100) for __ in range(5)])
+
+    def test_generator(self):
+        """Test Generator engine argument."""
+        portable = generator.Generator(samples.DEFAULT, engine='portable')
+        self.assertIs(portable.engine, engines.portable)
+        self.assertEqual(
+            portable.generate_paragraph(seed=3, index=9),
+            generator.Generator(samples.DEFAULT, engine=engines.portable)
+            .generate_paragraph(seed=3, index=9))
+        self.assertEqual(len(list(portable.generate_words(10))), 10)
+        self.assertEqual(len(portable.generate_text(chars=500)[-1]), 500)
+        with portable.default(sentence_mean=3) as other:
+            self.assertIs(other.engine, engines.portable)
+
+        self.assertIsInstance(portable.random, engines.portable.Random)
+        self.assertIs(generator.Generator(samples.DEFAULT).random, random)
+
+        # The global random state is neither used nor altered.
+        state = random.getstate()
+        portable.generate_paragraph()
+        next(records.generate_rows([('name', 'words', 1, 3, True)], 10,
+                                   generator_=portable))
+        chunk = streaming.generate_chunk(portable, 'sentences', 1, 0, 5)
+        self.assertEqual(streaming.generate_chunk(
+            portable, 'sentences', 1, 0, 5), chunk)
+        self.assertEqual(random.getstate(), state)
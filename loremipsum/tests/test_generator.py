@@ -1,7 +1,12 @@
 from loremipsum import generator
 from loremipsum import samples
 
+import mmap
+import random
+import re
+import shutil
 import sys
+import tempfile
 import unittest
 
 
@@ -88,6 +93,171 @@ class TestSample(unittest.TestCase):
         """Test Sample.__eq__."""
         self.assertEqual(self._s, samples.DEFAULT)
 
+    def test_stats(self):
+        """Test Sample cook, reheat, load and dump timings."""
+        events = list()
+        stats = generator.Stats(callback=lambda *e: events.append(e))
+        generator.Sample(stats=stats, **dict(zip(
+            ('text', 'lexicon', 'word_delimiters', 'sentence_delimiters'),
+            self._s.row())))
+        generator.Sample(frozen=self._s.frozen(), stats=stats)
+        self.assertGreater(stats.timings['cook'], 0)
+        self.assertGreater(stats.timings['reheat'], 0)
+        self.assertEqual([name for name, __ in events], ['cook', 'reheat'])
+
+        prefix = tempfile.mkdtemp()
+        try:
+            url = 'file://{0}/sample.json'.format(prefix)
+            self._s.dump(url, stats=stats)
+            self.assertEqual(self._s.load(url, stats=stats), self._s)
+        finally:
+            shutil.rmtree(prefix)
+        self.assertGreater(stats.timings['dump'], 0)
+        self.assertGreater(stats.timings['load'], 0)
+        self.assertGreater(stats.timings['reheat'], events[1][1])
+
+        stats.reset()
+        self.assertEqual(set(stats.timings.values()), set([0]))
+
+    def test_lengths(self):
+        """Test Sample['sentence_lengths'] and ['paragraph_lengths'] items."""
+        for kind, key in (('sentence', 'sentence_lengths'),
+                          ('paragraph', 'paragraph_lengths')):
+            histogram = self._s[key]
+            self.assertEqual(histogram, tuple(sorted(histogram)))
+            total = sum(count for __, count in histogram)
+            mean = sum(length * count for length, count in histogram)
+            self.assertAlmostEqual(float(mean) / total,
+                                   self._s[kind + '_mean'])
+        sample = generator.Sample.thawed(self._s.frozen())
+        self.assertEqual(sample['sentence_lengths'],
+                         self._s['sentence_lengths'])
+
+    def test_order(self):
+        """Test Sample order argument."""
+        row = dict(zip(
+            ('text', 'lexicon', 'word_delimiters', 'sentence_delimiters'),
+            self._s.row()))
+        self.assertEqual(self._s['order'], 2)
+        for order in (1, 3, 12):
+            sample = generator.Sample(order=order, **row)
+            self.assertEqual(sample['order'], order)
+            self.assertEqual(sample['chains'].order, order)
+            self.assertTrue(all(len(state) == order
+                                for state in sample['chains']))
+            self.assertEqual(generator.Sample.thawed(sample.frozen()), sample)
+            generator_ = generator.Generator(sample)
+            self.assertEqual(len(list(generator_.generate_paragraphs(3))), 3)
+        with self.assertRaises(ValueError):
+            generator.Sample(order=0, **row)
+
+
+class TestChains(unittest.TestCase):
+    """Chains TestCase."""
+
+    def test_chains(self):
+        """Test Chains mapping and rows."""
+        transitions = {
+            (0, 0): [(5, ''), (3, ','), (5, '')],
+            (0, 5): [(300, '.')],
+            (5, 300): [(3, ''), (5, '')]}
+        chains = generator.Chains(transitions)
+        self.assertEqual(chains.order, 2)
+        self.assertEqual(len(chains), 3)
+        self.assertEqual(sorted(chains), sorted(transitions))
+        self.assertEqual(dict(chains.items()),
+                         dict((k, sorted(v)) for k, v in transitions.items()))
+        self.assertEqual(chains[(0, 0)], [(3, ','), (5, ''), (5, '')])
+        self.assertIn((5, 300), chains)
+        self.assertNotIn((300, 5), chains)
+        self.assertNotIn((0, 0, 0), chains)
+        self.assertNotIn((2 ** 20, 0), chains)
+        with self.assertRaises(KeyError):
+            chains[(1, 2)]
+
+        row = chains.row(chains.pack((0, 5)))
+        self.assertEqual(chains.unpack(chains.states[row]), (0, 5))
+        self.assertEqual(chains.row(chains.pack((1, 1))), -1)
+        index = chains.draw(row)
+        self.assertEqual(chains.lengths[index], 300)
+        self.assertEqual(chains.delimiters[chains.delimiter_indexes[index]],
+                         '.')
+        self.assertEqual(chains.next_rows[index],
+                         chains.row(chains.pack((5, 300))))
+        row = chains.row(chains.pack((0, 0)))
+        rng = random.Random(1)
+        draws = [chains.lengths[chains.draw(row, rng)] for __ in range(300)]
+        self.assertTrue(150 < draws.count(5) < 250)
+
+
+class TestLexicon(unittest.TestCase):
+    """Lexicon TestCase."""
+
+    def test_lexicon(self):
+        """Test Lexicon mapping and packed words."""
+        lexicon = generator.Lexicon(
+            'dolor sit amet ipsum sit \xe6ther lorem a'.split())
+        self.assertEqual(lexicon.lengths, (1, 3, 4, 5))
+        self.assertEqual(lexicon.size, 7)
+        self.assertEqual(len(lexicon), 4)
+        self.assertEqual(list(lexicon), [1, 3, 4, 5])
+        self.assertEqual(tuple(lexicon[5]),
+                         ('dolor', 'ipsum', 'lorem', '\xe6ther'))
+        self.assertEqual(dict((k, list(v)) for k, v in lexicon.items()), {
+            1: ['a'], 3: ['sit'], 4: ['amet'],
+            5: ['dolor', 'ipsum', 'lorem', '\xe6ther']})
+        self.assertIn(3, lexicon)
+        self.assertNotIn(2, lexicon)
+        self.assertIsNone(lexicon.get(2))
+        with self.assertRaises(KeyError):
+            lexicon[2]
+
+        start, end = lexicon.bounds(5)
+        self.assertEqual(end - start, 4)
+        self.assertEqual(lexicon.bounds(2), (0, 0))
+        self.assertEqual(lexicon.word(end - 1), '\xe6ther')
+        self.assertEqual(lexicon.view(end - 1).tobytes(),
+                         '\xe6ther'.encode('UTF-8'))
+        self.assertEqual(lexicon[5][-1], '\xe6ther')
+        self.assertEqual(len(lexicon.buffer), 29)
+        with self.assertRaises(IndexError):
+            lexicon[5][4]
+
+        other = generator.Lexicon(dict(lexicon.items()))
+        self.assertEqual(other.buffer, lexicon.buffer)
+        with self.assertRaises(ValueError):
+            generator.Lexicon({3: ['lorem']})
+
+    def test_counts(self):
+        """Test Lexicon words counts."""
+        self.assertIsNone(generator.Lexicon(['lorem', 'ipsum']).counts)
+        lexicon = generator.Lexicon(['lorem', 'ipsum', 'lorem'])
+        self.assertEqual(list(lexicon[5]), ['ipsum', 'lorem'])
+        self.assertEqual(list(lexicon.counts), [1, 2])
+        lexicon = generator.Lexicon(['sit', 'lorem', 'ipsum', 'dolor', 'sit'],
+                                    [3, 90, 10, 0, 2])
+        self.assertEqual(list(lexicon[5]), ['ipsum', 'lorem'])
+        self.assertEqual(list(lexicon.counts), [5, 10, 90])
+        other = generator.Lexicon({3: ['sit'], 5: ['ipsum', 'lorem']},
+                                  {3: [5], 5: [10, 90]})
+        self.assertEqual(other.buffer, lexicon.buffer)
+        self.assertEqual(other.counts, lexicon.counts)
+        with self.assertRaises(ValueError):
+            generator.Lexicon(['lorem'], [-1])
+
+    def test_generate(self):
+        """Test generation from a lexicon too big to be decoded."""
+        decoded = generator._DECODED_WORDS
+        generator._DECODED_WORDS = 0
+        try:
+            g = generator.Generator(samples.DEFAULT)
+            words = set(samples.DEFAULT['lexicon'].split())
+            self.assertIn(g.generate_word(), words)
+            count, sentence = g.generate_sentence()
+            self.assertEqual(count, len(sentence.split()))
+        finally:
+            generator._DECODED_WORDS = decoded
+
 
 class TestGenerator(unittest.TestCase):
     """Sample TestCase."""
@@ -133,3 +303,424 @@ class TestGenerator(unittest.TestCase):
             self.assertIs(other.sample, samples.DEFAULT)
             with self.assertRaises(ValueError):
                 other.sample = list(row)
+
+    def test_generate_text(self):
+        """Test Generator.generate_text method."""
+        sample = self._g.sample
+        for size in (0, 2, 10, 57, 100, 1000, 5000):
+            sentences, words, text = self._g.generate_text(chars=size)
+            self.assertEqual(len(text), size)
+            if size:
+                self.assertTrue(text.endswith('.'))
+            self.assertEqual(sentences, len(list(sample._find_sentences(text))))
+            self.assertEqual(words, len(list(sample._find_words(text))))
+
+            text = self._g.generate_text(bytes=size)[-1]
+            self.assertEqual(len(text.encode('UTF-8')), size)
+
+            text = self._g.generate_text(bytes=size * 2,
+                                         encoding='UTF-16-LE')[-1]
+            self.assertEqual(len(text.encode('UTF-16-LE')), size * 2)
+
+            sentences, words, text = self._g.generate_text(words=size)
+            self.assertEqual(words, size)
+            self.assertEqual(words, len(list(sample._find_words(text))))
+
+        with self.assertRaises(TypeError):
+            self._g.generate_text()
+        with self.assertRaises(TypeError):
+            self._g.generate_text(chars=10, words=10)
+        with self.assertRaises(ValueError):
+            self._g.generate_text(chars=1)
+        with self.assertRaises(ValueError):
+            self._g.generate_text(bytes=3, encoding='UTF-16-LE')
+
+    def test_planned_text(self):
+        """Test Generator.generate_text planned sentences."""
+        sample = self._g.sample
+        stats = generator.Stats()
+        g = generator.Generator(sample, stats=stats)
+        for size in range(2, 150):
+            for seed in range(3):
+                sentences, words, text = g.generate_text(chars=size,
+                                                         seed=seed)
+                self.assertEqual(len(text), size)
+                # No word is next to itself.
+                for sentence in sample._find_sentences(text):
+                    sentence = [re.sub(r'\W', '', word.group(0)).lower()
+                                for word in
+                                sample._find_words(sentence.group(0))]
+                    self.assertFalse(any(
+                        word == other
+                        for word, other in zip(sentence, sentence[1:])),
+                        text)
+                # Sentences that don't fit are not counted.
+                self.assertEqual(stats.counters['sentences'], sentences)
+                self.assertEqual(stats.counters['words'], words)
+                stats.reset()
+
+        # Capitalized words are measured as they are rendered.
+        class Marked(generator.BytesGenerator):
+            def _capitalize(self, word):
+                return b'\xc2\xbb' + generator.BytesGenerator._capitalize(
+                    self, word)
+
+        marked = Marked(sample)
+        for size in (4, 10, 40, 100, 1000):
+            text = marked.generate_text(chars=size)[-1]
+            self.assertEqual(len(text.decode('UTF-8')), size)
+            self.assertEqual(len(marked.generate_text(bytes=size)[-1]), size)
+
+    def test_stats(self):
+        """Test Generator stats counters."""
+        stats = generator.Stats()
+        generator_ = generator.Generator(samples.DEFAULT, stats=stats)
+        self.assertIs(generator_.stats, stats)
+        words = sentences = 0
+        for count, words_count, text in generator_.generate_paragraphs(5):
+            sentences += count
+            words += words_count
+        self.assertEqual(stats.counters['paragraphs'], 5)
+        self.assertEqual(stats.counters['sentences'], sentences)
+        self.assertEqual(stats.counters['words'], words)
+        self.assertGreater(stats.counters['restarts'], 0)
+
+        list(generator_.generate_words(10))
+        self.assertEqual(stats.counters['words'], words + 10)
+        with generator_.default(sentence_mean=0.9) as other:
+            other.generate_sentence()
+        self.assertEqual(stats.counters['sentences'], sentences + 1)
+
+        # The callback is only given non zero counts.
+        events = list()
+        stats = generator.Stats(callback=lambda *e: events.append(e))
+        generator_ = generator.Generator(samples.DEFAULT, stats=stats)
+        list(generator_.generate_sentences(50))
+        self.assertNotIn(0, [value for __, value in events])
+        self.assertEqual(sum(value for name, value in events
+                             if name == 'restarts'), stats.counters['restarts'])
+
+    def test_counter(self):
+        """Test Generator counter based mode."""
+        paragraphs = list(self._g.generate_paragraphs(4, seed=7, index=4000))
+        self.assertEqual(len(set(paragraphs)), 4)
+        for index, paragraph in enumerate(paragraphs):
+            self.assertEqual(
+                self._g.generate_paragraph(seed=7, index=4000 + index),
+                paragraph)
+        self.assertNotEqual(self._g.generate_paragraph(seed=8, index=4000),
+                            paragraphs[0])
+
+        sentences = list(self._g.generate_sentences(3, seed=7))
+        self.assertEqual(self._g.generate_sentence(seed=7, index=2),
+                         sentences[2])
+        words = list(self._g.generate_words(3, index=5))
+        self.assertEqual(self._g.generate_word(seed=0, index=7), words[2])
+        self.assertEqual(self._g.generate_text(chars=100, seed=7),
+                         self._g.generate_text(chars=100, seed=7))
+
+        # The global random state is neither used nor altered.
+        state = random.getstate()
+        self._g.generate_paragraph(seed=7)
+        self.assertEqual(random.getstate(), state)
+
+        with self.assertRaises(ValueError):
+            self._g.generate_sentence(seed=7, index=-1)
+
+    def test_random(self):
+        """Test Generator random argument."""
+        first = self._g.generate_paragraph(random=random.Random(5))
+        self.assertEqual(self._g.generate_paragraph(random=random.Random(5)),
+                         first)
+
+    def test_for_key(self):
+        """Test Generator.for_key and Generator.for_keys methods."""
+        # Keys are mapped to seeds the same way on any platform.
+        self.assertEqual(generator._key_seed(42), 16988525305983557675)
+        self.assertEqual(generator._key_seed(('user', 42)),
+                         6010870158633114265)
+
+        memoized = generator.Generator(samples.DEFAULT, memo_size=2)
+        bio = self._g.for_key(42, 'sentence')
+        self.assertEqual(memoized.for_key(42, 'sentence'), bio)
+        self.assertEqual(memoized.for_key(42, 'sentence'), bio)
+        self.assertNotEqual(memoized.for_key('42', 'sentence'), bio)
+        self.assertEqual(len(self._g.for_key(b'42', 'text', chars=30)), 30)
+
+        keys = [1, 2, 1, ('user', 42), 3]
+        words = memoized.for_keys(keys, 'word')
+        self.assertEqual(words, [self._g.for_key(key, 'word') for key in keys])
+        self.assertEqual(words[0], words[2])
+        self.assertEqual(len(memoized._memo), 2)
+        # Keys seed the counter based mode, whatever the engine.
+        portable = generator.Generator(samples.DEFAULT, engine='portable')
+        for g in (self._g, portable):
+            self.assertEqual(g.for_keys(keys, 'paragraph'), [
+                g.generate_paragraph(seed=generator._key_seed(key))[-1]
+                for key in keys])
+        memoized.sample = samples.DEFAULT
+        self.assertEqual(len(memoized._memo), 0)
+
+        with self.assertRaises(TypeError):
+            self._g.for_key(1.5)
+        with self.assertRaises(ValueError):
+            self._g.for_key(1, 'chapter')
+
+    def test_alias_table(self):
+        """Test lengths alias tables."""
+        histogram = ((1, 1), (2, 5), (4, 2), (9, 4))
+        table = generator._alias_table(histogram)
+        values, total, thresholds, aliases = table
+        # Each column splits total between its value and its alias.
+        weights = dict()
+        for value, threshold, alias in zip(values, thresholds, aliases):
+            weights[value] = weights.get(value, 0) + threshold
+            weights[alias] = weights.get(alias, 0) + total - threshold
+        self.assertEqual(weights, dict((value, count * len(values))
+                                       for value, count in histogram))
+        rng = random.Random(1)
+        self.assertTrue(all(generator._alias_draw(table, rng) in values
+                            for __ in range(100)))
+
+    def test_lengths(self):
+        """Test sentence and paragraph lengths draws."""
+        lengths = set(length for length, __
+                      in self._g.sample['sentence_lengths'])
+        drawn = set(len(list(self._g.sample._find_words(sentence)))
+                    for __, sentence in self._g.generate_sentences(200))
+        self.assertTrue(drawn <= lengths)
+        sentences = [len(sentence.split())
+                     for __, sentence in self._g.generate_sentences(
+                         200, sentence_mean=50, sentence_sigma=1)]
+        self.assertTrue(all(45 <= count <= 55 for count in sentences))
+        with self._g.default(paragraph_mean=20, paragraph_sigma=1) as long_:
+            self.assertNotIn('paragraph_lengths', long_.sample)
+            self.assertIn('sentence_lengths', long_.sample)
+            paragraph = long_.generate_paragraph()
+            self.assertTrue(15 <= paragraph[0] <= 25)
+
+    def test_weights(self):
+        """Test frequency weighted lexicon sampling."""
+        text, __, word_delimiters, sentence_delimiters = \
+            samples.DEFAULT.row()
+        sample = generator.Sample(
+            text=text, lexicon='lorem\t90\nipsum\t10\ndolor\t0\nsit amet',
+            word_delimiters=word_delimiters,
+            sentence_delimiters=sentence_delimiters)
+        self.assertEqual(dict(sample.frozen())['weights'],
+                         ((3, (1,)), (4, (1,)), (5, (10, 90))))
+        self.assertEqual(generator.Sample.thawed(sample.frozen()), sample)
+        g = generator.Generator(sample)
+        words = [g.generate_word(5, random=random.Random(seed))
+                 for seed in range(1000)]
+        self.assertTrue(800 < words.count('lorem') < 980)
+        self.assertEqual(words.count('lorem') + words.count('ipsum'), 1000)
+        for __, sentence in g.generate_sentences(20):
+            self.assertNotIn('dolor', sentence.lower())
+        # Other tab separated words are plain words.
+        for lexicon in ('lorem\tmany', 'lorem\t90\nipsum\tdolor\tsit'):
+            sample = generator.Sample(
+                text=text, lexicon=lexicon, word_delimiters=word_delimiters,
+                sentence_delimiters=sentence_delimiters)
+            self.assertIsNone(sample['dictionary'].counts)
+            self.assertEqual(
+                sorted(word for words in sample['dictionary'].values()
+                       for word in words), sorted(lexicon.split()))
+        with self.assertRaises(ValueError):
+            generator.Sample(text=text, lexicon='lorem\t-1\nipsum\t2',
+                             word_delimiters=word_delimiters,
+                             sentence_delimiters=sentence_delimiters)
+
+    def test_no_repeat(self):
+        """Test recent words avoidance."""
+        text, __, word_delimiters, sentence_delimiters = \
+            samples.DEFAULT.row()
+        for lexicon in ('lorem ipsum dolor sit sed non amet elit',
+                        'lorem\t5\nipsum\ndolor\t3\nsit\t2\nsed\nnon\t4\n'
+                        'amet\t7\nelit'):
+            g = generator.Generator(generator.Sample(
+                text=text, lexicon=lexicon, word_delimiters=word_delimiters,
+                sentence_delimiters=sentence_delimiters))
+            for no_repeat in (1, 2, 3):
+                for seed in range(20):
+                    __, sentence = g.generate_sentence(
+                        sentence_len=30, no_repeat=no_repeat,
+                        random=random.Random(seed))
+                    words = [word.strip(''.join(word_delimiters)).lower()
+                             for word in sentence[:-1].split()]
+                    for i, word in enumerate(words):
+                        recent = [other for other in
+                                  words[max(0, i - no_repeat):i]
+                                  if len(other) == len(word)]
+                        # If all the words of its length are recent, the word
+                        # is only different from the previous one.
+                        if len(set(recent)) < len(g._dictionary()[len(word)]):
+                            self.assertNotIn(word, recent)
+                        elif recent:
+                            self.assertNotEqual(word, recent[-1])
+            # Repetitions are allowed.
+            __, sentence = g.generate_sentence(sentence_len=100, no_repeat=0)
+            self.assertTrue(any(
+                a == b for a, b in zip(sentence.split(), sentence.split()[1:])))
+        # Excluded words are skipped, the others keep their odds.
+        r = random.Random(1)
+        bucket = ('a', 'b', 'c', 'd')
+        picks = [generator._draw_excluding(bucket, ['b', 'd'], r)
+                 for __ in range(1000)]
+        self.assertEqual(set(picks), set([0, 2]))
+        self.assertTrue(400 < picks.count(0) < 600)
+        picks = [generator._draw_excluding(bucket, ['a', 'c'], r, [1, 5, 6, 9])
+                 for __ in range(1000)]
+        self.assertEqual(set(picks), set([1, 3]))
+        self.assertTrue(500 < picks.count(1) < 700)
+        self.assertEqual(
+            generator._draw_excluding(('a', 'b'), ['a', 'b', 'a'], r), 1)
+
+    def test_endings(self):
+        """Test sentence endings drawn from the sample ones."""
+        __, lexicon, word_delimiters, sentence_delimiters = \
+            samples.DEFAULT.row()
+        text = ' '.join(['Lorem ipsum, dolor sit amet? Sed do eiusmod tempor '
+                         'incididunt? Ut labore et dolore magna aliqua!'] * 4)
+        g = generator.Generator(generator.Sample(
+            text=text, lexicon=lexicon, word_delimiters=word_delimiters,
+            sentence_delimiters=sentence_delimiters))
+        sentences = [sentence for __, sentence in g.generate_sentences(
+            300, incipit=True)]
+        self.assertEqual(sentences[0], 'Lorem ipsum, dolor sit amet' +
+                         sentences[0][-1])
+        endings = [sentence[-1] for sentence in sentences]
+        self.assertEqual(set(endings), set('?!'))
+        self.assertTrue(150 < endings.count('?') < 250)
+        for sentence in sentences:
+            self.assertEqual(sentence[0], sentence[0].upper())
+            self.assertNotIn(sentence[-2], word_delimiters)
+        __, __, paragraph = g.generate_paragraph(paragraph_len=3)
+        self.assertEqual(paragraph.count('?') + paragraph.count('!'), 3)
+        __, __, text = g.generate_text(chars=100)
+        self.assertEqual(len(text), 100)
+        self.assertEqual(text[-1], '?')
+
+    def test_incipit_sentence(self):
+        """Test sentences starting with the sample incipit."""
+        __, lexicon, word_delimiters, sentence_delimiters = \
+            samples.DEFAULT.row()
+        g = generator.Generator(generator.Sample(
+            text='Lorem ipsum, dolor sit amet? Sed do eiusmod tempor.',
+            lexicon=lexicon, word_delimiters=word_delimiters,
+            sentence_delimiters=sentence_delimiters))
+        # The incipit is cut to the sentence length.
+        for sentence_len, incipit in ((5, 'Lorem ipsum, dolor sit amet'),
+                                      (3, 'Lorem ipsum, dolor'),
+                                      (2, 'Lorem ipsum')):
+            __, sentence = g.generate_sentence(incipit=True,
+                                               sentence_len=sentence_len)
+            self.assertEqual(sentence, incipit + sentence[-1])
+        # Longer sentences go on past the incipit, without its ending.
+        count, sentence = g.generate_sentence(incipit=True, sentence_len=8)
+        self.assertEqual(count, 8)
+        self.assertTrue(sentence.startswith('Lorem ipsum, dolor sit amet '))
+        self.assertNotIn('?', sentence[:-1])
+        # Drawn lengths don't run past the incipit.
+        for seed in range(50):
+            count, sentence = g.generate_sentence(incipit=True,
+                                                  sentence_mean=20, seed=seed)
+            self.assertTrue(count <= 5)
+            self.assertTrue('Lorem ipsum, dolor sit amet'.startswith(
+                sentence[:-1]))
+
+    def test_model(self):
+        """Test Generator model argument."""
+        self.assertEqual(self._g.model, 'lengths')
+        words = generator.Generator(samples.DEFAULT, model='words')
+        self.assertEqual(words.model, 'words')
+        text = samples.DEFAULT['text'].lower()
+        for count, sentence in words.generate_sentences(20):
+            self.assertEqual(count, len(sentence.split()))
+            for word in sentence.split():
+                self.assertIn(word.strip(',.').lower(), text)
+        self.assertEqual(words.generate_paragraph(seed=1),
+                         words.generate_paragraph(seed=1))
+        with words.default(sentence_mean=3) as other:
+            self.assertEqual(other.model, 'words')
+        with self.assertRaises(ValueError):
+            generator.Generator(samples.DEFAULT, model='letters')
+
+    def test_bytes_generator(self):
+        """Test BytesGenerator text, the same as Generator one, encoded."""
+        text, __, word_delimiters, sentence_delimiters = \
+            samples.DEFAULT.row()
+        accented = generator.Sample(
+            text=text, lexicon='\u00e9t\u00e9\t3\n\u00e0 ipsum \u00e9l\u00e0n '
+            '\u00f1and\u00fa\t2\nlorem sed \u00fcber dolor\t4',
+            word_delimiters=word_delimiters,
+            sentence_delimiters=sentence_delimiters)
+        for sample in (samples.DEFAULT, accented):
+            for model in generator.MODELS:
+                g = generator.Generator(sample, model=model)
+                b = generator.BytesGenerator(sample, model=model)
+                for seed in range(20):
+                    for method, args in (
+                            ('generate_word', dict()),
+                            ('generate_sentence', dict(incipit=True)),
+                            ('generate_sentence', dict(no_repeat=3)),
+                            ('generate_paragraph', dict(incipit=seed % 2)),
+                            ('generate_text', dict(chars=100 + seed)),
+                            ('generate_text', dict(bytes=100 + seed)),
+                            ('generate_text', dict(
+                                bytes=100 + seed, encoding='latin-1')),
+                            ('generate_text', dict(words=10 + seed))):
+                        expected = getattr(g, method)(seed=seed, **args)
+                        result = getattr(b, method)(seed=seed, **args)
+                        if method == 'generate_word':
+                            expected, result = (expected,), (result,)
+                        self.assertEqual(result[:-1], expected[:-1])
+                        self.assertIsInstance(result[-1], bytes)
+                        self.assertEqual(result[-1],
+                                         expected[-1].encode('UTF-8'))
+        __, __, text = generator.BytesGenerator(accented).generate_text(
+            bytes=1000)
+        self.assertEqual(len(text), 1000)
+        # Lexicons too big to be decoded are read from the lexicon buffer.
+        decoded_words = generator._DECODED_WORDS
+        generator._DECODED_WORDS = 0
+        try:
+            b = generator.BytesGenerator(accented)
+            self.assertEqual(
+                b.generate_paragraph(seed=1)[-1],
+                generator.Generator(accented).generate_paragraph(
+                    seed=1)[-1].encode('UTF-8'))
+        finally:
+            generator._DECODED_WORDS = decoded_words
+        with b.default(sentence_mean=3) as other:
+            self.assertIsInstance(other, generator.BytesGenerator)
+
+    def test_render_into(self):
+        """Test Generator.render_into."""
+        for g in (self._g, generator.BytesGenerator(samples.DEFAULT)):
+            for size in (10, 100, 1000, 10000):
+                buffer_ = bytearray(b'#' * (size + 4))
+                sentences_count, words_count, text = \
+                    self._g.generate_text(bytes=size, seed=size)
+                self.assertEqual(
+                    g.render_into(buffer_, 2, size=size, seed=size),
+                    (sentences_count, words_count, size))
+                self.assertEqual(bytes(buffer_),
+                                 b'##' + text.encode('UTF-8') + b'##')
+        # Unreachable sizes are filled up as much as possible.
+        buffer_ = bytearray(b'#')
+        self.assertEqual(self._g.render_into(buffer_), (0, 0, 0))
+        self.assertEqual(buffer_, bytearray(b'#'))
+        # Up to the end of the buffer, which is released.
+        buffer_ = mmap.mmap(-1, 4096)
+        try:
+            __, __, written = self._g.render_into(buffer_, 96)
+            self.assertEqual(written, 4000)
+            self.assertEqual(buffer_[96:].decode('UTF-8')[-1], '.')
+        finally:
+            buffer_.close()
+        for offset, size in ((-1, 1), (11, 0), (2, 9)):
+            with self.assertRaises(ValueError):
+                self._g.render_into(bytearray(10), offset, size=size)
+        with self.assertRaises(TypeError):
+            self._g.render_into(b'read-only buffer')
@@ -98,3 +98,18 @@ class TestLoremipsum(unittest.TestCase):
         l = loremipsum.get_paragraphs(3)
         self.assertIsInstance(l, types.GeneratorType)
         self.assertEqual(len(list(l)), 3)
+
+    def test_generate_text(self):
+        """Test loremipsum.generate_text function."""
+        sentences, words, text = loremipsum.generate_text(chars=100)
+        self.assertEqual(len(text), 100)
+        self.assertEqual(sentences, len(list(self._s._find_sentences(text))))
+        self.assertEqual(words, len(list(self._s._find_words(text))))
+        sentences, words, text = loremipsum.generate_text(words=100)
+        self.assertEqual(words, 100)
+
+    def test_get_text(self):
+        """Test loremipsum.get_text function."""
+        text = loremipsum.get_text(bytes=100)
+        self.assertIsInstance(text, self._unicode_str)
+        self.assertEqual(len(text.encode('UTF-8')), 100)
@@ -0,0 +1,62 @@
+"""Test parallel module."""
+
+from loremipsum import parallel
+from loremipsum.serialization import content_encodings
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+
+class TestParallel(unittest.TestCase):
+    """Parallel TestCase."""
+
+    def setUp(self):
+        self._prefix = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self._prefix)
+
+    def _read(self, out_dir, entry, content_encoding=None):
+        """Reads and verifies a shard, returns its text."""
+        with open(os.path.join(out_dir, entry['name']), 'rb') as shard:
+            data = shard.read()
+        self.assertEqual(len(data), entry['size'])
+        self.assertEqual(hashlib.sha256(data).hexdigest(), entry['sha256'])
+        if content_encoding:
+            data = content_encodings.get(content_encoding).decode(data)
+        self.assertEqual(len(data), entry['bytes'])
+        text = data.decode('UTF-8')
+        self.assertEqual(len(text.split()), entry['words'])
+        return text
+
+    def test_generate_shards(self):
+        """Test parallel.generate_shards function."""
+        out_dir = os.path.join(self._prefix, 'plain')
+        manifest = parallel.generate_shards(None, 200001, shards=3, seed=1,
+                                            out_dir=out_dir, jobs=1)
+        with open(os.path.join(out_dir, parallel.MANIFEST)) as stream:
+            self.assertEqual(json.load(stream), manifest)
+        self.assertEqual([entry['bytes'] for entry in manifest['shards']],
+                         [66667, 66667, 66667])
+        texts = [self._read(out_dir, entry) for entry in manifest['shards']]
+        self.assertEqual(len(set(texts)), 3)
+
+        out_dir = os.path.join(self._prefix, 'gzip')
+        encoded = parallel.generate_shards(
+            None, 200001, shards=3, seed=1, out_dir=out_dir, jobs=2,
+            content_encoding='gzip')
+        self.assertEqual(encoded['shards'][0]['name'], 'shard-00000.txt.gz')
+        for entry, text in zip(encoded['shards'], texts):
+            self.assertEqual(self._read(out_dir, entry, 'gzip'), text)
+            self.assertEqual(entry['words'],
+                             manifest['shards'][texts.index(text)]['words'])
+
+        with self.assertRaises(ValueError):
+            parallel.generate_shards(None, 10, shards=0, out_dir=out_dir)
+        with self.assertRaises(ValueError):
+            parallel.generate_shards(None, 10, out_dir=out_dir,
+                                     content_encoding='lzma')
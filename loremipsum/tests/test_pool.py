@@ -0,0 +1,140 @@
+"""Test pool module."""
+
+from loremipsum import generator
+from loremipsum import pool
+from loremipsum import samples
+
+import sys
+import time
+import unittest
+
+
+class TestSentencePool(unittest.TestCase):
+    """SentencePool TestCase."""
+
+    @classmethod
+    def setUpClass(class_):
+        """Setup a pool to use in tests."""
+        class_._g = generator.Generator(samples.DEFAULT)
+        class_._p = pool.SentencePool(class_._g, size=50, seed=1)
+
+    def test_generate_sentence(self):
+        """Test SentencePool sentences draws."""
+        sentences = set(self._p._sentences)
+        self.assertEqual(len(self._p), 50)
+        for __ in range(200):
+            self.assertIn(self._p.generate_sentence(), sentences)
+        self.assertIn(self._p.get_sentence(),
+                      [sentence for __, sentence in sentences])
+        self.assertEqual(
+            pool.SentencePool(self._g, size=50, seed=1).generate_sentence(),
+            pool.SentencePool(self._g, size=50, seed=1).generate_sentence())
+
+    def test_generate_paragraph(self):
+        """Test SentencePool paragraphs draws."""
+        text = ' '.join(sentence for __, sentence in self._p._sentences)
+        for __ in range(200):
+            sentences_count, words_count, paragraph = \
+                self._p.generate_paragraph()
+            self.assertIn(paragraph, text)
+            self.assertTrue(paragraph.endswith('.'))
+            self.assertEqual(paragraph.count('.'), sentences_count)
+            self.assertEqual(len(paragraph.split()), words_count)
+        self.assertIn(self._p.get_paragraph(), text)
+        small = pool.SentencePool(self._g, size=1)
+        self.assertEqual(small.generate_paragraph()[1:],
+                         small.generate_sentence())
+
+    def test_refresh(self):
+        """Test SentencePool refresh."""
+        p = pool.SentencePool(self._g, size=100, refresh=0.2, seed=2)
+        before = list(p._sentences)
+        p.refresh()
+        self.assertEqual(len(p._sentences), 100)
+        changed = sum(a != b for a, b in zip(before, p._sentences))
+        self.assertTrue(0 < changed <= 20)
+        text = ' '.join(sentence for __, sentence in p._sentences)
+        self.assertIn(p.get_paragraph(), text)
+        with pool.SentencePool(self._g, size=10, interval=0.01) as p:
+            before = p._pool
+            for __ in range(500):
+                if p._pool is not before:
+                    break
+                time.sleep(0.01)
+            self.assertIsNot(p._pool, before)
+            p.get_paragraph()
+        self.assertIsNone(p._thread)
+        # The pool draws from the generator engine.
+        portable = generator.Generator(samples.DEFAULT, engine='portable')
+        p = pool.SentencePool(portable, size=100, refresh=0.2, seed=2)
+        other = pool.SentencePool(portable, size=100, refresh=0.2, seed=2)
+        p.refresh()
+        other.refresh()
+        self.assertEqual(p._sentences, other._sentences)
+        self.assertEqual(p.get_paragraph(), other.get_paragraph())
+        with self.assertRaises(ValueError):
+            pool.SentencePool(self._g, size=0)
+        with self.assertRaises(ValueError):
+            pool.SentencePool(self._g, refresh=2)
+
+
+class TestPrefetchingGenerator(unittest.TestCase):
+    """PrefetchingGenerator TestCase."""
+
+    def _check(self, prefetching):
+        """Checks the texts served by a prefetching generator."""
+        count, sentence = prefetching.generate_sentence()
+        self.assertEqual(len(sentence.split()), count)
+        self.assertTrue(sentence.endswith('.'))
+        sentences_count, words_count, paragraph = \
+            prefetching.generate_paragraph()
+        self.assertEqual(paragraph.count('.'), sentences_count)
+        self.assertEqual(len(paragraph.split()), words_count)
+        self.assertTrue(prefetching.get_sentence())
+        for __ in range(500):
+            if prefetching.fill == {'sentence': 5, 'paragraph': 5}:
+                break
+            time.sleep(0.01)
+        self.assertEqual(prefetching.fill, {'sentence': 5, 'paragraph': 5})
+        stalls = dict(prefetching.stalls)
+        for __ in range(5):
+            prefetching.get_paragraph()
+        self.assertEqual(prefetching.stalls, stalls)
+        prefetching.get_paragraph()
+
+    def test_thread(self):
+        """Test PrefetchingGenerator in a thread."""
+        g = generator.Generator(samples.DEFAULT)
+        with pool.PrefetchingGenerator(g, size=5) as prefetching:
+            self._check(prefetching)
+        with self.assertRaises(ValueError):
+            prefetching.get_sentence()
+        with pool.PrefetchingGenerator(g, size=5, kinds=('sentence',),
+                                       sentence_len=3) as prefetching:
+            self.assertEqual(prefetching.generate_sentence()[0], 3)
+            with self.assertRaises(ValueError):
+                prefetching.get_paragraph()
+        with self.assertRaises(ValueError):
+            pool.PrefetchingGenerator(g, kinds=('word',))
+        self._check_error(g, False)
+        with self.assertRaises(ValueError):
+            pool.PrefetchingGenerator(g, size=0)
+
+    def _check_error(self, g, process):
+        """Checks generation errors are raised by the serving methods."""
+        with pool.PrefetchingGenerator(g, size=5, process=process,
+                                       sentence_mean='x') as prefetching:
+            for __ in range(2):
+                with self.assertRaises(TypeError):
+                    prefetching.get_sentence()
+                with self.assertRaises(TypeError):
+                    prefetching.get_paragraph()
+
+    @unittest.skipIf(sys.platform == 'win32', 'Forking is not supported')
+    def test_process(self):
+        """Test PrefetchingGenerator in a process."""
+        g = generator.Generator(samples.DEFAULT)
+        with pool.PrefetchingGenerator(g, size=5, process=True) as \
+                prefetching:
+            self._check(prefetching)
+        self._check_error(g, True)
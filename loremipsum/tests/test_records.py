@@ -0,0 +1,120 @@
+"""Test records module."""
+
+from loremipsum import generator
+from loremipsum import records
+from loremipsum import samples
+
+import csv
+import io
+import re
+import unittest
+
+
+class TestRecords(unittest.TestCase):
+    """Records TestCase."""
+
+    @classmethod
+    def setUpClass(class_):
+        """Setup a schema to use in tests."""
+        class_._s = samples.DEFAULT
+        class_._schema = [
+            records.Column('name', 'words', 1, 3),
+            ('title', 'chars', 20, 40),
+            ('bio', 'sentences', 1, 2),
+            ('body', 'paragraphs', 2, 2)]
+
+    def test_generate_rows(self):
+        """Test records.generate_rows function."""
+        batches = list(records.generate_rows(self._schema, 25, batch_size=10))
+        self.assertEqual([len(rows) for rows in batches], [10, 10, 5])
+        for rows in batches:
+            for name, title, bio, body in rows:
+                self.assertIn(len(name.split()), (1, 2, 3))
+                self.assertTrue(20 <= len(title) <= 40)
+                self.assertIn(len(list(self._s._find_sentences(bio))), (1, 2))
+                self.assertEqual(len(list(self._s._find_sentences(body))), 2)
+
+        batches = records.generate_rows(self._schema, 5, columnar=True)
+        columns = next(batches)
+        self.assertEqual(len(columns), 4)
+        self.assertTrue(all(len(column) == 5 for column in columns))
+
+        with self.assertRaises(ValueError):
+            list(records.generate_rows([('name', 'letters', 1, 3)], 1))
+        with self.assertRaises(ValueError):
+            list(records.generate_rows([('name', 'words', 3, 1)], 1))
+        # Single character texts can't be generated.
+        with self.assertRaises(ValueError):
+            next(records.generate_rows([('title', 'chars', 1, 3)], 1))
+        rows = next(records.generate_rows([('title', 'chars', 2, 3)], 50))
+        self.assertTrue(all(len(title) in (2, 3) for title, in rows))
+
+    def test_chars(self):
+        """Test chars columns content."""
+        lexicon = set(self._s._s['lexicon'].split())
+        rows = next(records.generate_rows([('title', 'chars', 2, 60)], 200))
+        for title, in rows:
+            for sentence in self._s._find_sentences(title):
+                words = [re.sub(r'\W', '', word.group(0)).lower()
+                         for word in self._s._find_words(sentence.group(0))]
+                self.assertTrue(lexicon.issuperset(words), title)
+                # No word is next to itself.
+                self.assertFalse(any(
+                    word == other for word, other in zip(words, words[1:])),
+                    title)
+
+    def test_dump_csv(self):
+        """Test records.dump_csv function."""
+        stream = io.StringIO()
+        written = records.dump_csv(stream, self._schema, 15, batch_size=10,
+                                   dialect='excel-tab')
+        self.assertEqual(written, 15)
+        stream.seek(0)
+        rows = list(csv.reader(stream, dialect='excel-tab'))
+        self.assertEqual(rows[0], ['name', 'title', 'bio', 'body'])
+        self.assertEqual(len(rows), 16)
+
+    def test_dump_copy(self):
+        """Test records.dump_copy function."""
+        stream = io.StringIO()
+        written = records.dump_copy(stream, self._schema, 15, batch_size=10)
+        self.assertEqual(written, 15)
+        lines = stream.getvalue().split('\n')
+        self.assertEqual(len(lines), 16)
+        self.assertEqual(lines[-1], '')
+        self.assertTrue(all(len(line.split('\t')) == 4 for line in lines[:-1]))
+        self.assertEqual(records._copy_escape('a\\b\tc\nd'), 'a\\\\b\\tc\\nd')
+
+    def test_unique(self):
+        """Test records unique columns."""
+        stats = generator.Stats()
+        generator_ = generator.Generator(samples.DEFAULT, stats=stats)
+        schema = [records.Column('name', 'words', 1, 1, True),
+                  ('bio', 'sentences', 1, 1, True),
+                  ('body', 'paragraphs', 1, 1)]
+        self.assertFalse(records.Column('name', 'words', 1, 1).unique)
+        rows = [row for batch in records.generate_rows(
+            schema, 150, batch_size=40, generator_=generator_)
+            for row in batch]
+        self.assertEqual(len(rows), 150)
+        for column in range(2):
+            self.assertEqual(len(set(row[column] for row in rows)), 150)
+        # 150 words out of the 188 of the lexicon are bound to collide.
+        self.assertGreater(stats.counters['duplicates'], 0)
+        with self.assertRaises(ValueError):
+            list(records.generate_rows(
+                schema, self._s['dictionary'].size + 1))
+
+    def test_bloom_filter(self):
+        """Test records.BloomFilter class."""
+        seen = records.BloomFilter(1000, 0.01)
+        values = ['value {0}'.format(i) for i in range(1000)]
+        self.assertTrue(all(seen.add(value) for value in values[::2]))
+        self.assertFalse(any(seen.add(value) for value in values[::2]))
+        self.assertTrue(all(value in seen for value in values[::2]))
+        false_positives = sum(value in seen for value in values[1::2])
+        self.assertLess(false_positives, 25)
+        self.assertEqual(len(seen._bits), 1199)
+        for rate in (0, 1):
+            with self.assertRaises(ValueError):
+                records.BloomFilter(1000, rate)
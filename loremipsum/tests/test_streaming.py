@@ -0,0 +1,172 @@
+"""Test streaming module."""
+
+from loremipsum import generator
+from loremipsum import samples
+from loremipsum import streaming
+from loremipsum.serialization import content_encodings
+
+import io
+import json
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+
+class _Failing(io.FileIO):
+    """Fails once size bytes have been written."""
+
+    size = None
+
+    def write(self, data):
+        if self.size is not None and self.tell() + len(data) > self.size:
+            raise IOError('Disk full')
+        return io.FileIO.write(self, data)
+
+
+class TestStreaming(unittest.TestCase):
+    """Streaming TestCase."""
+
+    def test_generate_chunks(self):
+        """Test streaming.generate_chunks function."""
+        chunks = list(streaming.generate_chunks('sentences', 25, seed=1,
+                                                chunk_size=10))
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(len(''.join(chunks).splitlines()), 25)
+
+        parallel = streaming.generate_chunks('sentences', 25, seed=1,
+                                             chunk_size=10, jobs=2)
+        self.assertEqual(chunks, list(parallel))
+
+        text = ''.join(streaming.generate_chunks('bytes', 1000, seed=1,
+                                                 chunk_size=300))
+        self.assertEqual(len(text.encode('UTF-8')), 1000)
+        self.assertEqual(len(text.splitlines()), 3)
+        self.assertEqual(list(streaming.chunk_amounts('bytes', 1000, 300)),
+                         [300, 300, 400])
+
+        # Chunks only depend on the stream seed and their index.
+        generator_ = generator.Generator(samples.DEFAULT)
+        self.assertEqual(streaming.generate_chunk(
+            generator_, 'sentences', 1, 2, 5), chunks[2])
+
+        # The random module state is left untouched.
+        random.seed(1)
+        expected = random.random()
+        random.seed(1)
+        list(streaming.generate_chunks('sentences', 25, seed=5))
+        streaming.write_stream(io.BytesIO(), 'sentences', 10, seed=5)
+        self.assertEqual(random.random(), expected)
+
+        endless = streaming.generate_chunks('words', chunk_size=5)
+        for __ in range(10):
+            self.assertEqual(len(next(endless).split()), 5)
+        endless.close()
+
+        with self.assertRaises(ValueError):
+            next(streaming.generate_chunks('letters', 10))
+        with self.assertRaises(ValueError):
+            next(streaming.generate_chunks('bytes', 10, format='csv'))
+
+    def test_formats(self):
+        """Test streaming.generate_chunks formats."""
+        chunk = next(streaming.generate_chunks('paragraphs', 2,
+                                               format='jsonl'))
+        lines = [json.loads(line) for line in chunk.splitlines()]
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(set(lines[0]), set(['sentences', 'words', 'text']))
+
+        chunk = next(streaming.generate_chunks('sentences', 2, format='csv'))
+        self.assertEqual(len(chunk.splitlines()), 2)
+        self.assertEqual(streaming.header('sentences', 'csv'),
+                         'words,text\r\n')
+        self.assertEqual(streaming.header('sentences', 'text'), '')
+
+    def test_write_stream(self):
+        """Test streaming.write_stream function."""
+        prefix = tempfile.mkdtemp()
+        try:
+            path = os.path.join(prefix, 'checkpoint.json')
+            output = io.BytesIO()
+            self.assertEqual(streaming.write_stream(
+                output, 'sentences', 25, seed=1, format='csv',
+                chunk_size=10), len(output.getvalue()))
+            expected = output.getvalue().decode('UTF-8')
+            self.assertEqual(expected, 'words,text\r\n' + ''.join(
+                streaming.generate_chunks('sentences', 25, seed=1,
+                                          format='csv', chunk_size=10)))
+
+            # Fails while writing the third chunk, then resumes.
+            output = _Failing(os.path.join(prefix, 'output.csv'), 'w+')
+            output.size = len(expected) - 10
+            with self.assertRaises(IOError):
+                streaming.write_stream(
+                    output, 'sentences', 25, seed=1, format='csv',
+                    chunk_size=10, checkpoint=path, checkpoint_interval=0)
+            with open(path) as checkpoint:
+                state = json.load(checkpoint)
+            self.assertEqual((state['chunk'], state['items']), (2, 20))
+            output.size = None
+            output.write(b'garbage')
+            with self.assertRaises(ValueError):
+                streaming.write_stream(
+                    output, 'sentences', 25, seed=2, format='csv',
+                    chunk_size=10, checkpoint=path)
+            streaming.write_stream(
+                output, 'sentences', 25, format='csv', chunk_size=10,
+                checkpoint=path)
+            output.seek(0)
+            self.assertEqual(output.read().decode('UTF-8'), expected)
+            output.close()
+            self.assertFalse(os.path.exists(path))
+        finally:
+            shutil.rmtree(prefix)
+
+    def test_content_encoding(self):
+        """Test streaming.write_stream content encoding."""
+        expected = b''.join(
+            chunk.encode('UTF-8') for chunk in streaming.generate_chunks(
+                'paragraphs', 20, seed=1, chunk_size=3))
+        for name in ('gzip', 'bzip2', 'compress'):
+            for threaded in (False, True):
+                output = io.BytesIO()
+                written = streaming.write_stream(
+                    output, 'paragraphs', 20, seed=1, chunk_size=3,
+                    content_encoding=name, threaded=threaded)
+                self.assertEqual(written, len(output.getvalue()))
+                self.assertEqual(
+                    content_encodings.get(name).decode(output.getvalue()),
+                    expected)
+        with self.assertRaises(ValueError):
+            streaming.write_stream(io.BytesIO(), 'words', 10,
+                                   content_encoding='unknown')
+
+        prefix = tempfile.mkdtemp()
+        try:
+            path = os.path.join(prefix, 'checkpoint.json')
+            output = _Failing(os.path.join(prefix, 'output.gz'), 'w+')
+            output.size = 1000
+            with self.assertRaises(IOError):
+                streaming.write_stream(
+                    output, 'paragraphs', 20, seed=1, chunk_size=3,
+                    content_encoding='gzip', threaded=True, checkpoint=path,
+                    checkpoint_interval=0)
+            self.assertTrue(os.path.exists(path))
+            output.size = None
+            streaming.write_stream(
+                output, 'paragraphs', 20, chunk_size=3,
+                content_encoding='gzip', checkpoint=path)
+            output.seek(0)
+            self.assertEqual(content_encodings.get('gzip').decode(
+                output.read()), expected)
+            output.close()
+            # A new zlib stream would start at each checkpoint.
+            self.assertFalse(content_encodings.get('compress').CONCATENABLE)
+            with self.assertRaises(ValueError):
+                streaming.write_stream(
+                    io.BytesIO(), 'paragraphs', 20, chunk_size=3,
+                    content_encoding='compress', checkpoint=path)
+            self.assertFalse(os.path.exists(path))
+        finally:
+            shutil.rmtree(prefix)
@@ -0,0 +1,69 @@
+"""Test tokenizers package."""
+
+from loremipsum import generator
+from loremipsum import samples
+from loremipsum import tokenizers
+
+import unittest
+
+
+class TestSimple(unittest.TestCase):
+    """Simple tokenizer TestCase."""
+
+    def test_tokenize(self):
+        """Test tokenizers.simple.tokenize function."""
+        text = 'Foo bar, baz. E.g. qux!\n\nNo sentence\n\n. Quux., trail'
+        tokens = list(tokenizers.simple.tokenize(text, ',.!', '.!'))
+        self.assertEqual(tokens, [
+            (0, 0, 3, ''), (0, 0, 3, ','), (0, 0, 3, '.'),
+            (0, 1, 1, '.'),
+            (0, 2, 1, '.'),
+            (0, 3, 3, '!'),
+            (1, None, None, ''),
+            (2, 4, 0, '.'),
+            (2, 5, 4, '.')])
+
+    def test_words(self):
+        """Test tokenizers.simple.words function."""
+        text = 'Foo bar, baz. E.g. qux!\n\nNo sentence\n\n. Quux., trail'
+        tokens = list(tokenizers.simple.words(text, ',.!', '.!'))
+        self.assertEqual(tokens, [
+            (0, 0, 'Foo', ''), (0, 0, 'bar', ','), (0, 0, 'baz', '.'),
+            (0, 1, 'E', '.'),
+            (0, 2, 'g', '.'),
+            (0, 3, 'qux', '!'),
+            (2, 4, '', '.'),
+            (2, 5, 'Quux', '.')])
+
+    def test_default(self):
+        """Test the default tokenizer against the sample."""
+        self.assertIs(tokenizers.DEFAULT, tokenizers.simple)
+        row = samples.DEFAULT.row()
+        sample = generator.Sample.cooked(*row)
+        self.assertEqual(sample, samples.DEFAULT)
+        sample = generator.Sample(tokenizer='simple', **dict(zip(
+            ('text', 'lexicon', 'word_delimiters', 'sentence_delimiters'),
+            row)))
+        self.assertEqual(sample, samples.DEFAULT)
+
+    def test_words_model(self):
+        """Test the words model uses the sample tokenizer."""
+        calls = list()
+
+        class Tokenizer(object):
+            tokenize = staticmethod(tokenizers.simple.tokenize)
+
+            @staticmethod
+            def words(*args):
+                calls.append(args)
+                return tokenizers.simple.words(*args)
+
+        sample = generator.Sample(tokenizer=Tokenizer(), **dict(zip(
+            ('text', 'lexicon', 'word_delimiters', 'sentence_delimiters'),
+            samples.DEFAULT.row())))
+        generator.Generator(sample, model='words').generate_sentence()
+        self.assertEqual(len(calls), 1)
+        with generator.Generator(sample, model='words').default(
+                sentence_mean=3) as other:
+            other.generate_sentence()
+        self.assertEqual(len(calls), 2)
@@ -0,0 +1,39 @@
+"""
+This package provides the tokenizers used by
+:py:class:`loremipsum.generator.Sample` to analyse the sample text. This is a
+pluggable package: default tokenizer is named ``simple``.
+
+A tokenizer is a module (or any object) exposing a ``tokenize`` function:
+
+.. py:function:: tokenize(text, word_delimiters, sentence_delimiters)
+
+   :param str text:                 The sample text.
+   :param str word_delimiters:      The word delimiters characters.
+   :param str sentence_delimiters:  The sentence delimiters characters.
+   :returns:                        An iterator of tokens.
+
+   Yields a ``(paragraph, sentence, length, delimiter)`` tuple per word,
+   in text order. ``paragraph`` and ``sentence`` are the indexes of the
+   paragraph and of the sentence (counted across the whole text) the word
+   belongs to. ``length`` is the length of the word, trailing word delimiters
+   excluded, and ``delimiter`` the first of its trailing word delimiters, or
+   an empty string. Paragraphs without sentences yield a single
+   ``(paragraph, None, None, '')`` token.
+
+   Paragraphs are delimited by empty lines and sentences end with any of the
+   sentence delimiters: words following the last sentence delimiter of a
+   paragraph are ignored.
+
+Tokenizers supporting the ``words`` generation model of
+:py:class:`loremipsum.generator.Generator` also expose a ``words`` function:
+
+.. py:function:: words(text, word_delimiters, sentence_delimiters)
+
+   Yields a ``(paragraph, sentence, word, delimiter)`` tuple per word, like
+   ``tokenize`` does, except that ``word`` is the word itself, trailing word
+   delimiters excluded. Paragraphs without sentences yield nothing.
+"""
+
+from loremipsum.tokenizers import simple
+
+__all__ = ['simple']
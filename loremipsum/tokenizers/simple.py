@@ -0,0 +1,50 @@
+"""Single pass tokenizer, built on string methods only."""
+
+# Appended to each sentence delimiter to split sentences: it can't be part of
+# a sample text.
+_MARK = '\0'
+
+# Translation tables, by sentence delimiters.
+_TABLES = dict()
+
+
+def _table(sentence_delimiters):
+    """Returns the translation table marking the sentences ends."""
+    if sentence_delimiters not in _TABLES:
+        _TABLES[sentence_delimiters] = dict(
+            (ord(d), d + _MARK) for d in sentence_delimiters)
+    return _TABLES[sentence_delimiters]
+
+
+def tokenize(text, word_delimiters, sentence_delimiters):
+    """Yields ``(paragraph, sentence, length, delimiter)`` tokens of text."""
+    text = text.replace(_MARK, ' ').translate(_table(sentence_delimiters))
+    sentence = 0
+    for paragraph, paragraph_text in enumerate(text.split('\n\n')):
+        # The last item is what follows the last sentence delimiter: it is
+        # not a sentence.
+        sentences = paragraph_text.split(_MARK)
+        sentences.pop()
+        if not sentences:
+            yield paragraph, None, None, ''
+            continue
+        for sentence_text in sentences:
+            for word in sentence_text.split():
+                length = len(word.rstrip(word_delimiters))
+                yield paragraph, sentence, length, word[length:length + 1]
+            sentence += 1
+
+
+def words(text, word_delimiters, sentence_delimiters):
+    """Yields ``(paragraph, sentence, word, delimiter)`` tokens of text."""
+    text = text.replace(_MARK, ' ').translate(_table(sentence_delimiters))
+    sentence = 0
+    for paragraph, paragraph_text in enumerate(text.split('\n\n')):
+        sentences = paragraph_text.split(_MARK)
+        sentences.pop()
+        for sentence_text in sentences:
+            for word in sentence_text.split():
+                stripped = word.rstrip(word_delimiters)
+                yield (paragraph, sentence, stripped,
+                       word[len(stripped):len(stripped) + 1])
+            sentence += 1
@@ -29,6 +29,8 @@ EGG = {
     'keywords': PACKAGE.__keywords__,
     'packages': [NAME],
     'include_package_data': True,
+    'entry_points': {
+        'console_scripts': ['loremipsum = loremipsum.cli:main']},
     'test_suite': 'loremipsum.tests.suite'
 }
 